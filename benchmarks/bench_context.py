@@ -0,0 +1,101 @@
+"""Microbenchmark of method calls on the extended Cairo context.
+
+Compares the throughput of Cairo calls made on a plain ``cairo.Context``, on
+an ``ExtendedContext`` and on a context proxy that forwards every call through
+``__getattr__``, i.e. what ``ExtendedContext`` used to do. It also measures
+the frame rate at which ``set_context`` can swap the underlying context, as
+the GTK canvases do on every frame.
+
+Usage:
+    python benchmarks/bench_context.py [calls]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+from timeit import repeat
+
+import cairo
+
+from blighty import ExtendedContext
+
+
+class Forwarder:
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def __getattr__(self, name):
+        return getattr(self._ctx, name)
+
+
+class Canvas:
+    """Minimal stand-in for a canvas without brushes."""
+
+
+def path(ctx, n):
+    for i in range(n):
+        ctx.move_to(i, 0)
+        ctx.line_to(i, 10)
+        ctx.set_source_rgba(1, 1, 1, .5)
+    ctx.new_path()
+
+
+def bench(ctx, calls):
+    n = calls // 3
+    best = min(repeat(lambda: path(ctx, n), number=1, repeat=7))
+    return calls / best
+
+
+def bench_set_context(surface, frames):
+    contexts = [cairo.Context(surface), cairo.Context(surface)]
+    ctx = ExtendedContext(contexts[0], Canvas())
+
+    def run():
+        for i in range(frames):
+            ctx.set_context(contexts[i & 1])
+            path(ctx, 5)
+
+    best = min(repeat(run, number=1, repeat=7))
+    return frames / best
+
+
+def main(calls=300000):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 16, 16)
+    cr = cairo.Context(surface)
+
+    results = [
+        ("cairo.Context", bench(cr, calls)),
+        ("ExtendedContext", bench(ExtendedContext(cr, Canvas()), calls)),
+        ("__getattr__ proxy", bench(Forwarder(cr), calls)),
+    ]
+
+    baseline = results[0][1]
+    for name, rate in results:
+        print("{:<20} {:>8.2f} Mcalls/s {:>6.1%}".format(name, rate / 1e6, rate / baseline))
+
+    rate = bench_set_context(surface, calls // 15)
+    print("{:<20} {:>8.2f} kframes/s".format("set_context", rate / 1e3))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,169 @@
+"""End-to-end benchmarks of X11 canvases.
+
+Every run shows a number of identical canvases, each drawing some text and a
+graph, and lets the event loop run for a fixed amount of time. The following
+metrics are collected for each run:
+
+- ``fps``: the total number of frames drawn per second;
+- ``frame_time_p50_ms`` and ``frame_time_p99_ms``: the percentiles of the
+  time spent in the ``on_draw`` callback;
+- ``wakeups_per_s``: the context switches of all the threads of the process,
+  per second;
+- ``rss_kib`` and ``max_rss_kib``: the resident set size at the end of the
+  run and its peak.
+
+Each run happens in a fresh process. If the ``DISPLAY`` environment variable
+is not set, or ``--xvfb`` is given, the runs happen on a private Xvfb server.
+
+Usage:
+    python benchmarks/bench_e2e.py [--canvases 1 10 100 500] [--duration 10]
+                                   [--interval 100] [--xvfb] [--output FILE]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+from argparse import SUPPRESS, ArgumentParser
+from threading import Timer
+from time import perf_counter, sleep
+
+from common import emit, percentile, rss, thread_wakeups
+
+
+SIZE = 64
+
+
+def run(n, duration, interval):
+    """Run the benchmark with *n* canvases in this process."""
+    import blighty.x11 as x11
+    from blighty.legacy import Graph
+
+    frame_times = []
+
+    class BenchCanvas(x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.graph = Graph(0, SIZE >> 1, SIZE, SIZE >> 1)
+
+        def on_draw(self, ctx):
+            start = perf_counter()
+
+            self.graph.push_value(len(frame_times) % 100)
+            ctx.set_source_rgb(1, 1, 1)
+            ctx.set_font_size(10)
+            ctx.write_text(0, 0, "{} frames".format(len(frame_times)))
+            self.graph.draw(ctx)
+
+            frame_times.append(perf_counter() - start)
+
+    columns = 1920 // SIZE
+    canvases = [
+        BenchCanvas(
+            SIZE * (i % columns), SIZE * (i // columns) % 1024, SIZE, SIZE,
+            interval = interval
+        ) for i in range(n)
+    ]
+    for canvas in canvases:
+        canvas.show()
+
+    def stop():
+        for canvas in canvases:
+            canvas.dispose()
+
+    wakeups = thread_wakeups()
+    start = perf_counter()
+
+    Timer(duration, stop).start()
+    x11.start_event_loop()
+
+    elapsed = perf_counter() - start
+    wakeups = thread_wakeups() - wakeups
+
+    return {
+        "canvases": n,
+        "duration_s": elapsed,
+        "interval_ms": interval,
+        "frames": len(frame_times),
+        "fps": len(frame_times) / elapsed,
+        "frame_time_p50_ms": percentile(frame_times, 50) * 1e3 if frame_times else None,
+        "frame_time_p99_ms": percentile(frame_times, 99) * 1e3 if frame_times else None,
+        "wakeups_per_s": wakeups / elapsed,
+        "rss_kib": rss(),
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def start_xvfb(display=":97"):
+    xvfb = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    sleep(1)  # Give the server time to start accepting connections.
+
+    return xvfb
+
+
+def main():
+    parser = ArgumentParser(description = "blighty end-to-end benchmarks")
+    parser.add_argument("--canvases", type = int, nargs = "+", default = [1, 10, 100, 500])
+    parser.add_argument("--duration", type = float, default = 10, help = "seconds per run")
+    parser.add_argument("--interval", type = int, default = 100, help = "canvas interval, in ms")
+    parser.add_argument("--xvfb", action = "store_true", help = "run on a private Xvfb server")
+    parser.add_argument("--output", help = "write the JSON results to this file")
+    parser.add_argument("--single", action = "store_true", help = SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        json.dump(run(args.canvases[0], args.duration, args.interval), sys.stdout)
+        return
+
+    env = dict(os.environ)
+    xvfb = None
+    if args.xvfb or not env.get("DISPLAY"):
+        env["DISPLAY"] = ":97"
+        xvfb = start_xvfb(env["DISPLAY"])
+
+    results = []
+    try:
+        for n in args.canvases:
+            output = subprocess.check_output([
+                sys.executable, __file__, "--single",
+                "--canvases", str(n),
+                "--duration", str(args.duration),
+                "--interval", str(args.interval),
+            ], env = env)
+            results.append(json.loads(output.decode()))
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    emit({"e2e": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
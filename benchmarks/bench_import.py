@@ -0,0 +1,99 @@
+"""Import time benchmark.
+
+Every module is imported in a fresh interpreter run with ``python -X
+importtime``. The report gives the cumulative import time of the module, the
+number of modules it pulls in and which of the heavy dependencies, like Cairo
+or PyGObject, are loaded as a side effect.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--output FILE]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+"""
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+from common import emit
+
+
+MODULES = [
+    "blighty",
+    "blighty.x11",
+    "blighty.gtk",
+    "blighty.offscreen",
+    "blighty.sampler",
+]
+
+HEAVY = ["cairo", "gi", "numpy", "matplotlib", "PIL", "blighty._x11"]
+
+
+def importtime(module):
+    """Import a module in a fresh interpreter.
+
+    Returns the cumulative import time of the module, in microseconds, and
+    the names of all the modules that have been imported.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+    ).stderr.decode()
+
+    cumulative, imported = None, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumul, name = line[12:].split("|")
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            cumulative = int(cumul)
+
+    return cumulative, imported
+
+
+def bench(module, runs):
+    times = []
+    for _ in range(runs):
+        cumulative, imported = importtime(module)
+        times.append(cumulative)
+
+    return {
+        "us": min(times),
+        "modules": len(imported),
+        "heavy": " ".join(m for m in HEAVY if m in imported),
+    }
+
+
+def main():
+    parser = ArgumentParser(description = "blighty import time benchmark")
+    parser.add_argument("--runs", type = int, default = 5, help = "the number of runs per module")
+    parser.add_argument("--output", help = "write the JSON results to this file")
+    args = parser.parse_args()
+
+    emit({"import": {module: bench(module, args.runs) for module in MODULES}}, args.output)
+
+
+if __name__ == "__main__":
+    main()
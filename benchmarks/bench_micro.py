@@ -0,0 +1,191 @@
+"""Microbenchmarks of blighty's hot paths.
+
+The drawing benchmarks run on an offscreen canvas and need no display. The
+``dispatch_event`` benchmark measures the round trip of a redraw request
+through the X11 event loop and is skipped when no X display is available.
+
+Usage:
+    python benchmarks/bench_micro.py [--output FILE]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+from argparse import ArgumentParser
+
+import cairo
+
+from blighty import ExtendedContext, brush
+from blighty.legacy import Graph
+from blighty.offscreen import Canvas
+from blighty.plot import Chart, SeriesType
+
+from bench_context import Forwarder
+from common import emit, measure
+
+
+class BenchCanvas(Canvas):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.graph = Graph(0, 0, self.width, self.height)
+        for i in range(self.width):
+            self.graph.push_value(i % 100)
+
+    @brush
+    def noop(ctx):
+        pass
+
+    def on_draw(self, ctx):
+        pass
+
+
+def noop(ctx):
+    pass
+
+
+def bench_dispatch(results):
+    cr = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 16, 16))
+    extended = ExtendedContext(cr, BenchCanvas(0, 0, 16, 16))
+    proxy = Forwarder(cr)
+
+    def call(ctx):
+        return lambda: ctx.move_to(1, 1)
+
+    results["context_dispatch_cairo"] = measure(call(cr), 200000)
+    results["context_dispatch_extended"] = measure(call(extended), 200000)
+    results["context_dispatch_getattr"] = measure(call(proxy), 200000)
+
+
+def bench_brushes(results):
+    canvas = BenchCanvas(0, 0, 256, 256)
+    canvas.render_frame()
+    ctx = canvas._extended_context
+
+    results["brush_call"] = measure(lambda: ctx.noop(), 200000)
+    results["function_call"] = measure(lambda: noop(ctx), 200000)
+
+    ctx.set_font_size(12)
+    results["write_text"] = measure(lambda: ctx.write_text(10, 10, "CPU 42%"), 20000)
+
+    results["draw_grid"] = measure(lambda: ctx.draw_grid(), 500)
+
+    graph = canvas.graph
+    results["graph_push_value"] = measure(lambda: graph.push_value(42), 200000)
+    results["graph_draw"] = measure(lambda: graph.draw(ctx), 200)
+
+
+def bench_chart(results, widths=(100, 400, 1600)):
+    # A frame of a rolling chart pushes a value and draws it. Only the
+    # rasterisation by Cairo should grow with the width of the chart, not the
+    # number of Python calls, which used to be one per point.
+    for width in widths:
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, 100)
+        cr = cairo.Context(surface)
+
+        chart = Chart(0, 0, width, 100, ylim = (0, 100), axes = False)
+        chart.add_series("cpu", SeriesType.AREA)
+        for i in range(width):
+            chart.push_value("cpu", i % 100)
+        chart.draw(cr)
+
+        def frame():
+            chart.push_value("cpu", 42)
+            chart.draw(cr)
+
+        results["chart_frame_{}".format(width)] = measure(frame, 2000)
+
+
+def bench_shm(results):
+    try:
+        import numpy as np
+        from blighty.shm import Ring
+    except ImportError:
+        results["shm_extend"] = results["shm_latest"] = None
+        return
+
+    name = "bench-{}".format(os.getpid())
+    producer = Ring.create(name, capacity=1 << 14, channels=2)
+    consumer = Ring.open(name)
+    block = np.ones((16, 2))
+
+    try:
+        # A 1 kHz producer writing every 16 ms and a canvas reading a window
+        # of 512 samples on every frame.
+        results["shm_extend"] = measure(lambda: producer.extend(block), 100000)
+        results["shm_latest"] = measure(lambda: consumer.latest(512), 100000)
+    finally:
+        producer.unlink()
+
+
+def bench_dispatch_event(results, frames=2000):
+    if not os.environ.get("DISPLAY"):
+        results["dispatch_event"] = None
+        return
+
+    from time import perf_counter
+
+    import blighty.x11 as x11
+
+    class EventCanvas(x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.frames = 0
+
+        def on_draw(self, ctx):
+            self.frames += 1
+            if self.frames >= frames:
+                self.dispose()
+            else:
+                # Request the next redraw straight away.
+                self.invalidate()
+
+    canvas = EventCanvas(0, 0, 16, 16, interval = 60000)
+    canvas.show()
+
+    start = perf_counter()
+    x11.start_event_loop()
+    elapsed = perf_counter() - start
+
+    results["dispatch_event"] = {
+        "ns_per_call": elapsed / canvas.frames * 1e9,
+        "calls_per_s": canvas.frames / elapsed,
+    }
+
+
+def main():
+    parser = ArgumentParser(description = "blighty microbenchmarks")
+    parser.add_argument("--output", help = "write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    bench_dispatch(results)
+    bench_brushes(results)
+    bench_chart(results)
+    bench_shm(results)
+    bench_dispatch_event(results)
+
+    emit({"micro": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Frame time benchmark of matplotlib plots.
+
+Draws the plot of the ``test_x11_matplotlib`` test, i.e. a 320x160 area
+chart of the latest 100 samples, on an image surface, in two ways:
+
+- ``full_redraw``: the figure is built and drawn from scratch on every frame,
+  like the ``SimplePlot`` of the tests;
+- ``figure_plot``: the figure is built once and drawn with
+  :class:`blighty.mpl.FigurePlot`, which caches the static background and
+  only redraws the animated fill, like the ``BlitPlot`` of the tests.
+
+Every frame pushes a new sample, as the test canvas does. No X display is
+needed.
+
+Usage:
+    python benchmarks/bench_mpl.py [--frames N] [--output FILE]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from argparse import ArgumentParser
+from random import random
+
+import cairo
+
+from common import emit, measure
+
+try:
+    from matplotlib.backends.backend_cairo import FigureCanvasCairo, RendererCairo
+    from matplotlib.figure import Figure
+
+    from blighty.mpl import FigurePlot, update_fill_between
+except ImportError:
+    Figure = None
+
+
+WIDTH, HEIGHT = 320, 160
+DPI = 96
+
+
+class FullRedraw:
+    def __init__(self):
+        self.t = list(range(100))
+        self.values = [0] * 100
+
+    def draw(self, cr):
+        figure = Figure(figsize = (WIDTH / DPI, HEIGHT / DPI), dpi = DPI)
+        FigureCanvasCairo(figure)
+        figure.set_facecolor((0, 0, 0, 0))
+        figure.subplots_adjust(wspace = 0, top = 1.0, bottom = 0.0, left = 0, right = 1.0)
+
+        ax = figure.add_subplot(111)
+        ax.set_facecolor((0, 0, 0, 0))
+        ax.axis("off")
+        ax.set_ylim([0, 100])
+        ax.fill_between(self.t, self.values, 0)
+
+        renderer = RendererCairo(DPI)
+        renderer.set_context(cr)
+        renderer.width, renderer.height = WIDTH, HEIGHT
+        figure.draw(renderer)
+
+
+class BlitDraw:
+    def __init__(self):
+        self.t = list(range(100))
+        self.values = [0] * 100
+
+        self.plot = FigurePlot(WIDTH, HEIGHT, dpi = DPI)
+        self.plot.figure.subplots_adjust(wspace = 0, top = 1.0, bottom = 0.0, left = 0, right = 1.0)
+
+        ax = self.plot.add_subplot(111)
+        ax.axis("off")
+        ax.set_ylim([0, 100])
+        self.fill = self.plot.animate(ax.fill_between(self.t, self.values, 0))
+
+    def draw(self, cr):
+        update_fill_between(self.fill, self.t, self.values)
+        self.plot.draw(cr)
+
+
+def bench(plot, frames):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+    cr = cairo.Context(surface)
+
+    def frame():
+        plot.values.pop(0)
+        plot.values.append(random() * 100)
+        plot.draw(cr)
+        surface.flush()
+
+    # The first frame of the FigurePlot renders the background.
+    frame()
+
+    result = measure(frame, frames)
+    result["ms_per_frame"] = result["ns_per_call"] / 1e6
+
+    return result
+
+
+def main():
+    parser = ArgumentParser(description = "blighty matplotlib benchmark")
+    parser.add_argument("--frames", type = int, default = 50, help = "the number of frames per run")
+    parser.add_argument("--output", help = "write the JSON results to this file")
+    args = parser.parse_args()
+
+    if Figure is None:
+        results = {"full_redraw": None, "figure_plot": None, "speedup": None}
+    else:
+        results = {
+            "full_redraw": bench(FullRedraw(), args.frames),
+            "figure_plot": bench(BlitDraw(), args.frames),
+        }
+        results["speedup"] = results["full_redraw"]["ns_per_call"] / results["figure_plot"]["ns_per_call"]
+
+    emit({"mpl": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
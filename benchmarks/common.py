@@ -0,0 +1,116 @@
+"""Common helpers of the benchmark suite.
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import platform
+import sys
+from time import time
+from timeit import repeat
+
+
+def measure(func, number, repeats=5):
+    """Time a callable with no arguments.
+
+    Returns the best of *repeats* runs of *number* calls, as a dictionary
+    with the time per call, in nanoseconds, and the calls per second.
+    """
+    best = min(repeat(func, number=number, repeat=repeats))
+
+    return {
+        "ns_per_call": best / number * 1e9,
+        "calls_per_s": number / best,
+    }
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return None
+
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(p / 100. * len(values))) - 1))]
+
+
+def thread_wakeups():
+    """Total number of context switches of all the threads of this process."""
+    total = 0
+    for task in os.listdir("/proc/self/task"):
+        try:
+            with open("/proc/self/task/{}/status".format(task)) as fin:
+                for line in fin:
+                    # voluntary_ctxt_switches and nonvoluntary_ctxt_switches
+                    if "ctxt_switches" in line:
+                        total += int(line.split()[1])
+        except OSError:
+            # The thread has terminated in the meantime.
+            pass
+
+    return total
+
+
+def rss():
+    """Resident set size of this process, in KiB."""
+    with open("/proc/self/status") as fin:
+        for line in fin:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+
+def environment():
+    """Describe the environment the benchmarks run in."""
+    try:
+        from importlib.metadata import version
+        blighty_version = version("blighty")
+    except Exception:
+        blighty_version = None
+
+    try:
+        import cairo
+        cairo_version = cairo.cairo_version_string()
+    except ImportError:
+        cairo_version = None
+
+    return {
+        "blighty": blighty_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cairo": cairo_version,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": time(),
+    }
+
+
+def emit(results, output=None):
+    """Write the results as JSON to the given file, or to standard output."""
+    document = {"environment": environment(), "results": results}
+
+    if output is None:
+        json.dump(document, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    else:
+        with open(output, "w") as fout:
+            json.dump(document, fout, indent=2, sort_keys=True)
@@ -0,0 +1,67 @@
+"""Compare two benchmark result files.
+
+Prints the relative change of every metric from the *base* results to the
+*head* results.
+
+Usage:
+    python benchmarks/compare.py base.json head.json
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import sys
+
+
+def flatten(results, prefix=""):
+    metrics = {}
+
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        # End-to-end runs are identified by their number of canvases.
+        items = (("{}".format(r.get("canvases", i)), r) for i, r in enumerate(results))
+    else:
+        return {prefix: results}
+
+    for key, value in items:
+        metrics.update(flatten(value, "{}.{}".format(prefix, key) if prefix else key))
+
+    return metrics
+
+
+def main(base, head):
+    with open(base) as fin:
+        base = flatten(json.load(fin)["results"])
+    with open(head) as fin:
+        head = flatten(json.load(fin)["results"])
+
+    for name in sorted(base.keys() & head.keys()):
+        b, h = base[name], head[name]
+        if not isinstance(b, (int, float)) or not isinstance(h, (int, float)) or not b:
+            continue
+        print("{:<48} {:>14.3f} {:>14.3f} {:>+8.1%}".format(name, b, h, h / b - 1))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
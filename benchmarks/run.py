@@ -0,0 +1,68 @@
+"""Run the whole benchmark suite.
+
+The results of the microbenchmarks, of the import time benchmark, of the
+matplotlib benchmark and of the end-to-end benchmarks are collected in a
+single JSON document, which can be compared across versions with
+``benchmarks/compare.py``.
+
+Usage:
+    python benchmarks/run.py [--quick] [--output FILE]
+
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+from common import emit
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def bench(script, *args):
+    output = subprocess.check_output([sys.executable, os.path.join(HERE, script)] + list(args))
+    return json.loads(output.decode())["results"]
+
+
+def main():
+    parser = ArgumentParser(description = "blighty benchmark suite")
+    parser.add_argument("--quick", action = "store_true", help = "short end-to-end runs with fewer canvases")
+    parser.add_argument("--output", help = "write the JSON results to this file")
+    args = parser.parse_args()
+
+    e2e_args = ["--canvases", "1", "10", "--duration", "2"] if args.quick else []
+
+    results = bench("bench_micro.py")
+    results.update(bench("bench_import.py"))
+    results.update(bench("bench_mpl.py"))
+    results.update(bench("bench_e2e.py", *e2e_args))
+
+    emit(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
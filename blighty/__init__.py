@@ -23,15 +23,34 @@
 """
 This module contains the common objects and types for the different kind of
 canvases provided by ``blighty``.
+
+Importing ``blighty``, or any of its submodules, has no side effects and is
+cheap. The objects that need heavier modules are only imported when they are
+first accessed, so that short-lived tools that never open a window, e.g. a
+configuration validator, do not pay for them.
 """
 
-# XWayland fix
-import os
-os.environ["GDK_BACKEND"] = "x11"
+_lazy = {
+    "ExtendedContext": "_extended_context",
+    "brush": "_brush",
+    "TextAlign": "_brush",
+}
+
+
+def __getattr__(name):
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    from importlib import import_module
+    value = getattr(import_module("." + module, __name__), name)
+    globals()[name] = value
+
+    return value
 
-from . _extended_context import ExtendedContext
 
-from . _brush import brush, TextAlign
+def __dir__():
+    return sorted(list(globals()) + list(_lazy))
 
 
 class CanvasType(type):
@@ -0,0 +1,57 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Run widgets in a single process.
+
+Usage:
+    python -m blighty [--verbose] [--reload] [--push [PATH]] SOURCE [SOURCE ...]
+
+See :mod:`blighty.host` for the format of the sources.
+"""
+
+import logging
+from argparse import ArgumentParser
+
+from blighty.host import Host
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog = "python -m blighty", description = "blighty widget host")
+    parser.add_argument(
+        "sources", nargs = "+", metavar = "SOURCE",
+        help = "a JSON widget configuration file or a directory of widget modules"
+    )
+    parser.add_argument("-v", "--verbose", action = "store_true", help = "log widget changes")
+    parser.add_argument("-r", "--reload", action = "store_true", help = "reload the widget code when it changes")
+    parser.add_argument(
+        "-p", "--push", nargs = "?", const = "", metavar = "PATH",
+        help = "serve a push socket, at the default path if none is given"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level = logging.INFO if args.verbose else logging.WARNING)
+
+    Host(args.sources, reload = args.reload, push = args.push).run()
+
+
+if __name__ == "__main__":
+    main()
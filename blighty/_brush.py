@@ -23,6 +23,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from functools import wraps
+from weakref import WeakKeyDictionary
 
 
 def not_callable_from_instance(*args, **kwargs):
@@ -34,36 +35,42 @@ def not_callable_from_instance(*args, **kwargs):
 
 
 class BrushSets:
-    brush_sets = {}
-    inherited = {}
+    # The brushes of the classes that are being defined, by module and
+    # qualified name, until they are collected by inherit.
+    pending = {}
+    # The brush set of each class, including the inherited brushes. The
+    # classes are the keys, so that classes with the same name in different
+    # modules, or in different versions of the same module, are kept apart.
+    brush_sets = WeakKeyDictionary()
 
     @staticmethod
-    def add_brush(brush_set, method_name, method):
-        if brush_set not in BrushSets.brush_sets:
-            BrushSets.brush_sets[brush_set] = {}
-
-        BrushSets.brush_sets[brush_set][method_name] = method
+    def add_brush(module, qualname, method_name, method):
+        BrushSets.pending.setdefault((module, qualname), {})[method_name] = method
 
     @staticmethod
-    def get_brush_set(brush_set):
-        return BrushSets.brush_sets.get(brush_set, {})
+    def get_brush_set(klass):
+        return BrushSets.brush_sets.get(klass, {})
 
     @staticmethod
     def inherit(klass):
-        if klass.__qualname__ in BrushSets.inherited:
+        if klass in BrushSets.brush_sets:
             return
 
-        for e in klass.__bases__:
-            try:
-                BrushSets.inherit(e)
-                if klass.__qualname__ not in BrushSets.brush_sets:
-                    BrushSets.brush_sets[klass.__qualname__] = {}
-                BrushSets.brush_sets[klass.__qualname__].update(BrushSets.brush_sets[e.__qualname__])
-            except KeyError:
-                # No brushes registered for the superclass so we can skip it
-                pass
+        # The brushes of the first bases take precedence, as for methods, and
+        # those of the class itself override the inherited ones.
+        brush_set = {}
+        for e in reversed(klass.__bases__):
+            BrushSets.inherit(e)
+            brush_set.update(BrushSets.brush_sets[e])
+        brush_set.update(BrushSets.pending.pop((klass.__module__, klass.__qualname__), {}))
+
+        BrushSets.brush_sets[klass] = brush_set
 
-        BrushSets.inherited[klass.__qualname__] = True
+    @staticmethod
+    def discard(module):
+        """Drop the pending brushes of the classes of a module."""
+        for key in [k for k in BrushSets.pending if k[0] == module]:
+            del BrushSets.pending[key]
 
 
 def brush(f):
@@ -93,7 +100,7 @@ def brush(f):
 
     The use of the `brush` decorator is not restricted to X11 canvases.
     """
-    BrushSets.add_brush(*f.__qualname__.rsplit('.', 1), method = f)
+    BrushSets.add_brush(f.__module__, *f.__qualname__.rsplit('.', 1), method = f)
 
     @wraps(f)
     def wrapper(*args, **kwargs):
@@ -102,9 +109,32 @@ def brush(f):
     return wrapper
 
 
+def brush_doc(basic):
+    """Give a brush method the docstring of a basic brush.
+
+    The basic brushes are made available on every canvas class by thin brush
+    methods that delegate to them. This decorator keeps their documentation
+    in one place.
+    """
+    def decorator(f):
+        f.__doc__ = basic.__doc__
+        return f
+
+    return decorator
+
+
 ## Basic brushes ##############################################################
 
 def draw_grid(ctx, x = 50, y = 50):
+    """Draw a grid on the canvas [**implicit brush**].
+
+    This implicit brush method is intended to help with determining the
+    location of points on the canvas during development.
+
+    Args:
+        x (int): The horizontal spacing between lines.
+        y (int): The vertical spacing between lines.
+    """
     w, h = ctx.canvas.get_size()
 
     ctx.save()
@@ -140,6 +170,32 @@ class TextAlign(type):
 
 
 def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
+    """Write aligned text [**explicit brush**].
+
+    This explicit brush method helps write aligned text on the canvas. The
+    *x* and *y* coordinates are relative to the specified *alignment*. By
+    default, this is ``blighty.TextAlign.TOP_LEFT``, meaning that the text
+    will be left-aligned and on top of the horizontal line that passes
+    through *y* on the vertical axis. In terms of the point *(x,y)* on the
+    Canvas, the text will develop in the NE direction.
+
+    The return value is the text extents, in case that some further draw
+    operations depend on the space required by the text to be drawn on the
+    canvas.
+
+    Note that font face and size need to be set on the Cairo context prior
+    to a call to this method.
+
+    Args:
+        x (int): The horizontal coordinate.
+        y (int): The vertical coordinate.
+        text (str): The text to write.
+        align (int): The text alignment. Detaulf is ``TextAlign.TOP_LEFT``.
+
+    Returns:
+        tuple: The same return value as ``cairo.text_extents``.
+
+    """
     ex = cr.text_extents(text)
 
     if align <= TextAlign.TOP_LEFT:
@@ -161,3 +217,119 @@ def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
     cr.stroke()
 
     return ex
+
+
+def image(ctx, source, size = None, loader = None, slot = None):
+    """Get an image surface without blocking [**explicit brush**].
+
+    This explicit brush method returns the image from *source* as a
+    ``cairo.ImageSurface``, decoded and scaled to fit in the box of the
+    given *size*. Images that have not been decoded yet are queued to a
+    pool of worker threads and the canvas is redrawn as soon as they are
+    ready. In the meantime, the last image returned for the same *slot*
+    is returned instead or, if there is none, a transparent placeholder.
+
+    Args:
+        source: The image source. If no *loader* is given, this is the
+            path of the image file.
+        size (tuple or int): The ``(width, height)`` of the box the image
+            should fit in. Default is the original size.
+        loader (callable): A callable with no arguments that returns the
+            encoded image data. It is called from a worker thread.
+        slot: Identifies the image being replaced, e.g. when a new album
+            art is requested. Default is the *size*.
+
+    Returns:
+        cairo.ImageSurface: the image, or a stand-in while it is not
+        ready.
+    """
+    from blighty.assets import get_pipeline
+
+    pipeline = get_pipeline()
+    canvas = ctx.canvas
+
+    if slot is None:
+        slot = size
+
+    surface = pipeline.request(source, size, loader, canvas.invalidate)
+    if surface is not None:
+        canvas._images[slot] = surface
+        return surface
+
+    # Keep showing the previous image, if any, until the new one is ready.
+    return canvas._images.get(slot) or pipeline.placeholder(size)
+
+
+def use_font(ctx, name, size):
+    """Set a font from the font registry [**explicit brush**].
+
+    This explicit brush method sets the scaled font for the font *name*
+    and *size* from the :mod:`blighty.fonts` registry on the Cairo
+    context. This is equivalent to calling ``select_font_face`` and
+    ``set_font_size``, but the font face is resolved only once and the
+    scaled font is reused across frames.
+
+    Args:
+        name: The name of a registered font, or a tuple of arguments to
+            ``select_font_face``.
+        size (float): The font size.
+
+    Returns:
+        cairo.ScaledFont: the scaled font.
+    """
+    from blighty.fonts import registry
+
+    font = registry.get(name, size)
+    ctx.set_scaled_font(font)
+
+    return font
+
+
+def server_image(ctx, surface):
+    """Pin an image on the X server [**explicit brush**].
+
+    This explicit brush method copies the image *surface* to a pixmap on
+    the X server the first time it is called with it, and returns the
+    pixmap as a Cairo surface. Painting the returned surface is
+    composited by the X server, without sending the pixels of the image
+    over the X connection again, which makes a difference over slow
+    links, e.g. ``ssh -X``.
+
+    The pixmaps are kept until the canvas is destroyed, so this is meant
+    for images that never change, like logos, icons and backgrounds.
+
+    Args:
+        surface (cairo.Surface): The image to pin, e.g. a
+            ``cairo.ImageSurface``.
+
+    Returns:
+        cairo.Surface: the pinned image, to be used as a source.
+    """
+    import cairo
+
+    server_images = ctx.canvas._server_images
+
+    # The pinned copy holds a reference to the original surface so that its
+    # id cannot be reused while it is in the dictionary.
+    pinned = server_images.get(id(surface))
+    if pinned is None:
+        similar = ctx.get_target().create_similar(
+            cairo.CONTENT_COLOR_ALPHA, surface.get_width(), surface.get_height()
+        )
+
+        cr = cairo.Context(similar)
+        cr.set_source_surface(surface, 0, 0)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.paint()
+        similar.flush()
+
+        pinned = server_images[id(surface)] = (surface, similar)
+
+    return pinned[1]
+
+
+def free_server_images(canvas):
+    for _, similar in canvas._server_images.values():
+        similar.finish()
+
+    canvas._server_images.clear()
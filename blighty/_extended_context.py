@@ -22,9 +22,102 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from weakref import WeakSet
+
 from . _brush import BrushSets, not_callable_from_instance
 
 
+_context_methods = {}
+
+
+def get_context_methods(context_type):
+    """Get the names of the public methods of a Cairo context type."""
+    try:
+        return _context_methods[context_type]
+    except KeyError:
+        methods = _context_methods[context_type] = frozenset(
+            m for m in dir(context_type)
+            if m[0] != "_" and callable(getattr(context_type, m))
+        )
+        return methods
+
+
+_context_types = {}
+
+# The live extended contexts, switched over to new context types by
+# reset_context_types.
+_contexts = WeakSet()
+
+# Set by blighty.x11.trace to wrap the brushes while tracing.
+trace_brush = None
+
+
+def _collect_implicit_brushes(canvas_type):
+    brushes = {}
+
+    for dm in dir(canvas_type):
+        if dm[:5] != "draw_":
+            continue
+        try:
+            m = getattr(canvas_type, dm)
+        except RuntimeError:
+            # In the GTK case, introspection breaks getattr so we ignore
+            # the attributes we cannot retrieve.
+            continue
+        if callable(m):
+            brushes[dm] = m
+
+    return brushes
+
+
+def get_context_type(canvas_type, context_type):
+    """Get the extended context type for a canvas type.
+
+    The brushes of a canvas class are collected only once, the first time a
+    context is created for one of its instances, and become the methods of a
+    subclass of :class:`ExtendedContext` that is cached for later use.
+    """
+    try:
+        return _context_types[canvas_type]
+    except KeyError:
+        pass
+
+    BrushSets.inherit(canvas_type)
+
+    implicit = _collect_implicit_brushes(canvas_type)
+    namespace = dict(implicit)
+
+    context_methods = get_context_methods(context_type)
+    for n, m in BrushSets.get_brush_set(canvas_type).items():
+        if n in context_methods:
+            raise RuntimeError("Brush name '{}' clashes with attribute or method in {}".format(n, context_type.__qualname__))
+        namespace[n] = m
+
+    if trace_brush is not None:
+        namespace = {n: trace_brush(n, m) for n, m in namespace.items()}
+
+    namespace["_implicit_brushes"] = tuple(implicit)
+
+    extended_type = _context_types[canvas_type] = type(
+        canvas_type.__name__ + "Context", (ExtendedContext,), namespace
+    )
+
+    return extended_type
+
+
+def reset_context_types():
+    """Build the extended context types again.
+
+    This is needed when the way they are built changes, e.g. when tracing
+    starts or stops. The live extended contexts are switched over to the new
+    types, so that the change affects the canvases that are already drawing.
+    """
+    _context_types.clear()
+
+    for ctx in list(_contexts):
+        ctx.__class__ = get_context_type(type(ctx.canvas), type(ctx._ctx))
+
+
 class ExtendedContext():
     """Extension of the standard `cairo.Context` class.
 
@@ -40,33 +133,59 @@ class ExtendedContext():
     underlying `Canvas` object can be accessed via the `canvas` attribute. This
     can be useful if one needs to refer to the parent canvas geometry (e.g.
     its size).
+
+    The methods of the underlying context are bound to the instance the
+    first time they are used, so that later calls like ``ctx.move_to`` are
+    plain instance attribute lookups and cost the same as on a vanilla
+    `cairo.Context`. The brushes are looked up once per `Canvas` class and
+    shared by all its instances.
     """
+    _implicit_brushes = ()
+    _ctx = None
+
+    def __new__(cls, ctx, canvas):
+        if cls is ExtendedContext:
+            cls = get_context_type(type(canvas), type(ctx))
+
+        return super().__new__(cls)
+
     def __init__(self, ctx, canvas):
-        self._ctx = ctx
         self.canvas = canvas
+        self._bound = []
+        self.set_context(ctx)
+        _contexts.add(self)
 
-        collected_methods = []
-
-        for dm in dir(canvas):
-            try:
-                if callable(getattr(canvas, dm)) and dm[:5] == "draw_":
-                    collected_methods.append(dm)
-            except RuntimeError:
-                # In the GTK case, introspection breaks getattr so we ignore
-                # the attributes we cannot retrieve.
-                pass
-
-        # for m in [dm for dm in dir(canvas) if callable(getattr(canvas, dm)) and dm[:5] == "draw_"]:
-        for m in collected_methods:
-            # Re-bind brush method and mark the original as non-callable
-            setattr(self, m, getattr(type(canvas), m).__get__(self, ExtendedContext))
+        # Mark the implicit brushes as non-callable from the canvas
+        for m in self._implicit_brushes:
             setattr(canvas, m, not_callable_from_instance.__get__(canvas, type(canvas)))
 
-        for n, m in BrushSets.get_brush_set(type(canvas).__qualname__).items():
-            if n in dir(ctx):
-                raise RuntimeError("Brush name '{}' clashes with attribute or method in {}".format(n, type(ctx).__qualname__))
-            setattr(self, n, m.__get__(self, ExtendedContext))
+    def set_context(self, ctx):
+        """Replace the underlying Cairo context.
+
+        This allows reusing the same extended context when the canvas is
+        given a new Cairo context on every frame. Only the methods that have
+        been used with the previous context need to be bound again.
+        """
+        if ctx is self._ctx:
+            return
+
+        self._ctx = ctx
+
+        bound = self._bound
+        for m in bound:
+            del self.__dict__[m]
+        bound.clear()
 
     def __getattr__(self, name):
-        """Access the underling context methods."""
-        return getattr(self._ctx, name)
+        """Access the attributes of the underlying context.
+
+        The methods are bound to the instance, so that this is only called
+        the first time they are used with the current context.
+        """
+        value = getattr(self._ctx, name)
+
+        if name in get_context_methods(type(self._ctx)):
+            self.__dict__[name] = value
+            self._bound.append(name)
+
+        return value
@@ -0,0 +1,380 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Image assets.
+
+This module provides the :class:`ImageCache` class, a cache of decoded and
+scaled images, ready to be painted on a Cairo context.
+
+Images are decoded only once, directly from memory, and kept as
+``cairo.ImageSurface`` objects, both at their original size and at every size
+they have been requested at. The cache has a memory budget, in bytes, and
+evicts the least recently used surfaces when it is exceeded.
+
+PNG images are decoded by Cairo itself. Other formats are decoded with Pillow,
+if it is installed.
+
+Decoding and scaling a large image can take tens of milliseconds, which is far
+too long for the draw thread. The :class:`ImagePipeline` class moves this work
+to a pool of worker threads, and is what the ``image`` brush of the canvas
+classes uses under the hood.
+
+Example:
+    class Art(blighty.x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.images = ImageCache()
+
+        def on_draw(self, ctx):
+            art = self.images.get("/path/to/art.jpg", self.height)
+            ctx.set_source_surface(art, 0, 0)
+            ctx.paint()
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from threading import Lock, RLock
+
+import cairo
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _read_file(path):
+    with open(path, "rb") as fin:
+        return fin.read()
+
+
+def decode(data):
+    """Decode an image from memory.
+
+    Args:
+        data (bytes): the encoded image.
+
+    Returns:
+        cairo.ImageSurface: the decoded image.
+    """
+    if data[:8] == PNG_SIGNATURE:
+        return cairo.ImageSurface.create_from_png(BytesIO(data))
+
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Unable to import Pillow, which is required for non-PNG images.")
+
+    image = Image.open(BytesIO(data)).convert("RGBA")
+    width, height = image.size
+
+    # Cairo expects native-endian, premultiplied ARGB.
+    buf = bytearray(image.tobytes("raw", "BGRa"))
+    return cairo.ImageSurface.create_for_data(
+        buf, cairo.FORMAT_ARGB32, width, height, width << 2
+    )
+
+
+def scale(surface, size):
+    """Scale an image to fit in the given box, preserving its aspect ratio.
+
+    Args:
+        surface (cairo.ImageSurface): the image to scale.
+        size (tuple): the ``(width, height)`` of the bounding box.
+
+    Returns:
+        cairo.ImageSurface: the scaled image.
+    """
+    width, height = surface.get_width(), surface.get_height()
+    k = min(size[0] / width, size[1] / height)
+
+    scaled = cairo.ImageSurface(
+        cairo.FORMAT_ARGB32, max(1, round(width * k)), max(1, round(height * k))
+    )
+
+    cr = cairo.Context(scaled)
+    cr.scale(k, k)
+    cr.set_source_surface(surface, 0, 0)
+    cr.get_source().set_filter(cairo.FILTER_BEST)
+    cr.paint()
+    scaled.flush()
+
+    return scaled
+
+
+def _nbytes(surface):
+    return surface.get_stride() * surface.get_height()
+
+
+class ImageCache:
+    """Decoded image surface cache.
+
+    Surfaces are cached by source and size. The source is any hashable object
+    identifying the image, e.g. a file path or a URL. When an image is not in
+    the cache, its encoded data is obtained from the *loader* passed to
+    :func:`get`, or read from the file system if none is given.
+
+    Args:
+        budget (int): the maximum amount of memory, in bytes, to be used by
+            the cached surfaces. Default is 32 MiB.
+    """
+
+    def __init__(self, budget=32 << 20):
+        self.budget = budget
+        self.nbytes = 0
+        self._surfaces = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def __contains__(self, key):
+        return key in self._surfaces
+
+    def _lookup(self, key):
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self._surfaces.move_to_end(key)
+            return surface
+
+    def _store(self, key, surface):
+        with self._lock:
+            # Another thread might have decoded the same image in the meantime.
+            replaced = self._surfaces.pop(key, None)
+            if replaced is not None:
+                self.nbytes -= _nbytes(replaced)
+
+            self._surfaces[key] = surface
+            self.nbytes += _nbytes(surface)
+
+            while self.nbytes > self.budget and len(self._surfaces) > 1:
+                _, evicted = self._surfaces.popitem(last=False)
+                self.nbytes -= _nbytes(evicted)
+
+    def peek(self, source, size=None):
+        """Get an image surface only if it is already in the cache.
+
+        Args:
+            source: the image source.
+            size (tuple or int): the size of the bounding box, as in
+                :func:`get`.
+
+        Returns:
+            cairo.ImageSurface: the cached surface, or ``None``.
+        """
+        if isinstance(size, int):
+            size = (size, size)
+
+        return self._lookup((source, size))
+
+    def get(self, source, size=None, loader=None):
+        """Get an image surface.
+
+        The image is decoded and scaled in the calling thread if it is not in
+        the cache. The cache itself is thread-safe.
+
+        Args:
+            source: the image source. If no *loader* is given, this is the
+                path of the image file.
+            size (tuple or int): the ``(width, height)`` of the box the image
+                should fit in, preserving its aspect ratio. An integer *n* is
+                the same as ``(n, n)``. Default is the original size.
+            loader (callable): a callable that takes no arguments and returns
+                the encoded image data as ``bytes``. It is only called if the
+                image is not in the cache.
+
+        Returns:
+            cairo.ImageSurface: the decoded, and possibly scaled, image.
+        """
+        if isinstance(size, int):
+            size = (size, size)
+
+        key = (source, size)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface
+
+        original = self._lookup((source, None))
+        if original is None:
+            original = decode(loader() if loader else _read_file(source))
+            self._store((source, None), original)
+
+        if size is None:
+            return original
+
+        surface = scale(original, size)
+        self._store(key, surface)
+
+        return surface
+
+    def discard(self, source):
+        """Remove all the surfaces of the given source from the cache."""
+        with self._lock:
+            for key in [k for k in self._surfaces if k[0] == source]:
+                self.nbytes -= _nbytes(self._surfaces.pop(key))
+
+    def clear(self):
+        """Remove all the surfaces from the cache."""
+        with self._lock:
+            self._surfaces.clear()
+            self.nbytes = 0
+
+
+class ImagePipeline:
+    """Asynchronous image decode and scale pipeline.
+
+    Images that are not in the cache yet are loaded, decoded and scaled by a
+    pool of worker threads, so that :func:`request` never blocks. Concurrent
+    requests for the same image and size are served by a single job.
+
+    Example:
+        class Art(blighty.x11.Canvas):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.images = ImagePipeline()
+
+            def on_draw(self, ctx):
+                art = self.images.request(self.url, 64, callback=self.invalidate)
+                if art is not None:
+                    ctx.set_source_surface(art, 0, 0)
+                    ctx.paint()
+
+    Args:
+        cache (ImageCache): the cache that holds the decoded images. A new
+            one with the default budget is created if none is given.
+        workers (int): the number of worker threads. Default is ``2``.
+    """
+
+    def __init__(self, cache=None, workers=2):
+        self.cache = ImageCache() if cache is None else cache
+
+        self._executor = ThreadPoolExecutor(workers)
+        self._pending = {}
+        self._failed = set()
+        self._placeholders = {}
+        self._lock = Lock()
+
+    def request(self, source, size=None, loader=None, callback=None):
+        """Request an image surface.
+
+        Args:
+            source: the image source, as in :func:`ImageCache.get`.
+            size (tuple or int): the size of the bounding box, as in
+                :func:`ImageCache.get`.
+            loader (callable): the loader of the encoded image data, as in
+                :func:`ImageCache.get`. It is called from a worker thread.
+            callback (callable): a callable that takes no arguments, called
+                from a worker thread when the image is ready, e.g. the
+                ``invalidate`` method of a canvas.
+
+        Returns:
+            cairo.ImageSurface: the image, if it is already in the cache, or
+            ``None`` if it has been queued for decoding or could not be
+            decoded.
+        """
+        if isinstance(size, int):
+            size = (size, size)
+
+        surface = self.cache.peek(source, size)
+        if surface is not None:
+            return surface
+
+        key = (source, size)
+        with self._lock:
+            if key in self._pending or key in self._failed:
+                return None
+
+            future = self._executor.submit(self.cache.get, source, size, loader)
+            self._pending[key] = future
+
+        def done(future):
+            with self._lock:
+                del self._pending[key]
+                if future.exception() is not None:
+                    # Do not retry on every frame. Use discard to retry.
+                    self._failed.add(key)
+                    return
+
+            if callback is not None:
+                callback()
+
+        future.add_done_callback(done)
+
+        return None
+
+    def placeholder(self, size=None):
+        """Get a transparent surface to use while an image is not ready.
+
+        Args:
+            size (tuple or int): the size of the placeholder. Default is a
+                single pixel.
+
+        Returns:
+            cairo.ImageSurface: the placeholder surface.
+        """
+        if isinstance(size, int):
+            size = (size, size)
+
+        surface = self._placeholders.get(size)
+        if surface is None:
+            width, height = size or (1, 1)
+            surface = self._placeholders[size] = cairo.ImageSurface(
+                cairo.FORMAT_ARGB32, width, height
+            )
+
+        return surface
+
+    def discard(self, source):
+        """Remove all the surfaces of the given source from the cache.
+
+        Failed requests for the source are forgotten too, so that they are
+        retried on the next call to :func:`request`.
+        """
+        with self._lock:
+            self._failed = {k for k in self._failed if k[0] != source}
+        self.cache.discard(source)
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads."""
+        self._executor.shutdown(wait)
+
+
+_pipeline = None
+_pipeline_lock = Lock()
+
+
+def get_pipeline():
+    """Get the default image pipeline.
+
+    The default pipeline is the one used by the ``image`` brush. It is
+    created on first use.
+
+    Returns:
+        ImagePipeline: the default image pipeline.
+    """
+    global _pipeline
+
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ImagePipeline()
+
+    return _pipeline
@@ -0,0 +1,160 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Font registry.
+
+Selecting a font face with ``select_font_face`` and a size with
+``set_font_size`` on every frame makes Cairo resolve the face through
+fontconfig and build a new scaled font each time. This module provides the
+:class:`FontRegistry` class, which resolves named font faces only once and
+keeps a ``cairo.ScaledFont`` for every (face, size) pair that is used.
+
+Fonts are registered once, usually at import time, together with the sizes
+they are going to be used at. The registered fonts are *warmed up*, that is
+resolved and rasterised, before a canvas is shown for the first time, so that
+the first frame does not stall on fontconfig. On the canvas, the
+``use_font`` brush then sets a ready-made scaled font on the Cairo context.
+
+Example:
+    import blighty.fonts
+
+    blighty.fonts.register("title", "Laksaman", sizes=(12, 36))
+
+    class Title(blighty.x11.Canvas):
+        def on_draw(self, ctx):
+            ctx.use_font("title", 36)
+            ctx.write_text(0, 0, "CPU")
+"""
+
+import cairo
+
+
+WARM_UP_TEXT = "0123456789%"
+
+
+class FontRegistry:
+    """Registry of named font faces and their scaled fonts.
+
+    Args:
+        options (cairo.FontOptions): the font options used to build the
+            scaled fonts. Default are the Cairo default options.
+    """
+
+    def __init__(self, options=None):
+        self.options = cairo.FontOptions() if options is None else options
+
+        self._faces = {}
+        self._fonts = {}
+        self._sizes = {}
+
+    def __contains__(self, name):
+        return name in self._faces
+
+    def register(self, name, family,
+                 slant=cairo.FONT_SLANT_NORMAL,
+                 weight=cairo.FONT_WEIGHT_NORMAL,
+                 sizes=()):
+        """Register a font face.
+
+        Args:
+            name: the name of the font, i.e. any hashable object.
+            family (str): the font family, as in ``select_font_face``.
+            slant (cairo.FontSlant): the font slant.
+            weight (cairo.FontWeight): the font weight.
+            sizes (iterable): the sizes the font is going to be used at, which
+                are built by :func:`warm`.
+        """
+        self._faces[name] = cairo.ToyFontFace(family, slant, weight)
+        self._sizes[name] = set(sizes)
+
+        for key in [k for k in self._fonts if k[0] == name]:
+            del self._fonts[key]
+
+    def get(self, name, size):
+        """Get a scaled font.
+
+        A font name that has not been registered can be a tuple of arguments
+        to :func:`register`, like ``("Sans", cairo.FONT_SLANT_NORMAL,
+        cairo.FONT_WEIGHT_BOLD)``, in which case it is registered on the fly.
+
+        Args:
+            name: the name of a registered font.
+            size (float): the font size, in user-space units.
+
+        Returns:
+            cairo.ScaledFont: the scaled font.
+        """
+        key = (name, size)
+
+        font = self._fonts.get(key)
+        if font is None:
+            if name not in self._faces:
+                if not isinstance(name, tuple):
+                    raise KeyError("Font '{}' is not registered.".format(name))
+                self.register(name, *name)
+
+            self._sizes[name].add(size)
+            font = self._fonts[key] = cairo.ScaledFont(
+                self._faces[name],
+                cairo.Matrix(size, 0, 0, size, 0, 0),
+                cairo.Matrix(),
+                self.options,
+            )
+
+        return font
+
+    def warm(self):
+        """Build the scaled fonts of every registered face and size.
+
+        Building a scaled font for the first time resolves the face with
+        fontconfig. The glyphs of the digits, which are the ones most widget
+        text is made of, are also loaded. Fonts that have already been built
+        are skipped.
+        """
+        for name, sizes in self._sizes.items():
+            for size in sizes:
+                if (name, size) not in self._fonts:
+                    self.get(name, size).text_extents(WARM_UP_TEXT)
+
+
+registry = FontRegistry()
+"""The default font registry, used by the ``use_font`` brush."""
+
+
+def register(name, family,
+             slant=cairo.FONT_SLANT_NORMAL,
+             weight=cairo.FONT_WEIGHT_NORMAL,
+             sizes=()):
+    """Register a font face with the default registry.
+
+    See :func:`FontRegistry.register` for details.
+    """
+    registry.register(name, family, slant, weight, sizes)
+
+
+def warm():
+    """Warm up the fonts of the default registry.
+
+    This is called automatically before a canvas is shown.
+    """
+    registry.warm()
@@ -26,23 +26,25 @@ replicate conky's behaviour then consider using the :mod:`blighty.x11`
 submodule instead.
 """
 
-try:
-    import gi
-except ImportError:
-    raise ImportError("Unable to import PyGObject. See https://pygobject.readthedocs.io/ for more info.")
 
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk
+def __getattr__(name):
+    # PyGObject and GTK are only imported on first use.
+    if name != "Canvas":
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
+    from .canvas import Canvas
+    globals()["Canvas"] = Canvas
 
-from .canvas import Canvas
+    return Canvas
 
 
 def start_event_loop():
     """Start the main GTK event loop."""
+    from .canvas import Gtk
     Gtk.main()
 
 
 def stop_event_loop():
     """Stop the main GTK event loop."""
+    from .canvas import Gtk
     Gtk.main_quit()
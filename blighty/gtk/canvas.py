@@ -98,6 +98,10 @@ Module API
 ==========
 """
 
+# XWayland fix. This must be set before GDK is initialised.
+import os
+os.environ["GDK_BACKEND"] = "x11"
+
 try:
     import gi
 except ImportError:
@@ -105,12 +109,11 @@ except ImportError:
 
 gi.require_version('Gtk', '3.0')
 gi.require_version('Gdk', '3.0')
-from time import sleep
-
 from blighty import (CanvasGravity, CanvasType, ExtendedContext, TextAlign,
                      brush)
-from blighty._brush import BrushSets, draw_grid, write_text
-from gi.repository import Gdk, Gtk
+from blighty._brush import (BrushSets, brush_doc, draw_grid, image,
+                            use_font, write_text)
+from gi.repository import Gdk, GLib, Gtk
 
 WINDOW_TYPE_MAP = [
     Gdk.WindowTypeHint.NORMAL,
@@ -187,9 +190,12 @@ class Canvas(Gtk.Window):
         # Connect signals
         self.connect("draw", self._on_draw)
         self.connect("delete-event", Gtk.main_quit)
+        self.connect("destroy", self._on_destroy)
 
         BrushSets.inherit(type(self))
         self._extended_context = None
+        self._images = {}
+        self._timeout_id = None
 
     def _translate_coordinates(self, x, y):
         if self.xine_screen < 0 or self.xine_screen >= self.screen.get_n_monitors():
@@ -221,13 +227,32 @@ class Canvas(Gtk.Window):
         return tx + x_org, ty + y_org
 
     def _on_draw(self, widget, cr):
-        self._extended_context = ExtendedContext(cr, self)
+        # GTK passes a new Cairo context on every frame.
+        if self._extended_context is None:
+            self._extended_context = ExtendedContext(cr, self)
+        else:
+            self._extended_context.set_context(cr)
 
         self.on_draw(self._extended_context)
 
-        widget.queue_draw()
+    def _schedule(self):
+        self._timeout_interval = self.interval
+        self._timeout_id = GLib.timeout_add(max(1, int(self.interval)), self._on_timeout)
+
+    def _on_timeout(self):
+        self.queue_draw()
 
-        sleep(self.interval / 1000.)
+        if self.interval != self._timeout_interval:
+            # The interval has changed so we replace this timeout source.
+            self._schedule()
+            return False
+
+        return True
+
+    def _on_destroy(self, widget):
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
 
     def on_draw(self, cr):
         """Draw callback.
@@ -240,9 +265,20 @@ class Canvas(Gtk.Window):
         raise NotImplementedError("on_draw method not implemented in subclass.")
 
     def show(self):
-        """Map the canvas to screen and set it ready for drawing."""
+        """Map the canvas to screen and set it ready for drawing.
+
+        The fonts in the :mod:`blighty.fonts` registry are warmed up first.
+        """
+        from blighty.fonts import warm
+
+        warm()
         self.show_all()
 
+        # Redraws are driven by a timeout on the main loop, which sleeps
+        # until the next canvas is due.
+        if self._timeout_id is None:
+            self._schedule()
+
     def move(self, x, y):
         """Move the canvas to new coordinates.
 
@@ -252,6 +288,13 @@ class Canvas(Gtk.Window):
         self.y = y
         return super().move(*self._translate_coordinates(x, y))
 
+    def invalidate(self):
+        """Request a redraw of the canvas as soon as possible.
+
+        This method is thread-safe.
+        """
+        GLib.idle_add(self.queue_draw)
+
     def dispose(self):
         """Dispose of the canvas.
 
@@ -260,46 +303,21 @@ class Canvas(Gtk.Window):
         """
         self.destroy()
 
-    # TODO: Remove duplicate docstrings
-
+    @brush_doc(draw_grid)
     def draw_grid(ctx, x = 50, y = 50):
-        """Draw a grid on the canvas [**implicit brush**].
-
-        This implicit brush method is intended to help with determining the
-        location of points on the canvas during development.
-
-        Args:
-            x (int): The horizontal spacing between lines.
-            y (int): The vertical spacing between lines.
-        """
         draw_grid(ctx, x, y)
 
     @brush
+    @brush_doc(write_text)
     def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
-        """Write aligned text [**explicit brush**].
-
-        This explicit brush method helps write aligned text on the canvas. The
-        *x* and *y* coordinates are relative to the specified *alignment*. By
-        default, this is ``blighty.TextAlign.TOP_LEFT``, meaning that the text
-        will be left-aligned and on top of the horizontal line that passes
-        through *y* on the vertical axis. In terms of the point *(x,y)* on the
-        Canvas, the text will develop in the NE direction.
-
-        The return value is the text extents, in case that some further draw
-        operations depend on the space required by the text to be drawn on the
-        canvas.
-
-        Note that font face and size need to be set on the Cairo context prior
-        to a call to this method.
-
-        Args:
-            x (int): The horizontal coordinate.
-            y (int): The vertical coordinate.
-            text (str): The text to write.
-            align (int): The text alignment. Detaulf is ``TextAlign.TOP_LEFT``.
+        return write_text(cr, x, y, text, align)
 
-        Returns:
-            tuple: The same return value as ``cairo.text_extents``.
+    @brush
+    @brush_doc(image)
+    def image(ctx, source, size = None, loader = None, slot = None):
+        return image(ctx, source, size, loader, slot)
 
-        """
-        return write_text(cr, x, y, text, align)
+    @brush
+    @brush_doc(use_font)
+    def use_font(ctx, name, size):
+        return use_font(ctx, name, size)
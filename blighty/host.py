@@ -0,0 +1,454 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Widget host.
+
+Running every widget as a script of its own means paying for an interpreter,
+an X connection, the font and image caches and the samplers once per widget.
+The :class:`Host` class runs any number of X11 widgets in a single process
+instead, where all of these are shared. It is also available from the command
+line::
+
+    python -m blighty widgets.json ~/.config/blighty/widgets/
+
+Widgets are loaded from *sources*, which are either JSON configuration files
+or directories of widget modules. A configuration file is a list of widget
+specifications, optionally wrapped in an object under the ``"widgets"`` key::
+
+    {
+        "widgets": [
+            {"module": "examples/cpu.py"},
+            {
+                "name": "clock",
+                "module": "examples/clock.py",
+                "class": "Clock",
+                "args": [0, 0, 400, 400],
+                "kwargs": {"gravity": "center", "interval": 1000}
+            }
+        ]
+    }
+
+The ``module`` is either the path of a Python file, relative to the
+configuration file, or the dotted name of an importable module. If a
+``class`` is given, the widget is an instance of it, created with the given
+``args`` and ``kwargs``. Otherwise the widget is built by the *build
+function* of the module, called with the same arguments. This is the
+module-level ``build`` function, if any, or else the ``build`` static method
+of the canvas class defined in the module, which is what the widgets in the
+``examples`` folder provide. A build function can return a single canvas or
+a list of canvases. The ``gravity`` and ``canvas_type`` arguments can be
+given by name.
+
+Every Python file in a directory source, except the ones whose name starts
+with an underscore, is a widget, named after the file and built by its build
+function.
+
+Widgets can be added and removed at runtime with :func:`Host.add` and
+:func:`Host.remove`, from any thread. On ``SIGHUP`` the host reads its
+sources again and applies the differences, i.e. it removes the widgets that
+are gone or whose specification has changed, and adds the new ones.
+
+Objects that should be shared by all the widgets, like samplers, can be
+obtained with :func:`shared`.
+
+The host can also serve a push socket (see :mod:`blighty.push`) from its event
+loop. The canvases of every widget are registered with the name of the widget.
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import selectors
+import signal
+import sys
+from collections import deque
+from threading import Lock, current_thread, main_thread
+
+from blighty import CanvasGravity, CanvasType
+
+
+_logger = logging.getLogger(__name__)
+
+_shared = {}
+_shared_lock = Lock()
+
+
+def shared(factory, *args, **kwargs):
+    """Get an object that is shared by all the widgets in the process.
+
+    The object is created by calling *factory* with the given arguments the
+    first time it is requested. Later calls with the same arguments return
+    the same object.
+
+    Example:
+        class Cpu(blighty.x11.Canvas):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.cpu = shared(CpuSampler, smoothing=.5)
+
+    Args:
+        factory (callable): the object factory, e.g. a class.
+
+    Returns:
+        the shared object.
+    """
+    key = (factory, args, tuple(sorted(kwargs.items())))
+
+    with _shared_lock:
+        value = _shared.get(key)
+        if value is None:
+            value = _shared[key] = factory(*args, **kwargs)
+
+    return value
+
+
+def load_module(module):
+    """Load a widget module.
+
+    Args:
+        module (str): the path of a Python file or the dotted name of an
+            importable module.
+
+    Returns:
+        module: the loaded module. Files are executed again on every call.
+    """
+    if not module.endswith(".py"):
+        return importlib.import_module(module)
+
+    path = os.path.abspath(module)
+    name, _ = os.path.splitext(os.path.basename(path))
+
+    # Allow widget modules to import their siblings.
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.append(folder)
+
+    spec = importlib.util.spec_from_file_location("blighty_widget_" + name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def find_build(module):
+    """Find the build function of a widget module.
+
+    Returns:
+        callable: the module-level ``build`` function or, if there is none,
+        the ``build`` static method of the first class defined in the module
+        that has one.
+    """
+    build = getattr(module, "build", None)
+    if callable(build):
+        return build
+
+    for value in vars(module).values():
+        if isinstance(value, type) and value.__module__ == module.__name__:
+            build = getattr(value, "build", None)
+            if callable(build):
+                return build
+
+    raise ValueError("No build function found in widget module {}.".format(module.__name__))
+
+
+def build_widget(spec):
+    """Build the canvases of a widget.
+
+    Args:
+        spec (dict): the widget specification, as described in the module
+            documentation.
+
+    Returns:
+        list: the canvases of the widget. They are not shown yet.
+    """
+    module = load_module(spec["module"])
+
+    args = spec.get("args", [])
+    kwargs = dict(spec.get("kwargs", {}))
+    for key, enum in (("gravity", CanvasGravity), ("canvas_type", CanvasType)):
+        if isinstance(kwargs.get(key), str):
+            kwargs[key] = getattr(enum, kwargs[key].upper())
+
+    factory = getattr(module, spec["class"]) if "class" in spec else find_build(module)
+    canvases = factory(*args, **kwargs)
+
+    return list(canvases) if isinstance(canvases, (list, tuple)) else [canvases]
+
+
+def load_source(source):
+    """Load the widget specifications from a source.
+
+    Args:
+        source (str): the path of a JSON configuration file or of a
+            directory of widget modules.
+
+    Returns:
+        dict: the widget specifications, by widget name, in order.
+    """
+    if os.path.isdir(source):
+        return {
+            name[:-3]: {"module": os.path.join(source, name)}
+            for name in sorted(os.listdir(source))
+            if name.endswith(".py") and not name.startswith("_")
+        }
+
+    with open(source) as fin:
+        config = json.load(fin)
+
+    if isinstance(config, dict):
+        config = config.get("widgets", [])
+
+    folder = os.path.dirname(os.path.abspath(source))
+    specs = {}
+    for spec in config:
+        if isinstance(spec, str):
+            spec = {"module": spec}
+        else:
+            spec = dict(spec)
+
+        module = spec["module"]
+        if module.endswith(".py"):
+            module = spec["module"] = os.path.join(folder, os.path.expanduser(module))
+
+        name = spec.pop("name", None) or os.path.splitext(os.path.basename(module))[0]
+        if name in specs:
+            raise ValueError("Duplicate widget name {} in {}.".format(name, source))
+        specs[name] = spec
+
+    return specs
+
+
+class Host:
+    """Single-process widget host.
+
+    All the widgets run on the X11 event loop of the host, which is started
+    with :func:`run`. Unlike :func:`blighty.x11.start_event_loop`, it keeps
+    running when there are no widgets left, until :func:`stop` is called or
+    the process receives ``SIGINT`` or ``SIGTERM``.
+
+    Args:
+        sources (list): the widget sources. See :func:`load_source`.
+        reload (bool): whether to turn the reload mode of the canvases on.
+            See :mod:`blighty.x11.reload`.
+        push (str): the path of the push socket to serve, or an empty string
+            for the default path. Default is ``None``, i.e. no push socket.
+    """
+
+    def __init__(self, sources=(), reload=False, push=None):
+        self.sources = list(sources)
+        self.reload_mode = reload
+        self.push = push
+        self.push_server = None
+        self.widgets = {}  # name -> (spec, canvases)
+
+        self._requests = deque()
+        self._running = False
+
+        # The wakeup pipe only exists while the event loop runs. Requests
+        # made before are handled as soon as it starts.
+        self._wakeup_r = self._wakeup_w = None
+        self._wakeup_lock = Lock()
+
+    def _request(self, *request):
+        # Requests can come from any thread, but canvases must be created and
+        # destroyed by the thread that runs the event loop.
+        self._requests.append(request)
+        with self._wakeup_lock:
+            if self._wakeup_w is None:
+                return
+            try:
+                os.write(self._wakeup_w, b"\0")
+            except BlockingIOError:
+                # The event loop will wake up anyway.
+                pass
+
+    def add(self, name, spec):
+        """Add a widget. An existing widget with the same name is replaced.
+
+        This method is thread-safe.
+
+        Args:
+            name (str): the name of the widget.
+            spec (dict): the widget specification.
+        """
+        self._request(self._add, name, spec)
+
+    def remove(self, name):
+        """Remove a widget. This method is thread-safe."""
+        self._request(self._remove, name)
+
+    def reload(self):
+        """Read the sources again and apply the differences.
+
+        This method is thread-safe.
+        """
+        self._request(self._reload)
+
+    def stop(self):
+        """Stop the event loop and remove all the widgets.
+
+        This method is thread-safe.
+        """
+        self._request(self._stop)
+
+    def _add(self, name, spec):
+        if name in self.widgets:
+            self._remove(name)
+
+        try:
+            canvases = build_widget(spec)
+        except Exception:
+            _logger.exception("Unable to load widget %s", name)
+            return
+
+        for canvas in canvases:
+            if self.reload_mode:
+                canvas.watch()
+            canvas.show()
+
+        self.widgets[name] = (spec, canvases)
+        if self.push_server is not None:
+            for canvas in canvases:
+                self.push_server.register(name, canvas)
+
+        _logger.info("Widget %s added", name)
+
+    def _remove(self, name):
+        _, canvases = self.widgets.pop(name, (None, ()))
+        if self.push_server is not None:
+            self.push_server.unregister(name)
+
+        for canvas in canvases:
+            canvas.destroy()
+
+        _logger.info("Widget %s removed", name)
+
+    def _reload(self):
+        specs = {}
+        try:
+            for source in self.sources:
+                specs.update(load_source(source))
+        except (OSError, ValueError, KeyError) as e:
+            _logger.error("Unable to load the widget sources: %s", e)
+            return
+
+        for name, (spec, _) in list(self.widgets.items()):
+            if specs.get(name) != spec:
+                self._remove(name)
+
+        for name, spec in specs.items():
+            if name not in self.widgets:
+                self._add(name, spec)
+
+    def _stop(self):
+        for name in list(self.widgets):
+            self._remove(name)
+
+        self._running = False
+
+    def _drain(self):
+        try:
+            while len(os.read(self._wakeup_r, 512)) == 512:
+                pass
+        except BlockingIOError:
+            pass
+
+    def _on_signal(self, signum, frame):
+        if signum == signal.SIGHUP:
+            self.reload()
+        else:
+            self.stop()
+
+    def run(self):
+        """Load the widgets from the sources and run the event loop."""
+        from blighty.x11 import (_dispatch_pending, _get_connection_number,
+                                 _get_display_generation, _pending)
+
+        handlers = {}
+        if current_thread() is main_thread():
+            for signum in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+                handlers[signum] = signal.signal(signum, self._on_signal)
+
+        with self._wakeup_lock:
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_r, selectors.EVENT_READ)
+        x_connection = (-1, None)
+
+        try:
+            if self.push is not None:
+                from blighty.push import PushServer
+
+                self.push_server = PushServer(self.push)
+                selector.register(self.push_server.fileno(), selectors.EVENT_READ)
+
+            self._running = True
+            self._reload()
+
+            while True:
+                while self._requests:
+                    request, *args = self._requests.popleft()
+                    request(*args)
+
+                # The X connection is closed when the last canvas is destroyed
+                # and opened again by the next one, usually with the same file
+                # descriptor, which epoll has silently dropped in the
+                # meantime. The display generation tells the two apart.
+                fd = _get_connection_number()
+                connection = (fd, _get_display_generation())
+                if connection != x_connection:
+                    if x_connection[0] >= 0:
+                        selector.unregister(x_connection[0])
+                    if fd >= 0:
+                        selector.register(fd, selectors.EVENT_READ)
+                    x_connection = connection
+
+                if fd >= 0:
+                    _dispatch_pending()
+
+                if not self._running:
+                    break
+
+                # Xlib might have queued events already, in which case the
+                # file descriptor will not become readable.
+                for key, _ in selector.select(0 if fd >= 0 and _pending() else None):
+                    if key.fd == self._wakeup_r:
+                        self._drain()
+                    elif self.push_server is not None and key.fd == self.push_server.fileno():
+                        self.push_server.poll()
+        finally:
+            selector.close()
+            with self._wakeup_lock:
+                os.close(self._wakeup_r)
+                os.close(self._wakeup_w)
+                self._wakeup_r = self._wakeup_w = None
+            if self.push_server is not None:
+                self.push_server.close()
+                self.push_server = None
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,192 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Matplotlib integration.
+
+This module provides the :class:`FigurePlot` class, an adapter that draws a
+matplotlib figure on a blighty canvas without rebuilding it on every frame.
+
+The figure, its axes and its artists are created only once. The artists that
+change from one frame to the next are marked as *animated* and their data is
+updated in place, e.g. with ``Line2D.set_data`` or
+``PathCollection.set_offsets``. Everything else (axes, ticks, labels, ...) is
+rendered once into an off-screen background surface, so that drawing a frame
+only requires painting the background and the animated artists on the Cairo
+context.
+
+Example:
+    class CpuPlot(blighty.x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            self.values = [0] * 100
+            self.plot = FigurePlot(self.width, self.height)
+            ax = self.plot.add_subplot(111, ylim=(0, 100))
+            self.line, = ax.plot(self.values)
+            self.plot.animate(self.line)
+
+        def on_draw(self, ctx):
+            self.values = self.values[1:] + [cpu_percent()]
+            self.line.set_ydata(self.values)
+            self.plot.draw(ctx)
+
+If the static part of the figure needs to change, e.g. because the axes
+limits have changed, call :func:`FigurePlot.invalidate` to have the background
+rendered again on the next frame.
+"""
+
+import cairo
+
+try:
+    import numpy as np
+    from matplotlib.backends.backend_cairo import FigureCanvasCairo, RendererCairo
+    from matplotlib.figure import Figure
+except ImportError:
+    raise ImportError("Unable to import matplotlib. See https://matplotlib.org/ for more info.")
+
+
+def update_fill_between(collection, x, y1, y2=0):
+    """Update the data of a ``fill_between`` collection in place.
+
+    The collection returned by ``Axes.fill_between`` has no ``set_data``
+    method in older versions of matplotlib. This function replaces its
+    vertices with the polygon bounded by the two curves instead of creating a
+    new collection.
+
+    Args:
+        collection (PolyCollection): the collection returned by
+            ``Axes.fill_between``.
+        x (array-like): the *x* coordinates of the nodes.
+        y1 (array-like or float): the first curve.
+        y2 (array-like or float): the second curve. Default is ``0``.
+    """
+    x = np.asarray(x, dtype=float)
+    y1 = np.broadcast_to(np.asarray(y1, dtype=float), x.shape)
+    y2 = np.broadcast_to(np.asarray(y2, dtype=float), x.shape)
+
+    collection.set_verts([np.concatenate((
+        np.column_stack((x, y1)),
+        np.column_stack((x[::-1], y2[::-1])),
+    ))])
+
+
+class FigurePlot:
+    """A matplotlib figure that can be drawn on a blighty canvas.
+
+    The figure is available via the ``figure`` attribute and has a transparent
+    background by default. Create axes and artists on it as usual, then mark
+    the ones that change between frames with :func:`animate`.
+
+    Args:
+        width (int): the width of the plot, in pixels.
+        height (int): the height of the plot, in pixels.
+        dpi (int): the resolution of the figure. Default is ``96``.
+        transparent (bool): whether the figure and axes background should be
+            transparent. Default is ``True``.
+    """
+
+    def __init__(self, width, height, dpi=96, transparent=True):
+        self.width = width
+        self.height = height
+        self.transparent = transparent
+
+        self.figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        FigureCanvasCairo(self.figure)
+        if transparent:
+            self.figure.set_facecolor((0, 0, 0, 0))
+
+        self._renderer = RendererCairo(dpi)
+        self._artists = []
+        self._background = None
+
+    def add_subplot(self, *args, **kwargs):
+        """Add a subplot to the figure.
+
+        This is a thin wrapper around ``Figure.add_subplot`` that also makes
+        the axes background transparent, if required.
+
+        Returns:
+            Axes: the new axes.
+        """
+        ax = self.figure.add_subplot(*args, **kwargs)
+        if self.transparent:
+            ax.set_facecolor((0, 0, 0, 0))
+
+        self.invalidate()
+
+        return ax
+
+    def animate(self, *artists):
+        """Mark artists as animated.
+
+        Animated artists are excluded from the cached background and are
+        redrawn on every call to :func:`draw`, in the order in which they are
+        added.
+
+        Returns:
+            The first of the given artists, for convenience.
+        """
+        for artist in artists:
+            artist.set_animated(True)
+            self._artists.append(artist)
+
+        return artists[0] if artists else None
+
+    def invalidate(self):
+        """Invalidate the cached background.
+
+        The static part of the figure is rendered again on the next call to
+        :func:`draw`.
+        """
+        self._background = None
+
+    def _render_background(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+
+        self._renderer.set_context(cairo.Context(surface))
+        self.figure.draw(self._renderer)  # Animated artists are skipped.
+        surface.flush()
+
+        self._background = surface
+
+    def draw(self, cr):
+        """Draw the plot on the given Cairo context.
+
+        The plot is drawn with its top-left corner at the origin of the
+        current user space.
+        """
+        if self._background is None:
+            self._render_background()
+
+        cr.save()
+
+        cr.set_source_surface(self._background, 0, 0)
+        cr.paint()
+
+        renderer = self._renderer
+        renderer.set_context(cr)
+        renderer.width, renderer.height = self.width, self.height
+
+        for artist in self._artists:
+            artist.draw(renderer)
+
+        cr.restore()
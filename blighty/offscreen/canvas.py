@@ -0,0 +1,311 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Description
+===========
+
+This module provides the :class:`Canvas` class for the creation of offscreen
+canvases.
+
+Offscreen canvases have the same interface as :class:`blighty.x11.Canvas`
+objects, but they draw into a ``cairo.ImageSurface`` rather than a window.
+The same subclass of :class:`Canvas` can therefore be used to draw a widget on
+the screen and to render it in memory, where the only change is the class it
+extends::
+
+    from blighty.offscreen import Canvas
+
+    class MyCanvas(Canvas):
+        def on_draw(self, ctx):
+            ctx.set_source_rgb(1, 0, 0)
+            ctx.rectangle(0, 0, ctx.canvas.width >> 1, ctx.canvas.height >> 1)
+            ctx.fill()
+
+    canvas = MyCanvas(0, 0, 200, 200)
+    canvas.render_frame()
+    canvas.write_to_png("my_canvas.png")
+
+Arguments that only make sense for a window, like the window type or the
+gravity, are accepted and stored, but have no effect on the rendering.
+
+
+Rendering frames
+----------------
+
+A frame is rendered by calling the :func:`render_frame` method, which calls
+the :func:`on_draw` callback. As with X11 canvases, the callback can return
+``True`` to retain the content of the previous frame.
+
+Shown canvases can also be rendered at regular intervals by the event loop
+started with :func:`start_event_loop`. Its scheduling is simpler than that of
+X11 canvases: frames are always rendered at the nominal ``interval``, since
+there is no frame budget to stretch it (hence no ``effective_interval``) and
+no :func:`schedule` method to move the next frame.
+
+
+Module API
+==========
+"""
+
+from threading import Event
+from time import monotonic
+
+import cairo
+
+from blighty import CanvasGravity, CanvasType, ExtendedContext, TextAlign, brush
+from blighty._brush import (BrushSets, brush_doc, draw_grid, image,
+                            use_font, write_text)
+
+
+_canvases = []
+_wakeup = Event()
+_running = False
+
+
+def start_event_loop():
+    """Start the event loop of the offscreen canvases.
+
+    Every shown canvas is rendered once every ``interval`` milliseconds, or
+    as soon as possible after a call to its :func:`Canvas.invalidate` method.
+    The event loop returns when :func:`stop_event_loop` is called or when
+    there are no more canvases to render.
+    """
+    global _running
+
+    if _running:
+        return
+
+    _running = True
+    try:
+        while _running and _canvases:
+            _wakeup.clear()
+
+            now = monotonic()
+            for canvas in list(_canvases):
+                if canvas._needs_redraw or canvas._expiry <= now:
+                    canvas.render_frame()
+
+                    interval = (canvas.interval or 1) / 1000.
+                    canvas._expiry += interval
+                    if canvas._expiry < now:
+                        # Skip the frames we are late for.
+                        canvas._expiry = now + interval
+
+            if _canvases:
+                _wakeup.wait(max(0, min(c._expiry for c in _canvases) - monotonic()))
+    finally:
+        _running = False
+
+
+def stop_event_loop():
+    """Stop the event loop of the offscreen canvases."""
+    global _running
+
+    _running = False
+    _wakeup.set()
+
+
+class Canvas:
+    """Offscreen Canvas object.
+
+    This class is meant to be used as a superclass and should not be
+    instantiated directly. Subclasses should implement the :func:`on_draw`
+    callback, which is invoked every time a frame is rendered.
+
+    The rendered image is available from the ``surface`` attribute.
+    """
+
+    def __init__(self, x, y, width, height,
+                 interval = 1000,
+                 screen = 0,
+                 window_type = CanvasType.DESKTOP,
+                 gravity = CanvasGravity.NORTH_WEST,
+                 sticky = True,
+                 keep_below = True,
+                 skip_taskbar = True,
+                 skip_pager = True
+                 ):
+        """Initialise the Canvas object.
+
+        If this method is overriden, keep in mind that the initialisation looks
+        up for brushes inherited from all the superclasses. It is therefore
+        important that the method from ``super()`` is called to ensure the
+        correct functioning of the brushes.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.interval = interval
+        self.xine_screen = screen
+        self.window_type = window_type
+        self.gravity = gravity
+
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        self._context = cairo.Context(self.surface)
+
+        self._needs_redraw = False
+        self._expiry = 0
+
+        BrushSets.inherit(type(self))
+        self._extended_context = None
+        self._images = {}
+
+    def render_frame(self):
+        """Render a frame.
+
+        This calls the :func:`on_draw` callback. If it returns ``True``, the
+        content of the previous frame is retained. If it raises an exception,
+        the content of the previous frame is retained too and the exception
+        is propagated.
+
+        Returns:
+            cairo.ImageSurface: the surface with the rendered frame.
+        """
+        self._needs_redraw = False
+
+        cr = self._context
+        if self._extended_context is None:
+            self._extended_context = ExtendedContext(cr, self)
+
+        cr.push_group()
+        try:
+            skip = self.on_draw(self._extended_context)
+        finally:
+            group = cr.pop_group()
+
+        if skip is None:
+            cr.save()
+            cr.set_operator(cairo.OPERATOR_SOURCE)
+            cr.set_source(group)
+            cr.paint()
+            cr.restore()
+
+        self.surface.flush()
+
+        return self.surface
+
+    def on_draw(self, ctx):
+        """Draw callback.
+
+        This method gets called every time a frame is rendered. Every subclass
+        of :class:`Canvas` must implement this method.
+        """
+        raise NotImplementedError("on_draw method not implemented in subclass.")
+
+    def show(self):
+        """Add the canvas to the event loop.
+
+        The fonts in the :mod:`blighty.fonts` registry are warmed up first.
+        """
+        from blighty.fonts import warm
+
+        warm()
+
+        if self not in _canvases:
+            self._expiry = monotonic()
+            _canvases.append(self)
+            _wakeup.set()
+
+    def invalidate(self):
+        """Request a new frame as soon as possible.
+
+        This method is thread-safe.
+        """
+        self._needs_redraw = True
+        _wakeup.set()
+
+    def move(self, x, y):
+        """Move the canvas to new coordinates."""
+        self.x = x
+        self.y = y
+
+    def get_size(self):
+        """Get the size of the canvas.
+
+        Returns:
+            tuple: the ``(width, height)`` tuple.
+        """
+        return self.width, self.height
+
+    def dispose(self):
+        """Dispose of the canvas.
+
+        For offscreen canvases, this is equivalent to calling the
+        :func:`destroy` method.
+        """
+        self.destroy()
+
+    def destroy(self):
+        """Remove the canvas from the event loop."""
+        if self in _canvases:
+            _canvases.remove(self)
+            _wakeup.set()
+
+    def write_to_png(self, fobj):
+        """Write the last rendered frame to a PNG image.
+
+        Args:
+            fobj (str or file): the file name or a writable file object.
+        """
+        self.surface.write_to_png(fobj)
+
+    def to_bytes(self):
+        """Get the pixel data of the last rendered frame.
+
+        The data is in Cairo's ``FORMAT_ARGB32`` format, that is native-endian
+        premultiplied ARGB, with ``4 * width`` bytes per row.
+
+        Returns:
+            bytes: the pixel data.
+        """
+        stride = self.surface.get_stride()
+        data = self.surface.get_data()
+        row = self.width << 2
+
+        if stride == row:
+            return bytes(data)
+
+        return b"".join(
+            bytes(data[i:i + row]) for i in range(0, stride * self.height, stride)
+        )
+
+    @brush_doc(draw_grid)
+    def draw_grid(ctx, x = 50, y = 50):
+        draw_grid(ctx, x, y)
+
+    @brush
+    @brush_doc(write_text)
+    def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
+        return write_text(cr, x, y, text, align)
+
+    @brush
+    @brush_doc(image)
+    def image(ctx, source, size = None, loader = None, slot = None):
+        return image(ctx, source, size, loader, slot)
+
+    @brush
+    @brush_doc(use_font)
+    def use_font(ctx, name, size):
+        return use_font(ctx, name, size)
@@ -0,0 +1,512 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Lightweight plotting.
+
+This module provides the :class:`Chart` class for drawing simple line, area
+and bar charts, with axes and ticks, directly with Cairo. It is meant for the
+kind of charts that desktop widgets usually need, when the import time and the
+per-frame overhead of matplotlib are out of proportion, but the Conky-like
+:class:`blighty.legacy.Graph` is too basic.
+
+A chart can hold multiple series, each drawn with its own type and colour.
+Data can be given as any sequence of numbers, including NumPy arrays, in
+which case the scaling to canvas coordinates is vectorised.
+
+The layout of the axes (limits, ticks and labels) is cached and computed again
+only when the axes limits change. The path of each series is cached as a
+``cairo.Path`` and built again, with one Cairo call per point, only when its
+data is replaced or the axes limits change. Redrawing a chart whose data has
+not changed costs a handful of Cairo calls per series, regardless of the
+number of points. When values are pushed to a rolling series, only the new
+points are appended to the cached path, which is then drawn scrolled to the
+left. The path is built again once it has scrolled by the whole width of the
+chart, so pushing a value costs about two Cairo calls per series on average,
+plus the copy of the path, which Cairo does in C. Note that the axes limits of
+a chart with an automatic *y* axis change, and all its paths are built again,
+whenever the range of the data crosses a tick.
+
+Example:
+    class Load(blighty.x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            self.chart = Chart(0, 0, self.width, self.height, ylim=(0, 100))
+            self.chart.add_series("cpu", SeriesType.AREA, color=(.2, .6, 1, 1))
+            self.chart.add_series("mem", color=(1, .4, .2, 1))
+
+        def on_draw(self, ctx):
+            self.chart.push_value("cpu", cpu_percent())
+            self.chart.push_value("mem", memory_percent())
+            self.chart.draw(ctx)
+"""
+
+from collections import deque
+from math import ceil, floor, log10
+
+
+class SeriesType(type):
+    """The chart series types.
+
+    - ``LINE`` draws the data points joined by straight lines.
+    - ``AREA`` is like ``LINE``, but the area between the line and the *x*
+      axis is filled with a translucent version of the series colour.
+    - ``BAR`` draws a vertical bar for each data point.
+    """
+
+    LINE = 0
+    AREA = 1
+    BAR = 2
+
+
+def _nice(x, round_):
+    """Round a positive number to a "nice" number, i.e. 1, 2 or 5 times a
+    power of 10."""
+    exp = floor(log10(x))
+    f = x / 10 ** exp
+
+    if round_:
+        nf = 1 if f < 1.5 else 2 if f < 3 else 5 if f < 7 else 10
+    else:
+        nf = 1 if f <= 1 else 2 if f <= 2 else 5 if f <= 5 else 10
+
+    return nf * 10 ** exp
+
+
+def nice_ticks(lo, hi, n=5):
+    """Compute nicely spaced ticks for the given range.
+
+    The returned range is the smallest one that contains the given one and
+    whose limits are multiples of the tick step.
+
+    Args:
+        lo (float): the lower limit of the range.
+        hi (float): the upper limit of the range.
+        n (int): the desired number of ticks. Default is ``5``.
+
+    Returns:
+        list: the tick values.
+    """
+    if hi <= lo:
+        hi = lo + 1
+
+    step = _nice(_nice(hi - lo, False) / max(n - 1, 1), True)
+    lo = floor(lo / step) * step
+    hi = ceil(hi / step) * step
+
+    # Round to the precision of the step to avoid floating point noise in
+    # the labels.
+    digits = max(0, -floor(log10(step)))
+    return [round(lo + i * step, digits) for i in range(int(round((hi - lo) / step)) + 1)]
+
+
+def _scale(values, lo, hi, a, b):
+    """Map values from the range [lo, hi] to the range [a, b]."""
+    k = (b - a) / (hi - lo) if hi != lo else 0.
+
+    if hasattr(values, "__array__"):
+        # The caller has already imported NumPy, so this is cheap.
+        import numpy as np
+        return (a + (np.asarray(values, dtype=float) - lo) * k).tolist()
+
+    return [a + (v - lo) * k for v in values]
+
+
+def _min_max(values):
+    if hasattr(values, "__array__"):
+        import numpy as np
+        values = np.asarray(values)
+        return values.min().item(), values.max().item()
+
+    return min(values), max(values)
+
+
+class Series:
+    """A chart data series.
+
+    Instances of this class are created with :func:`Chart.add_series` and
+    should not be created directly.
+    """
+
+    def __init__(self, name, type_, color, line_width, fill_alpha, maxlen):
+        self.name = name
+        self.type = type_
+        self.color = color
+        self.line_width = line_width
+        self.fill_alpha = fill_alpha
+        self.maxlen = maxlen
+
+        self.x = None
+        self.y = deque(maxlen=maxlen)
+
+        self._path = None
+        self._fill = None
+
+        # For rolling series, the number of values pushed since the path was
+        # last extended, and the number of slots by which the path has
+        # scrolled since it was built.
+        self._pushed = 0
+        self._shift = 0
+
+    def __len__(self):
+        return len(self.y)
+
+    def set_data(self, y, x=None):
+        """Replace the data of the series.
+
+        Args:
+            y (array-like): the *y* values.
+            x (array-like): the *x* values. If omitted, the *y* values are
+                plotted against their index.
+        """
+        self.y = y
+        self.x = x
+        self._path = None
+
+    def push_value(self, value):
+        """Append a value to the series.
+
+        The series is then treated as a rolling window of (at most) as many
+        values as the chart is wide, in pixels, drawn from right to left in
+        the same fashion as :class:`blighty.legacy.Graph`.
+        """
+        if not isinstance(self.y, deque):
+            self.y = deque(self.y, maxlen=self.maxlen)
+            self.x = None
+            self._path = None
+
+        self.y.append(value)
+        self._pushed += 1
+
+    def _rolling(self):
+        return self.x is None and isinstance(self.y, deque)
+
+    def get_x(self):
+        """Get the *x* values of the series."""
+        if self.x is not None:
+            return self.x
+
+        offset = self.maxlen - len(self.y) if self._rolling() else 0
+        return range(offset, offset + len(self.y))
+
+    def limits(self):
+        """Get the limits of the series data.
+
+        Returns:
+            tuple: the 4-tuple ``(x_min, x_max, y_min, y_max)``, or ``None``
+            if the series is empty.
+        """
+        if not len(self.y):
+            return None
+
+        if self._rolling():
+            x_lo, x_hi = 0, self.maxlen - 1
+        elif self.x is None:
+            x_lo, x_hi = 0, len(self.y) - 1
+        else:
+            x_lo, x_hi = _min_max(self.x)
+
+        return (x_lo, x_hi) + _min_max(self.y)
+
+
+class Chart:
+    """A lightweight chart.
+
+    The constructor allows you to specify where the chart should be located
+    on the canvas, as well as its size. The axes limits can be fixed with the
+    *xlim* and *ylim* arguments. When omitted, they are computed from the data
+    and rounded to the nearest tick.
+
+    Args:
+        x (int): the *x* coordinate of the top-left corner of the chart.
+        y (int): the *y* coordinate of the top-left corner of the chart.
+        width (int): the width of the chart, including the axes labels.
+        height (int): the height of the chart, including the axes labels.
+        xlim (tuple): the limits of the *x* axis. Default is automatic.
+        ylim (tuple): the limits of the *y* axis. Default is automatic.
+        axes (bool): whether to draw the axes, the grid and the tick labels.
+            Default is ``True``.
+        ticks (int): the approximate number of ticks on each axis. Default is
+            ``5``.
+        font_size (float): the size of the tick labels. Default is ``9``.
+        color (tuple): the RGBA colour of the axes. Default is light grey.
+    """
+
+    def __init__(self, x, y, width, height,
+                 xlim = None,
+                 ylim = None,
+                 axes = True,
+                 ticks = 5,
+                 font_size = 9,
+                 color = (.8, .8, .8, .8)
+                 ):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.xlim = xlim
+        self.ylim = ylim
+        self.axes = axes
+        self.ticks = ticks
+        self.font_size = font_size
+        self.color = color
+
+        self.series = {}
+
+        self._layout = None
+        self._layout_key = None
+
+    def add_series(self, name, type_ = SeriesType.LINE,
+                   color = (1, 1, 1, 1),
+                   line_width = 1,
+                   fill_alpha = .3
+                   ):
+        """Add a new data series to the chart.
+
+        Series are drawn in the order in which they are added.
+
+        Args:
+            name (str): the name of the series.
+            type_ (int): the series type, as enumerated in
+                :class:`SeriesType`. Default is ``SeriesType.LINE``.
+            color (tuple): the RGBA colour of the series.
+            line_width (float): the line width of line and area series.
+            fill_alpha (float): the opacity of the area fill, relative to the
+                series colour.
+
+        Returns:
+            Series: the new series.
+        """
+        series = Series(name, type_, color, line_width, fill_alpha, self.width)
+        self.series[name] = series
+        return series
+
+    def set_data(self, name, y, x = None):
+        """Replace the data of the series with the given name.
+
+        See :func:`Series.set_data`.
+        """
+        self.series[name].set_data(y, x)
+
+    def push_value(self, name, value):
+        """Append a value to the series with the given name.
+
+        See :func:`Series.push_value`.
+        """
+        self.series[name].push_value(value)
+
+    def _limits(self):
+        limits = [l for l in (s.limits() for s in self.series.values()) if l]
+        if not limits:
+            return (0, 1), (0, 1)
+
+        xlim = self.xlim or (min(l[0] for l in limits), max(l[1] for l in limits))
+
+        ylim = self.ylim
+        if ylim is None:
+            y_lo = min(l[2] for l in limits)
+            if any(s.type != SeriesType.LINE for s in self.series.values()):
+                y_lo = min(y_lo, 0)  # Areas and bars start from zero.
+
+            yticks = nice_ticks(y_lo, max(l[3] for l in limits), self.ticks)
+            ylim = yticks[0], yticks[-1]
+
+        return tuple(xlim), tuple(ylim)
+
+    def _compute_layout(self, cr, xlim, ylim):
+        layout = {"xticks": [], "yticks": [], "labels": []}
+
+        left, top, right, bottom = 0, 0, self.width, self.height
+
+        if self.axes:
+            cr.save()
+            cr.set_font_size(self.font_size)
+
+            yticks = [t for t in nice_ticks(*ylim, n=self.ticks) if ylim[0] <= t <= ylim[1]]
+            xticks = [t for t in nice_ticks(*xlim, n=self.ticks) if xlim[0] <= t <= xlim[1]]
+
+            ylabels = [(t, "{:g}".format(t), cr.text_extents("{:g}".format(t))) for t in yticks]
+            xlabels = [(t, "{:g}".format(t), cr.text_extents("{:g}".format(t))) for t in xticks]
+
+            cr.restore()
+
+            label_height = max((e.height for _, _, e in xlabels + ylabels), default=0)
+            left = ceil(max((e.x_advance for _, _, e in ylabels), default=0)) + 4
+            top = ceil(label_height / 2)
+            bottom -= ceil(label_height) + 4
+            right -= ceil(max((e.x_advance for _, _, e in xlabels[-1:]), default=0) / 2)
+
+            layout["yticks"] = _scale(yticks, ylim[0], ylim[1], bottom, top)
+            for (_, label, ex), y in zip(ylabels, layout["yticks"]):
+                layout["labels"].append((left - 4 - ex.x_advance, y + ex.height / 2, label))
+
+            layout["xticks"] = _scale(xticks, xlim[0], xlim[1], left, right)
+            for (_, label, ex), x in zip(xlabels, layout["xticks"]):
+                layout["labels"].append((x - ex.x_advance / 2, self.height, label))
+
+        layout["rect"] = left, top, right - left, bottom - top
+
+        return layout
+
+    def _add_points(self, cr, series, xs, ys, xlim, ylim):
+        # Add the given points to the current path and cache it.
+        left, top, width, height = self._layout["rect"]
+        bottom = top + height
+        base = min(max(_scale((0,), ylim[0], ylim[1], bottom, top)[0], top), bottom)
+
+        if series.type == SeriesType.BAR:
+            w = width / (xlim[1] - xlim[0] + 1) * .8
+            rectangle = cr.rectangle
+            for x, y in zip(xs, ys):
+                rectangle(x - w / 2, base, w, y - base)
+
+        else:
+            line_to = cr.line_to
+            for x, y in zip(xs, ys):
+                line_to(x, y)
+
+        series._path = cr.copy_path()
+
+        if series.type == SeriesType.AREA:
+            line_to(cr.get_current_point()[0], base)
+            line_to(series._x0, base)
+            cr.close_path()
+            series._fill = cr.copy_path()
+
+        cr.new_path()
+
+    def _build_paths(self, cr, series, xlim, ylim):
+        left, top, width, height = self._layout["rect"]
+        bottom = top + height
+
+        ys = _scale(series.y, ylim[0], ylim[1], bottom, top)
+        xs = _scale(series.get_x(), xlim[0], xlim[1], left, left + width)
+
+        series._x0 = xs[0]
+        series._step = width / (xlim[1] - xlim[0]) if xlim[1] != xlim[0] else 0.
+        series._pushed = series._shift = 0
+
+        cr.new_path()
+        if series.type != SeriesType.BAR:
+            cr.move_to(xs[0], ys[0])
+            xs, ys = xs[1:], ys[1:]
+        self._add_points(cr, series, xs, ys, xlim, ylim)
+
+    def _extend_paths(self, cr, series, xlim, ylim):
+        # The values pushed to a rolling series since the path was last
+        # extended are added to the right of it, in the coordinates of the
+        # path when it was built. Each value pushed scrolls the path to the
+        # left by one slot.
+        left, top, width, height = self._layout["rect"]
+        bottom = top + height
+
+        n = series._pushed
+        ys = _scale([series.y[i] for i in range(-n, 0)], ylim[0], ylim[1], bottom, top)
+        start = series.maxlen + series._shift
+        xs = _scale(range(start, start + n), xlim[0], xlim[1], left, left + width)
+
+        series._pushed = 0
+        series._shift += n
+
+        cr.new_path()
+        cr.append_path(series._path)
+        self._add_points(cr, series, xs, ys, xlim, ylim)
+
+    def _draw_axes(self, cr):
+        layout = self._layout
+        left, top, width, height = layout["rect"]
+
+        cr.set_source_rgba(*self.color)
+
+        cr.set_line_width(.5)
+        for y in layout["yticks"]:
+            cr.move_to(left, y)
+            cr.line_to(left + width, y)
+        for x in layout["xticks"]:
+            cr.move_to(x, top + height)
+            cr.line_to(x, top + height + 3)
+        cr.stroke()
+
+        cr.set_line_width(1)
+        cr.move_to(left, top)
+        cr.line_to(left, top + height)
+        cr.line_to(left + width, top + height)
+        cr.stroke()
+
+        cr.set_font_size(self.font_size)
+        for x, y, label in layout["labels"]:
+            cr.move_to(x, y)
+            cr.show_text(label)
+        cr.new_path()
+
+    def draw(self, cr):
+        """Draw the chart on the given Cairo context."""
+        xlim, ylim = self._limits()
+
+        cr.save()
+        cr.translate(self.x, self.y)
+
+        if self._layout_key != (xlim, ylim):
+            self._layout = self._compute_layout(cr, xlim, ylim)
+            self._layout_key = (xlim, ylim)
+            for series in self.series.values():
+                series._path = None
+
+        if self.axes:
+            self._draw_axes(cr)
+
+        cr.rectangle(*self._layout["rect"])
+        cr.clip()
+
+        for series in self.series.values():
+            if not len(series):
+                continue
+
+            if series._path is None or series._shift + series._pushed >= series.maxlen:
+                self._build_paths(cr, series, xlim, ylim)
+            elif series._pushed:
+                self._extend_paths(cr, series, xlim, ylim)
+
+            r, g, b, a = series.color
+
+            cr.save()
+            cr.translate(-series._shift * series._step, 0)
+
+            if series.type == SeriesType.BAR:
+                cr.append_path(series._path)
+                cr.set_source_rgba(r, g, b, a)
+                cr.fill()
+
+            else:
+                if series.type == SeriesType.AREA:
+                    cr.append_path(series._fill)
+                    cr.set_source_rgba(r, g, b, a * series.fill_alpha)
+                    cr.fill()
+
+                cr.append_path(series._path)
+                cr.set_source_rgba(r, g, b, a)
+                cr.set_line_width(series.line_width)
+                cr.stroke()
+
+            cr.restore()
+
+        cr.restore()
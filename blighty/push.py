@@ -0,0 +1,328 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Push endpoint.
+
+Rather than polling external programs from :func:`on_draw`, canvases can have
+data pushed to them. The :class:`PushServer` class listens on a Unix domain
+socket for messages from other processes, e.g. cron jobs, build systems or
+shell scripts, and delivers them to the canvases registered with it by name.
+
+Messages are JSON objects, one per line, with the name of the target canvas
+and the values to update::
+
+    {"canvas": "build", "values": {"status": "failed", "duration": 42.5}}
+
+The values are passed to the ``on_push`` method of every canvas registered
+with that name, if it has one, or else merged into its ``pushed`` dictionary.
+The canvas is then invalidated, so that it is redrawn straight away.
+
+Example:
+    class Build(blighty.x11.Canvas):
+        def on_push(self, values):
+            self.status = values.get("status", self.status)
+
+        ...
+
+    server = PushServer()
+    server.register("build", Build(0, 0, 200, 32))
+    server.start()
+
+From a shell script, values can be pushed with ``socat`` or with the command
+line interface of this module::
+
+    python -m blighty.push build status=failed duration=42.5
+
+All the connections are served by a single selector, without a thread per
+client. The server either runs the selector in a background thread of its
+own, with :func:`PushServer.start`, in which case ``on_push`` is called from
+that thread, or it can be driven by an existing event loop with
+:func:`PushServer.poll`, like the one of :class:`blighty.host.Host`.
+"""
+
+import json
+import logging
+import os
+import selectors
+import socket
+import sys
+from tempfile import gettempdir
+from threading import Thread
+
+
+_logger = logging.getLogger(__name__)
+
+# Clients sending longer lines are disconnected.
+MAX_MESSAGE = 1 << 16
+
+
+def default_path():
+    """Get the default path of the push socket.
+
+    Returns:
+        str: ``blighty.sock`` in ``$XDG_RUNTIME_DIR``, or in the temporary
+        directory if the variable is not set.
+    """
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or gettempdir(), "blighty.sock")
+
+
+def deliver(canvas, values):
+    """Deliver pushed values to a canvas and invalidate it."""
+    on_push = getattr(canvas, "on_push", None)
+    if on_push is not None:
+        on_push(values)
+    else:
+        try:
+            canvas.pushed.update(values)
+        except AttributeError:
+            canvas.pushed = dict(values)
+
+    canvas.invalidate()
+
+
+class PushServer:
+    """Unix domain socket server for pushed values.
+
+    Args:
+        path (str): the path of the socket. Default is :func:`default_path`.
+            A stale socket left behind by a dead process is replaced, but an
+            error is raised if another server is listening on it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        self.canvases = {}  # name -> list of canvases
+
+        self._socket = self._listen()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket, selectors.EVENT_READ)
+        self._thread = None
+        self._running = False
+
+    def _listen(self):
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.unlink(self.path)
+            else:
+                raise RuntimeError("Another push server is listening on {}.".format(self.path))
+            finally:
+                probe.close()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Only the owner of the process can push values.
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(umask)
+
+        sock.listen()
+        sock.setblocking(False)
+
+        return sock
+
+    def register(self, name, canvas):
+        """Register a canvas to receive the values pushed to the given name.
+
+        Many canvases can be registered with the same name.
+        """
+        self.canvases.setdefault(name, []).append(canvas)
+
+    def unregister(self, name, canvas=None):
+        """Unregister a canvas, or all the canvases with the given name."""
+        if canvas is None:
+            self.canvases.pop(name, None)
+            return
+
+        canvases = self.canvases.get(name, [])
+        if canvas in canvases:
+            canvases.remove(canvas)
+        if not canvases:
+            self.canvases.pop(name, None)
+
+    def fileno(self):
+        """Get a file descriptor that is readable when :func:`poll` has work.
+
+        This is the file descriptor of the selector, which can be watched by
+        another event loop.
+        """
+        return self._selector.fileno()
+
+    def poll(self, timeout=0):
+        """Serve the connections that are ready.
+
+        Args:
+            timeout (float): the maximum time to wait for a connection to be
+                ready, in seconds. ``None`` waits indefinitely.
+        """
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._socket:
+                self._accept()
+            else:
+                self._read(key.fileobj, key.data)
+
+    def _accept(self):
+        try:
+            conn, _ = self._socket.accept()
+        except BlockingIOError:
+            return
+
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, bytearray())
+
+    def _close(self, conn):
+        self._selector.unregister(conn)
+        conn.close()
+
+    def _read(self, conn, buffer):
+        try:
+            data = conn.recv(MAX_MESSAGE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+
+        if not data:
+            # Accept a last message without a trailing newline.
+            if buffer.strip():
+                self._dispatch(bytes(buffer))
+            self._close(conn)
+            return
+
+        buffer += data
+        *lines, rest = buffer.split(b"\n")
+        buffer[:] = rest
+
+        for line in lines:
+            if line.strip():
+                self._dispatch(line)
+
+        if len(buffer) > MAX_MESSAGE:
+            _logger.warning("Push message too long. Closing the connection.")
+            self._close(conn)
+
+    def _dispatch(self, line):
+        try:
+            message = json.loads(line.decode())
+            name, values = message["canvas"], message["values"]
+            if not isinstance(values, dict):
+                raise ValueError("values must be an object")
+        except (ValueError, KeyError, TypeError) as e:
+            _logger.warning("Invalid push message %r: %s", line[:80], e)
+            return
+
+        # Canvases might be registered by another thread in the meantime.
+        for canvas in list(self.canvases.get(name, ())):
+            try:
+                deliver(canvas, values)
+            except Exception:
+                _logger.exception("Unable to push values to canvas %s", name)
+
+    def start(self):
+        """Serve the connections from a background thread."""
+        if self._thread is not None:
+            return
+
+        def run():
+            while self._running:
+                self.poll(.5)
+
+        self._running = True
+        self._thread = Thread(target=run, daemon=True, name="PushServer")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, if running."""
+        if self._thread is None:
+            return
+
+        self._running = False
+        self._thread.join()
+        self._thread = None
+
+    def close(self):
+        """Stop serving, close all the connections and remove the socket."""
+        self.stop()
+
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def send(name, values, path=None):
+    """Push values to the canvases registered with the given name.
+
+    Args:
+        name (str): the name of the target canvases.
+        values (dict): the values to push. They must be serialisable to JSON.
+        path (str): the path of the socket. Default is :func:`default_path`.
+    """
+    message = json.dumps({"canvas": name, "values": values}).encode() + b"\n"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path or default_path())
+        sock.sendall(message)
+
+
+def _parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main(argv=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog = "python -m blighty.push", description = "Push values to blighty canvases")
+    parser.add_argument("canvas", help = "the name of the target canvases")
+    parser.add_argument(
+        "values", nargs = "+", metavar = "NAME=VALUE",
+        help = "the values to push. Values that are valid JSON are decoded, e.g. 42 is a number"
+    )
+    parser.add_argument("--socket", help = "the path of the push socket")
+    args = parser.parse_args(argv)
+
+    values = {}
+    for item in args.values:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error("invalid value {!r}. Expected NAME=VALUE.".format(item))
+        values[name] = _parse_value(value)
+
+    try:
+        send(args.canvas, values, args.socket)
+    except OSError as e:
+        sys.exit("Unable to push values: {}".format(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""System samplers.
+
+The objects in this module read system statistics straight from ``/proc``
+without ever blocking the caller. They are meant to be called from within the
+``on_draw`` callback of a canvas, where a call like
+``psutil.cpu_percent(0.1)`` would stall the event loop, and with it every other
+canvas, for the whole sampling interval.
+
+Instead of sleeping between two measurements, the samplers keep the counters
+read on the previous call and compute the statistics as deltas between
+consecutive calls. The sampling interval is therefore the refresh interval of
+the canvas itself.
+
+Samplers that are too expensive to run on every frame, like the
+:class:`ProcessTracker`, can also be refreshed by a background thread, so that
+the draw path only ever reads the latest snapshot.
+"""
+
+import os
+from collections import namedtuple
+from heapq import nlargest
+from threading import Event, Thread
+from time import monotonic
+
+
+def _read_cpu_times(stat_file):
+    """Read the CPU time counters from a ``/proc/stat``-like file.
+
+    Returns a list of ``(busy, total)`` pairs, in jiffies. The first element
+    refers to the aggregate of all the CPUs, followed by one element per core.
+    """
+    times = []
+    with open(stat_file, "rb") as fin:
+        for line in fin:
+            if not line.startswith(b"cpu"):
+                break
+
+            # user nice system idle iowait irq softirq steal [guest guest_nice]
+            # The guest times are already accounted for in user and nice.
+            fields = [int(f) for f in line.split()[1:9]]
+            total = sum(fields)
+            times.append((total - fields[3] - fields[4], total))
+
+    return times
+
+
+class CpuSampler:
+    """Non-blocking CPU utilisation sampler.
+
+    Every call to :func:`sample` reads the CPU counters from ``/proc/stat``
+    and returns the utilisation of each core, in percent, since the previous
+    call. The first call returns the average utilisation since boot.
+
+    The *smoothing* argument controls an exponential moving average applied to
+    the samples. It must be a number in the range [0, 1), with ``0`` (the
+    default) meaning no smoothing at all. Higher values give smoother, but
+    less responsive, readings.
+
+    Example:
+        class Cpu(blighty.x11.Canvas):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.cpu = CpuSampler(smoothing=.5)
+
+            def on_draw(self, ctx):
+                cores = self.cpu.sample()
+                ctx.write_text(0, 0, "{:.0f}%".format(self.cpu.total))
+    """
+
+    def __init__(self, smoothing=0.0, stat_file="/proc/stat"):
+        if not 0 <= smoothing < 1:
+            raise ValueError("Smoothing factor must be in the range [0, 1).")
+
+        self.smoothing = smoothing
+        self.stat_file = stat_file
+        self.total = 0.0
+        self.percpu = []
+        self._last = None
+
+    def __len__(self):
+        return len(self.percpu)
+
+    def sample(self):
+        """Sample the CPU utilisation.
+
+        Returns:
+            list: the utilisation of each core, in percent. The aggregate
+            utilisation is stored in the ``total`` attribute.
+        """
+        times = _read_cpu_times(self.stat_file)
+        last = self._last
+
+        if last is None or len(last) != len(times):
+            # First call or CPU hotplug: utilisation since boot.
+            last = [(0, 0)] * len(times)
+            smoothing = 0
+        else:
+            smoothing = self.smoothing
+
+        values = []
+        for (busy, total), (last_busy, last_total) in zip(times, last):
+            delta = total - last_total
+            values.append(100. * (busy - last_busy) / delta if delta > 0 else 0.)
+
+        if smoothing:
+            a, b = smoothing, 1. - smoothing
+            values = [a * o + b * n for o, n in zip([self.total] + self.percpu, values)]
+
+        self._last = times
+        self.total = values[0]
+        self.percpu = values[1:]
+
+        return self.percpu
+
+
+Process = namedtuple("Process", ["pid", "name", "cpu_percent"])
+"""A process as reported by the :class:`ProcessTracker`."""
+
+
+class ProcessTracker:
+    """Incremental top-*n* process tracker.
+
+    The tracker keeps the state of every process across calls to
+    :func:`refresh`, that is the process name and the CPU time observed on the
+    previous call, so that only ``/proc/<pid>/stat`` is read for each process.
+    Processes that are created or that terminate between two calls are
+    detected by comparing the listing of ``/proc`` with the set of known PIDs.
+    The CPU usage is computed as the delta of the CPU times between two calls
+    and the processes with the highest usage are selected with a bounded heap.
+
+    Reading the stat file of thousands of processes still takes a few
+    milliseconds, so the tracker can also run in the background. In this case
+    one calls :func:`start` once and then uses :func:`top` from the
+    ``on_draw`` callback to get the latest snapshot without any I/O.
+
+    Example:
+        class Top(blighty.x11.Canvas):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.processes = ProcessTracker(5)
+                self.processes.start(interval=2)
+
+            def on_draw(self, ctx):
+                for i, p in enumerate(self.processes.top()):
+                    ctx.write_text(0, 16 * i, "{} {}".format(p.pid, p.name))
+    """
+
+    def __init__(self, n=5, proc="/proc"):
+        self.n = n
+        self.proc = proc
+
+        self._hz = os.sysconf("SC_CLK_TCK")
+        self._states = {}  # pid -> [start time, name, CPU time]
+        self._last = None
+        self._snapshot = ()
+        self._thread = None
+        self._stop = Event()
+
+    def __len__(self):
+        return len(self._states)
+
+    def _read_stat(self, pid):
+        with open(os.path.join(self.proc, pid, "stat"), "rb") as fin:
+            stat = fin.read()
+
+        # The process name can contain spaces and parentheses so we split the
+        # fields after the last closing parenthesis.
+        rpar = stat.rindex(b")")
+        fields = stat[rpar + 2:].split()
+
+        # utime, stime and starttime (see proc(5)).
+        return stat[stat.index(b"(") + 1:rpar], int(fields[11]) + int(fields[12]), fields[19]
+
+    def refresh(self):
+        """Refresh the process statistics.
+
+        Returns:
+            list: the top *n* processes by CPU usage, as :class:`Process`
+            tuples, in decreasing order of CPU usage.
+        """
+        now = monotonic()
+        elapsed = (now - self._last) * self._hz if self._last is not None else 0
+        self._last = now
+
+        states = self._states
+
+        pids = {pid for pid in os.listdir(self.proc) if pid.isdigit()}
+        for pid in states.keys() - pids:
+            del states[pid]
+
+        usage = []
+        for pid in pids:
+            try:
+                name, cpu_time, start = self._read_stat(pid)
+            except (OSError, ValueError, IndexError):
+                # The process has terminated in the meantime.
+                states.pop(pid, None)
+                continue
+
+            state = states.get(pid)
+            if state is None or state[0] != start:
+                # New process, or a PID that has been recycled.
+                states[pid] = [start, name.decode(errors="replace"), cpu_time]
+                continue
+
+            if elapsed:
+                usage.append((100. * (cpu_time - state[2]) / elapsed, pid, state[1]))
+            state[2] = cpu_time
+
+        self._snapshot = tuple(
+            Process(int(pid), name, round(cpu, 1))
+            for cpu, pid, name in nlargest(self.n, usage)
+        )
+
+        return list(self._snapshot)
+
+    def top(self):
+        """Get the latest snapshot of the top *n* processes.
+
+        When the tracker is not running in the background this is the result
+        of the last call to :func:`refresh`.
+
+        Returns:
+            tuple: the top *n* processes as :class:`Process` tuples.
+        """
+        return self._snapshot
+
+    def start(self, interval=1.0):
+        """Refresh the process statistics in a background thread.
+
+        Args:
+            interval (float): the time between refreshes, in seconds.
+        """
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self.refresh()
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = Thread(target=run, daemon=True, name="ProcessTracker")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread, if running."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
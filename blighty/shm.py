@@ -0,0 +1,285 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared memory channels.
+
+For high-rate signals, like audio levels or sensor streams sampled at
+kilohertz rates, even pushing values over a socket (see :mod:`blighty.push`)
+costs a serialisation and a few copies per sample. The :class:`Ring` class is
+a named ring buffer of samples in POSIX shared memory instead. A producer
+process appends samples to it, and canvases, in the same or in other
+processes, read the latest window of samples as a NumPy array that is a view
+of the shared memory, without any copies.
+
+Example:
+    # Producer
+    ring = Ring.create("levels", capacity=4096, channels=2)
+    while True:
+        ring.extend(read_levels())  # An (n, 2) array
+
+    # Canvas
+    class Levels(blighty.x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.ring = Ring.open("levels")
+
+        def on_draw(self, ctx):
+            window = self.ring.latest(self.width)  # A view of shape (n, 2)
+            ...
+
+The ring is *mirrored*, that is every sample is stored twice, ``capacity``
+samples apart, so that any window of up to ``capacity`` consecutive samples
+is contiguous in memory and can be returned as a plain view.
+
+There is a single producer per ring and no locks. The producer writes the
+samples first and then advances the write index, so readers never see
+samples that have not been written yet. The producer does not wait for the
+readers though, so a window that is being read can be overwritten by the
+producer if the ring wraps around in the meantime. Make the capacity
+comfortably larger than the windows read by the canvases, e.g. twice as
+large, or copy the window if a stable snapshot is needed.
+"""
+
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("Unable to import numpy. See https://numpy.org/ for more info.")
+
+
+SHM_DIR = "/dev/shm"
+
+MAGIC = b"BLIGHTY1"
+
+# magic, capacity, channels, dtype; the write index follows at HEAD_OFFSET.
+HEADER = struct.Struct("<8sQI12s")
+HEAD_OFFSET = 32
+DATA_OFFSET = 64
+
+
+def _path(name):
+    if not name or "/" in name:
+        raise ValueError("Invalid ring name {!r}.".format(name))
+
+    return os.path.join(SHM_DIR, "blighty-" + name)
+
+
+class Ring:
+    """Single-producer ring buffer in shared memory.
+
+    Use :func:`create` and :func:`open` rather than the constructor.
+
+    Attributes:
+        name (str): the name of the ring.
+        capacity (int): the maximum number of samples in the ring.
+        channels (int): the number of values per sample.
+        dtype (numpy.dtype): the type of the values.
+    """
+
+    def __init__(self, name, fd, writable):
+        self.name = name
+
+        try:
+            self._mmap = mmap.mmap(
+                fd, 0, mmap.MAP_SHARED,
+                mmap.PROT_READ | (mmap.PROT_WRITE if writable else 0)
+            )
+        finally:
+            os.close(fd)
+
+        magic, capacity, channels, dtype = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError("{} is not a blighty ring.".format(_path(name)))
+
+        self.capacity = capacity
+        self.channels = channels
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode())
+
+        self._head = np.ndarray((1,), np.uint64, self._mmap, HEAD_OFFSET)
+        self._data = np.ndarray((capacity << 1, channels), self.dtype, self._mmap, DATA_OFFSET)
+        if not writable:
+            self._data.flags.writeable = False
+
+    @classmethod
+    def create(cls, name, capacity, channels=1, dtype="float64"):
+        """Create a new ring, replacing any existing one with the same name.
+
+        Args:
+            name (str): the name of the ring.
+            capacity (int): the maximum number of samples in the ring.
+            channels (int): the number of values per sample. Default is
+                ``1``.
+            dtype: the NumPy type of the values. Default is ``float64``.
+
+        Returns:
+            Ring: the new ring, open for writing.
+        """
+        dtype = np.dtype(dtype)
+        size = DATA_OFFSET + (capacity << 1) * channels * dtype.itemsize
+
+        # Readers that map the new file see either no file or a complete
+        # header, never a partial one.
+        path = _path(name)
+        tmp = "{}.{}".format(path, os.getpid())
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, HEADER.pack(MAGIC, capacity, channels, dtype.str.encode()), 0)
+            os.rename(tmp, path)
+        except Exception:
+            os.close(fd)
+            os.unlink(tmp)
+            raise
+
+        return cls(name, fd, True)
+
+    @classmethod
+    def open(cls, name, writable=False):
+        """Open an existing ring.
+
+        Args:
+            name (str): the name of the ring.
+            writable (bool): whether to open the ring for writing. There
+                should only ever be one producer. Default is ``False``.
+
+        Returns:
+            Ring: the ring.
+        """
+        return cls(name, os.open(_path(name), os.O_RDWR if writable else os.O_RDONLY), writable)
+
+    @property
+    def head(self):
+        """The total number of samples written to the ring."""
+        return int(self._head[0])
+
+    def __len__(self):
+        return min(self.head, self.capacity)
+
+    def append(self, sample):
+        """Append a sample, i.e. one value per channel."""
+        head = self.head
+        i = head % self.capacity
+
+        self._data[i] = self._data[i + self.capacity] = sample
+        self._head[0] = head + 1
+
+    def extend(self, samples):
+        """Append many samples at once.
+
+        Args:
+            samples (array-like): the samples, as an array of shape
+                ``(n, channels)``, or of shape ``(n,)`` for single-channel
+                rings. Only the last ``capacity`` samples are kept if there
+                are more.
+        """
+        samples = np.asarray(samples, dtype=self.dtype).reshape(-1, self.channels)
+        n = len(samples)
+        if not n:
+            return
+
+        capacity = self.capacity
+        head = self.head
+
+        if n > capacity:
+            head += n - capacity
+            samples = samples[-capacity:]
+            n = capacity
+
+        data = self._data
+        i = head % capacity
+        first = min(n, capacity - i)
+
+        data[i:i + first] = data[i + capacity:i + capacity + first] = samples[:first]
+        if first < n:
+            data[:n - first] = data[capacity:capacity + n - first] = samples[first:]
+
+        self._head[0] = head + n
+
+    def latest(self, n=None):
+        """Get the latest samples.
+
+        Args:
+            n (int): the maximum number of samples. Default is the capacity
+                of the ring.
+
+        Returns:
+            numpy.ndarray: a read-only view of shape ``(m, channels)`` of the
+            shared memory, with the latest *m* samples in chronological
+            order, where *m* is at most *n*.
+        """
+        head = self.head
+        n = max(0, min(self.capacity if n is None else n, head, self.capacity))
+
+        start = (head - n) % self.capacity
+        view = self._data[start:start + n]
+        view.flags.writeable = False
+
+        return view
+
+    def since(self, index):
+        """Get the samples written since the given write index.
+
+        This is useful to consumers that need every sample, e.g. to compute
+        statistics, rather than the latest window.
+
+        Args:
+            index (int): the write index returned by the previous call, or
+                ``0`` to start from the oldest sample in the ring.
+
+        Returns:
+            tuple: a view of the new samples, as in :func:`latest`, and the
+            write index to pass to the next call. If more than ``capacity``
+            samples have been written in the meantime, only the latest
+            ``capacity`` are returned.
+        """
+        head = self.head
+        return self.latest(head - index), head
+
+    def close(self):
+        """Unmap the ring.
+
+        The views returned by :func:`latest` and :func:`since` must have been
+        released, otherwise a ``BufferError`` is raised.
+        """
+        self._head = self._data = None
+        self._mmap.close()
+
+    def unlink(self):
+        """Remove the ring from the shared memory.
+
+        Processes that have the ring open can still use it until they close
+        it.
+        """
+        try:
+            os.unlink(_path(self.name))
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
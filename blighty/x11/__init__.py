@@ -26,6 +26,40 @@ replicate conky's behaviour, the API offered by this module is the closest to
 it.
 """
 
-from blighty._x11 import *
+import os
 
-from . canvas import Canvas
+__all__ = ["Canvas", "Panel", "Widget", "create_canvases", "start_event_loop", "stats"]
+
+
+def __getattr__(name):
+    # The C extension, and with it Cairo, is only loaded on first use. The X
+    # display is opened even later, when the first canvas is created.
+    if name in ("Canvas", "create_canvases"):
+        from . import canvas
+        value = getattr(canvas, name)
+    elif name in ("Panel", "Widget"):
+        from . import panel
+        value = getattr(panel, name)
+    elif name in __all__ or name == "BaseCanvas" or name[:1] == "_" and name[:2] != "__":
+        from blighty import _x11
+        try:
+            value = getattr(_x11, name)
+        except AttributeError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+    else:
+        # Not an object of the extension, e.g. a submodule that is being
+        # imported.
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get("BLIGHTY_TRACE"):
+    from . import trace
+    trace.start(os.environ["BLIGHTY_TRACE"])
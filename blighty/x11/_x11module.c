@@ -24,6 +24,7 @@
 #include "pycairo.h"
 
 #include "atelier.h"
+#include "trace.h"
 
 extern PyTypeObject BaseCanvasType;
 
@@ -35,6 +36,90 @@ static PyMethodDef x11methods[] = {
     METH_NOARGS,
     "Starts the main event loop for all the BaseCanvas objects."
   },
+  {
+    "stats",
+    Atelier_stats,
+    METH_NOARGS,
+    "Returns the runtime statistics of all the canvases in the process.\n\n"
+
+    "The statistics are the sum of the statistics of every canvas, "
+    "including the ones that have been destroyed, as returned by "
+    ":func:`BaseCanvas.stats`. The maximum times are the maxima across all "
+    "the canvases. The ``canvases`` entry gives the number of live canvases."
+  },
+  {
+    "_flush",
+    Atelier_flush,
+    METH_NOARGS,
+    "Sends all the buffered requests to the X server."
+  },
+  {
+    "_get_connection_number",
+    Atelier_get_connection_number,
+    METH_NOARGS,
+    "Returns the file descriptor of the X connection, or -1 if none."
+  },
+  {
+    "_get_display_generation",
+    Atelier_get_display_generation,
+    METH_NOARGS,
+    "Returns the number of times the X display has been opened. The file "
+    "descriptor of a new connection can be the same as the one of the "
+    "previous, closed connection."
+  },
+  {
+    "_pending",
+    Atelier_pending,
+    METH_NOARGS,
+    "Returns the number of X events that are ready to be dispatched."
+  },
+  {
+    "_dispatch_pending",
+    Atelier_dispatch_pending,
+    METH_NOARGS,
+    "Dispatches the pending X events without blocking and returns the number "
+    "of canvases that are still alive."
+  },
+  {
+    "_set_attached",
+    Atelier_set_attached,
+    METH_VARARGS,
+    "Marks the X11 canvases as driven, or no longer driven, by an external "
+    "main loop that calls :func:`_dispatch_pending`, so that they request "
+    "redraws before the first events are dispatched."
+  },
+  {
+    "_trace_start",
+    Trace_start,
+    METH_VARARGS,
+    "Starts recording trace events in a ring buffer of the given capacity."
+  },
+  {
+    "_trace_stop",
+    Trace_stop,
+    METH_NOARGS,
+    "Stops recording trace events."
+  },
+  {
+    "_trace_record",
+    Trace_record_span,
+    METH_VARARGS,
+    "Records a span with the given name id, start and end times, in "
+    "microseconds, and canvas."
+  },
+  {
+    "_trace_events",
+    Trace_get_events,
+    METH_NOARGS,
+    "Returns the recorded trace events as a list of (name id, thread id, "
+    "start, end, canvas id) tuples."
+  },
+  {
+    "_trace_names",
+    Trace_get_names,
+    METH_NOARGS,
+    "Returns the names of the spans recorded by the extension."
+  },
   {NULL, NULL, 0, NULL}
 };
 
@@ -65,6 +150,17 @@ PyInit__x11(void)
   Py_INCREF(&BaseCanvasType);
   PyModule_AddObject(m, "BaseCanvas", (PyObject *)&BaseCanvasType);
 
+  // GDK opens its display when it is imported, so it is too late to make
+  // Xlib thread-safe if it has been imported first.
+  PyObject * gdk = PyDict_GetItemString(PyImport_GetModuleDict(), "gi.repository.Gdk");
+  if (gdk != NULL && PyErr_WarnEx(PyExc_RuntimeWarning,
+    "blighty.x11 should be used before GDK is imported, since Xlib must be "
+    "initialised for threads before any display is opened.", 1) < 0
+  ) {
+    Py_DECREF(m);
+    return NULL;
+  }
+
   // Initialise Atelier
   Atelier_init();
   return m;
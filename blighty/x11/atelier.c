@@ -22,6 +22,7 @@
 
 
 #include "atelier.h"
+#include "trace.h"
 #include <stdio.h>
 
 #define LOOP_INTERVAL 2000
@@ -32,21 +33,56 @@ static Display            * display = NULL;
 static XineramaScreenInfo * info    = NULL;
 static int                  n_scr   = 0;
 
+// Resources shared by all the canvases on the display
+static XVisualInfo          visualinfo;
+static Colormap             colormap = None;
+static Atom                 atoms[ATOM_COUNT];
+
+static char * ATOM_NAMES[ATOM_COUNT] = {
+  "_NET_WM_WINDOW_TYPE",
+  "_NET_WM_WINDOW_TYPE_NORMAL",
+  "_NET_WM_WINDOW_TYPE_DESKTOP",
+  "_NET_WM_WINDOW_TYPE_DOCK",
+  "_NET_WM_WINDOW_TYPE_TOOLBAR",
+  "_NET_WM_STATE",
+  "_NET_WM_STATE_BELOW",
+  "_NET_WM_STATE_STICKY",
+  "_NET_WM_STATE_SKIP_TASKBAR",
+  "_NET_WM_STATE_SKIP_PAGER",
+  "WM_PROTOCOLS",
+  "WM_DELETE_WINDOW"
+};
+
+// Statistics of the canvases that have been destroyed
+static CanvasStats          retired_stats;
+
+// Incremented every time the display is opened, to tell connections apart
+// that happen to get the same file descriptor.
+static unsigned long        display_generation = 0;
+
 
 // ----------------------------------------------------------------------------
 static PyObject *
 get_callback(PyObject * object, char * method) {
-  PyObject * py_method = PyUnicode_FromString(method);
-
-  return PyObject_HasAttr(object, py_method) > 0
-    ? PyObject_GetAttr(object, py_method)
+  return PyObject_HasAttrString(object, method) > 0
+    ? PyObject_GetAttrString(object, method)
     : NULL;
 }
 
 
+// ----------------------------------------------------------------------------
+static void
+call_method(BaseCanvas * canvas, char * method) {
+  PyObject * result = PyObject_CallMethod((PyObject *) canvas, method, NULL);
+  Py_XDECREF(result);
+}
+
+
 // ----------------------------------------------------------------------------
 Display *
 Atelier_get_display(void) {
+  // The display is only opened when it is first needed, i.e. when the first
+  // canvas is created, rather than when the extension is imported.
   if (display == NULL)
     Atelier_set_display(XOpenDisplay(NULL));
 
@@ -65,6 +101,11 @@ Atelier_set_display(Display * d) {
         n_scr = 0;
       }
 
+      if (colormap != None) {
+        XFreeColormap(display, colormap);
+        colormap = None;
+      }
+
       XCloseDisplay(display);
       display = NULL;
     }
@@ -72,6 +113,15 @@ Atelier_set_display(Display * d) {
   }
 
   display = d;
+  display_generation++;
+
+  // Intern all the atoms with a single round trip.
+  XInternAtoms(d, ATOM_NAMES, ATOM_COUNT, False, atoms);
+
+  // Query Visual for "TrueColor" and 32 bits depth (RGBA) and create a
+  // colormap for it, to be shared by all the canvases.
+  XMatchVisualInfo(d, DefaultScreen(d), 32, TrueColor, &visualinfo);
+  colormap = XCreateColormap(d, DefaultRootWindow(d), visualinfo.visual, AllocNone);
 
   // Xinerama support
   int event, error;
@@ -86,6 +136,27 @@ Atelier_set_display(Display * d) {
 }
 
 
+// ----------------------------------------------------------------------------
+Atom
+Atelier_get_atom(int atom) {
+  return atoms[atom];
+}
+
+
+// ----------------------------------------------------------------------------
+XVisualInfo *
+Atelier_get_visual_info(void) {
+  return &visualinfo;
+}
+
+
+// ----------------------------------------------------------------------------
+Colormap
+Atelier_get_colormap(void) {
+  return colormap;
+}
+
+
 // ----------------------------------------------------------------------------
 XineramaScreenInfo *
 Atelier_get_screen_info(int screen) {
@@ -102,7 +173,11 @@ Atelier_get_screen_info(int screen) {
 // ----------------------------------------------------------------------------
 void
 Atelier_init(void) {
-  // Initialise Xlib and CPython for concurrent threads.
+  // Initialise Xlib and CPython for concurrent threads. XInitThreads must be
+  // called before any other Xlib call in the process, including those made
+  // by other libraries, like GDK, so it cannot wait for the display to be
+  // opened. With libX11 older than 1.8 the display of GDK would not be
+  // thread-safe otherwise.
   XInitThreads();
   PyEval_InitThreads();
 
@@ -129,6 +204,7 @@ Atelier_remove_canvas(BaseCanvas * canvas) {
   for (int i = 0; i < PyList_Size(atelier); i++) {
     c = (BaseCanvas *) PyList_GetItem(atelier, i);
     if (c == canvas) {
+      CanvasStats_add(&retired_stats, &(canvas->stats));
       PyList_SetSlice(atelier, i, i + 1, NULL);
       int n_canvas = PyList_Size(atelier);
       if (!n_canvas)
@@ -152,60 +228,104 @@ static void
 dispatch_event(BaseCanvas * canvas, XEvent * e) {
   char keybuf[8];
   KeySym key;
-  PyObject * cb;
+  PyObject * cb = NULL;
+  PyObject * args = NULL;
+
+  canvas->stats.events++;
 
   switch (e->type) {
   case ClientMessage:
     // TODO: Extend
     if ((Atom) e->xclient.data.l[0] == canvas->wm_delete_window) {
-      PyObject_CallMethod((PyObject *) canvas, "destroy", NULL);
+      call_method(canvas, "destroy");
     }
     return;
 
   case ButtonPress:
     cb = get_callback((PyObject *) canvas, "on_button_pressed");
     if (cb != NULL) {
-      PyObject_CallObject(cb, Py_BuildValue("(iiii)",
+      args = Py_BuildValue("(iiii)",
         e->xbutton.button,
         e->xbutton.state,
         e->xbutton.x,
         e->xbutton.y
-      ));
+      );
     }
-    return;
+    break;
 
   case KeyPress:
     cb = get_callback((PyObject *) canvas, "on_key_pressed");
     if (cb != NULL) {
       XLookupString(&(e->xkey), keybuf, sizeof(keybuf), &key, NULL);
-      PyObject_CallObject(cb, Py_BuildValue("(ii)",
+      args = Py_BuildValue("(ii)",
         key,
         e->xkey.state
-      ));
+      );
     }
-    return;
+    break;
 
   case Expose:
     if (e->xexpose.count == 0) {
       if (canvas->_needs_redraw != 0) {
-        BaseCanvas__on_draw(canvas, canvas->context_arg);
+        // Clear the flag first so that a redraw requested while drawing,
+        // e.g. with invalidate, is not lost.
         canvas->_needs_redraw = 0;
+        BaseCanvas__on_draw(canvas, canvas->context_arg);
       }
 
       // Only clear the window when we are sure we are ready to paint.
       BaseCanvas__redraw(canvas);
+      BaseCanvas__painted(canvas);
 
       if (PyErr_Occurred() != NULL) {
         PyErr_Print();
-        PyObject_CallMethod((PyObject *) canvas, "dispose", NULL);
-        break;
+        call_method(canvas, "dispose");
       }
     }
     return;
 
   default:
     fprintf(stderr, "Dropping unhandled XEevent.type = %d.\n", e->type);
+    return;
+  }
+
+  // Input event handlers
+  if (cb == NULL)
+    return;
+
+  if (args != NULL) {
+    PyObject * result = PyObject_CallObject(cb, args);
+    Py_XDECREF(result);
+    Py_DECREF(args);
+  }
+  Py_DECREF(cb);
+
+  if (PyErr_Occurred() != NULL) {
+    PyErr_Print();
+    call_method(canvas, "dispose");
+  }
+}
+
+
+// ----------------------------------------------------------------------------
+static void
+handle_event(XEvent * e) {
+  if (e->type >= LASTEvent) return;
+
+  // Find the canvas based on window ID
+  BaseCanvas * canvas;
+  for (int i = 0; i < PyList_Size(atelier); i++) {
+    canvas = (BaseCanvas *) PyList_GetItem(atelier, i);
+    if (canvas->win_id == e->xany.window) {
+      TRACE_START(start);
+      dispatch_event(canvas, e);
+      TRACE_END(TRACE_DISPATCH_EVENT, start, canvas);
+      return;
+    }
   }
+
+  // The canvas has been destroyed while the event was in the queue, e.g. a
+  // redraw request, so the event is dropped.
 }
 
 
@@ -219,33 +339,115 @@ Atelier_start_event_loop(PyObject * args, PyObject * kwargs) {
   main_loop_running = 1;
 
   XEvent e;
-  BaseCanvas * canvas;
   while (main_loop_running != 0 && PyList_Size(atelier) > 0 && display != NULL) {
     Py_BEGIN_ALLOW_THREADS
     XNextEvent(display, &e);
     Py_END_ALLOW_THREADS
 
-    if (e.type >= LASTEvent) continue;
-    // Find the canvas based on window ID
-    int found = 0;
-    for (int i = 0; i < PyList_Size(atelier); i++) {
-      canvas = (BaseCanvas *) PyList_GetItem(atelier, i);
-      if (canvas->win_id == e.xany.window) {
-        found = 1;
-        break;
-      }
-    }
+    handle_event(&e);
+  }
 
-    // TODO: Raise RuntimeError!
-    if (!found) {
-      fprintf(stderr, "Canvas not found!\n");
-      return NULL;
-    }
+  main_loop_running = 0;
 
-    dispatch_event(canvas, &e);
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_get_connection_number(PyObject * args, PyObject * kwargs) {
+  return PyLong_FromLong(display != NULL ? ConnectionNumber(display) : -1);
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_get_display_generation(PyObject * args, PyObject * kwargs) {
+  return PyLong_FromUnsignedLong(display_generation);
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_pending(PyObject * args, PyObject * kwargs) {
+  int pending = 0;
+
+  if (display != NULL) {
+    XLockDisplay(display);
+    pending = XPending(display);
+    XUnlockDisplay(display);
   }
 
-  main_loop_running = 0;
+  return PyLong_FromLong(pending);
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_dispatch_pending(PyObject * args, PyObject * kwargs) {
+  // Mark the event loop as running so that the canvases request redraws.
+  main_loop_running = 2;
+
+  XEvent e;
+  while (atelier != NULL && PyList_Size(atelier) > 0 && display != NULL && XPending(display)) {
+    XNextEvent(display, &e);
+
+    handle_event(&e);
+  }
+
+  int n_canvas = atelier != NULL ? PyList_Size(atelier) : 0;
+  if (!n_canvas || display == NULL)
+    main_loop_running = 0;
+
+  return PyLong_FromLong(n_canvas);
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_set_attached(PyObject * self, PyObject * args) {
+  int attached;
+  if (!PyArg_ParseTuple(args, "p:_set_attached", &attached))
+    return NULL;
+
+  // The blocking event loop is left alone.
+  if (attached && main_loop_running == 0)
+    main_loop_running = 2;
+  else if (!attached && main_loop_running == 2)
+    main_loop_running = 0;
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_stats(PyObject * args, PyObject * kwargs) {
+  CanvasStats stats = retired_stats;
+  int n_canvas = atelier != NULL ? PyList_Size(atelier) : 0;
+
+  for (int i = 0; i < n_canvas; i++)
+    CanvasStats_add(&stats, &(((BaseCanvas *) PyList_GetItem(atelier, i))->stats));
+
+  PyObject * result = CanvasStats_to_dict(&stats);
+  if (result != NULL) {
+    PyObject * value = PyLong_FromLong(n_canvas);
+    PyDict_SetItemString(result, "canvases", value);
+    Py_DECREF(value);
+  }
+
+  return result;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Atelier_flush(PyObject * args, PyObject * kwargs) {
+  if (display != NULL) {
+    XLockDisplay(display);
+    XFlush(display);
+    XUnlockDisplay(display);
+  }
 
   Py_INCREF(Py_None); return Py_None;
 }
@@ -28,9 +28,36 @@
 
 #include <X11/extensions/Xinerama.h>  // Must be included AFTER base_canvas!
 
+// The atoms used by the canvases. They are interned in a single round trip
+// when the display is opened.
+enum {
+  ATOM_NET_WM_WINDOW_TYPE,
+  ATOM_NET_WM_WINDOW_TYPE_NORMAL,
+  ATOM_NET_WM_WINDOW_TYPE_DESKTOP,
+  ATOM_NET_WM_WINDOW_TYPE_DOCK,
+  ATOM_NET_WM_WINDOW_TYPE_TOOLBAR,
+  ATOM_NET_WM_STATE,
+  ATOM_NET_WM_STATE_BELOW,
+  ATOM_NET_WM_STATE_STICKY,
+  ATOM_NET_WM_STATE_SKIP_TASKBAR,
+  ATOM_NET_WM_STATE_SKIP_PAGER,
+  ATOM_WM_PROTOCOLS,
+  ATOM_WM_DELETE_WINDOW,
+  ATOM_COUNT
+};
+
 Display *
 Atelier_get_display(void);
 
+Atom
+Atelier_get_atom(int);
+
+XVisualInfo *
+Atelier_get_visual_info(void);
+
+Colormap
+Atelier_get_colormap(void);
+
 void
 Atelier_set_display(Display *);
 
@@ -54,6 +81,27 @@ Atelier_remove_canvas(BaseCanvas * canvas);
 PyObject *
 Atelier_start_event_loop(PyObject *, PyObject *);
 
+PyObject *
+Atelier_get_connection_number(PyObject *, PyObject *);
+
+PyObject *
+Atelier_get_display_generation(PyObject *, PyObject *);
+
+PyObject *
+Atelier_pending(PyObject *, PyObject *);
+
+PyObject *
+Atelier_dispatch_pending(PyObject *, PyObject *);
+
+PyObject *
+Atelier_set_attached(PyObject *, PyObject *);
+
+PyObject *
+Atelier_stats(PyObject *, PyObject *);
+
+PyObject *
+Atelier_flush(PyObject *, PyObject *);
+
 void
 Atelier_stop_event_loop(void);
 
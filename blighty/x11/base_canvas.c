@@ -25,6 +25,7 @@
 
 #include "atelier.h"
 #include "base_canvas.h"
+#include "trace.h"
 
 #include <X11/extensions/Xinerama.h>
 
@@ -38,18 +39,25 @@
 //
 #define UI_INTERVAL 1000  // 1 ms
 
-static const char * WINDOW_TYPE_MAP[] = {
-  "_NET_WM_WINDOW_TYPE_NORMAL",
-  "_NET_WM_WINDOW_TYPE_DESKTOP",
-  "_NET_WM_WINDOW_TYPE_DOCK",
-  "_NET_WM_WINDOW_TYPE_TOOLBAR"
+// Frame budget watchdog. The effective interval of a canvas is doubled when
+// on_draw exceeds the budget for OVERBUDGET_FRAMES consecutive frames, up to
+// 2^MAX_STRETCH times the interval, and halved when on_draw takes less than
+// half the budget for RECOVERY_FRAMES consecutive frames.
+#define OVERBUDGET_FRAMES 3
+#define RECOVERY_FRAMES   10
+#define MAX_STRETCH       4
+
+static const int WINDOW_TYPE_MAP[] = {
+  ATOM_NET_WM_WINDOW_TYPE_NORMAL,
+  ATOM_NET_WM_WINDOW_TYPE_DESKTOP,
+  ATOM_NET_WM_WINDOW_TYPE_DOCK,
+  ATOM_NET_WM_WINDOW_TYPE_TOOLBAR
 };
 
 
 //
 // PRIVATE GLOBAL STATE
 //
-static XVisualInfo            visualinfo;
 static XSetWindowAttributes   attr;
 
 
@@ -67,39 +75,234 @@ gettime(void) {
 
 
 // ----------------------------------------------------------------------------
-static void
-BaseCanvas__change_property(BaseCanvas * self, const char * property_name, const char * property_value, int mode) {
-  Display * display = Atelier_get_display();
+unsigned long long
+getmicros(void) {
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec * 1000000ULL + ts.tv_nsec / 1000;
+}
+
 
-  Atom value = XInternAtom(display, property_value, False);
+// ----------------------------------------------------------------------------
+static void
+BaseCanvas__change_property(BaseCanvas * self, int property, Atom * values, int n) {
   XChangeProperty(
-    display,
+    Atelier_get_display(),
     self->win_id,
-    XInternAtom(display, property_name, False),
+    Atelier_get_atom(property),
     XA_ATOM,
     32,
-    mode,
-    (unsigned char *) &value,
-    1
+    PropModeReplace,
+    (unsigned char *) values,
+    n
   );
 }
 
 
+// ----------------------------------------------------------------------------
+static void
+BaseCanvas__clip_damage(BaseCanvas * self, cairo_t * cr) {
+  cairo_rectangle_int_t rect;
+  int n = cairo_region_num_rectangles(self->_damage);
+
+  for (int i = 0; i < n; i++) {
+    cairo_region_get_rectangle(self->_damage, i, &rect);
+    cairo_rectangle(cr, rect.x, rect.y, rect.width, rect.height);
+  }
+  cairo_clip(cr);
+}
+
+
+// ----------------------------------------------------------------------------
+static void
+BaseCanvas__clear_damage(BaseCanvas * self) {
+  if (self->_damage != NULL) {
+    cairo_region_destroy(self->_damage);
+    self->_damage = NULL;
+  }
+}
+
+
+// ----------------------------------------------------------------------------
+// Make the new frame the source of the window updates. When only some areas
+// are damaged, these are copied onto the previous frame instead, so that the
+// rest of it is neither drawn nor uploaded again, and the source still holds
+// the whole frame for the Expose events sent by the X server.
+static void
+BaseCanvas__set_frame(BaseCanvas * self, cairo_pattern_t * group) {
+  cairo_surface_t * frame;
+
+  if (self->_damage == NULL
+    || cairo_pattern_get_surface(cairo_get_source(self->context), &frame) != CAIRO_STATUS_SUCCESS
+  ) {
+    // No damage or no previous frame, e.g. on the first redraw.
+    BaseCanvas__clear_damage(self);
+    cairo_set_source(self->context, group);
+    return;
+  }
+
+  cairo_t * cr = cairo_create(frame);
+  BaseCanvas__clip_damage(self, cr);
+  cairo_set_operator(cr, CAIRO_OPERATOR_SOURCE);
+  cairo_set_source(cr, group);
+  cairo_paint(cr);
+  cairo_destroy(cr);
+}
+
+
 // ----------------------------------------------------------------------------
 void
 BaseCanvas__redraw(BaseCanvas * self) {
   cairo_save(self->context);
+  if (self->_damage != NULL) {
+    BaseCanvas__clip_damage(self, self->context);
+    BaseCanvas__clear_damage(self);
+  }
   cairo_set_operator(self->context, CAIRO_OPERATOR_SOURCE);
   cairo_paint(self->context);
   cairo_restore(self->context);
+
+  TRACE_START(start);
   XFlush(Atelier_get_display());
+  TRACE_END(TRACE_FLUSH, start, self);
+}
+
+
+// ----------------------------------------------------------------------------
+void
+BaseCanvas__painted(BaseCanvas * self) {
+  CanvasStats * stats = &(self->stats);
+
+  if (stats->_requested_at == 0)
+    return;
+
+  unsigned long long latency = getmicros() - stats->_requested_at;
+  stats->_requested_at = 0;
+
+  stats->latency_count++;
+  stats->latency_total += latency;
+  if (latency > stats->latency_max)
+    stats->latency_max = latency;
+}
+
+
+// ----------------------------------------------------------------------------
+static void
+CanvasStats__record_draw(CanvasStats * stats, unsigned long long duration, int drawn) {
+  if (drawn) stats->frames_drawn++; else stats->frames_skipped++;
+
+  stats->draw_time_total += duration;
+  if (duration > stats->draw_time_max)
+    stats->draw_time_max = duration;
+
+  int bucket = 0;
+  while (duration >>= 1)
+    bucket++;
+  stats->draw_time_histogram[bucket < STATS_HISTOGRAM_BUCKETS ? bucket : STATS_HISTOGRAM_BUCKETS - 1]++;
+}
+
+
+// ----------------------------------------------------------------------------
+void
+CanvasStats_add(CanvasStats * to, CanvasStats * from) {
+  to->frames_drawn    += from->frames_drawn;
+  to->frames_skipped  += from->frames_skipped;
+  to->events          += from->events;
+  to->wakeups         += from->wakeups;
+  to->redraw_requests += from->redraw_requests;
+
+  for (int i = 0; i < STATS_HISTOGRAM_BUCKETS; i++)
+    to->draw_time_histogram[i] += from->draw_time_histogram[i];
+
+  to->draw_time_total += from->draw_time_total;
+  if (from->draw_time_max > to->draw_time_max)
+    to->draw_time_max = from->draw_time_max;
+
+  to->latency_count += from->latency_count;
+  to->latency_total += from->latency_total;
+  if (from->latency_max > to->latency_max)
+    to->latency_max = from->latency_max;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+CanvasStats_to_dict(CanvasStats * stats) {
+  PyObject * histogram = PyTuple_New(STATS_HISTOGRAM_BUCKETS);
+  if (histogram == NULL)
+    return NULL;
+
+  for (int i = 0; i < STATS_HISTOGRAM_BUCKETS; i++)
+    PyTuple_SET_ITEM(histogram, i, PyLong_FromUnsignedLong(stats->draw_time_histogram[i]));
+
+  return Py_BuildValue("{s:k,s:k,s:k,s:k,s:k,s:N,s:d,s:d,s:k,s:d,s:d}",
+    "frames_drawn"        , stats->frames_drawn,
+    "frames_skipped"      , stats->frames_skipped,
+    "events"              , stats->events,
+    "wakeups"             , stats->wakeups,
+    "redraw_requests"     , stats->redraw_requests,
+    "draw_time_histogram" , histogram,
+    "draw_time_total"     , stats->draw_time_total / 1e6,
+    "draw_time_max"       , stats->draw_time_max / 1e6,
+    "latency_count"       , stats->latency_count,
+    "latency_total"       , stats->latency_total / 1e6,
+    "latency_max"         , stats->latency_max / 1e6
+  );
+}
+
+
+// ----------------------------------------------------------------------------
+static unsigned int
+BaseCanvas__effective_interval(BaseCanvas * self) {
+  return (self->interval ? self->interval : 1) << self->_stretch;
+}
+
+
+// ----------------------------------------------------------------------------
+static void
+BaseCanvas__check_budget(BaseCanvas * self, unsigned long long duration) {
+  unsigned long long budget = (self->budget ? self->budget : self->interval) * 1000ULL;
+  int stretch = self->_stretch;
+
+  // Canvases that are only redrawn on request have no budget, unless one is
+  // set explicitly.
+  if (budget == 0)
+    return;
+
+  if (duration > budget) {
+    self->_recovery_streak = 0;
+    if (++self->_overbudget_streak >= OVERBUDGET_FRAMES) {
+      self->_overbudget_streak = 0;
+      if (stretch < MAX_STRETCH)
+        self->_stretch++;
+    }
+  }
+  else {
+    self->_overbudget_streak = 0;
+    if (duration < budget >> 1 && stretch > 0) {
+      if (++self->_recovery_streak >= RECOVERY_FRAMES) {
+        self->_recovery_streak = 0;
+        self->_stretch--;
+      }
+    }
+    else
+      self->_recovery_streak = 0;
+  }
+
+  if (self->_stretch != stretch) {
+    // Tell whether the interval has been stretched or is being restored.
+    PyObject * result = PyObject_CallMethod((PyObject *) self, "_on_budget_change", "(iI)",
+      self->_stretch > stretch, BaseCanvas__effective_interval(self)
+    );
+    Py_XDECREF(result);
+  }
 }
 
 
 // ----------------------------------------------------------------------------
 void
 BaseCanvas__on_draw(BaseCanvas * self, PyObject * args) {
-  PyObject * cb = PyObject_GetAttr((PyObject *) self, PyUnicode_FromString("_on_draw"));
+  PyObject * cb = PyObject_GetAttrString((PyObject *) self, "_on_draw");
 
   if (cb == NULL) {
     PyErr_SetString(
@@ -111,6 +314,7 @@ BaseCanvas__on_draw(BaseCanvas * self, PyObject * args) {
   else {
     if (!PyCallable_Check(cb)) {
       PyErr_SetString(PyExc_TypeError, "on_draw callback must be callable.");
+      Py_DECREF(cb);
       return;
     }
 
@@ -120,24 +324,65 @@ BaseCanvas__on_draw(BaseCanvas * self, PyObject * args) {
     cairo_push_group(self->context);
 
     // Call user declaration of the 'on_draw' method
+    unsigned long long start = getmicros();
     PyObject * cb_result = PyObject_CallObject(cb, args);
+    unsigned long long duration = getmicros() - start;
+    CanvasStats__record_draw(&(self->stats), duration, cb_result == Py_None);
+
+    TRACE_END(TRACE_ON_DRAW, start, self);
 
+    TRACE_START(pop_start);
     cairo_pattern_t * group = cairo_pop_group(self->context);
+    TRACE_END(TRACE_POP_GROUP, pop_start, self);
     if (cb_result == Py_None)
-      cairo_set_source(self->context, group);
+      BaseCanvas__set_frame(self, group);
+    else
+      BaseCanvas__clear_damage(self);
     cairo_pattern_destroy(group);
+
+    if (cb_result != NULL) {
+      Py_DECREF(cb_result);
+      BaseCanvas__check_budget(self, duration);
+    }
+    Py_DECREF(cb);
   }
 }
 
 
+// ----------------------------------------------------------------------------
+static void
+BaseCanvas__request_redraw(BaseCanvas * self) {
+  self->_needs_redraw = 1;
+
+  self->stats.redraw_requests++;
+  if (self->stats._requested_at == 0)
+    self->stats._requested_at = getmicros();
+
+  XEvent event;
+  event.type = Expose;
+  event.xany.window = self->win_id;
+  event.xexpose.count = 0;
+
+  Display * display = Atelier_get_display();
+  TRACE_START(start);
+  XLockDisplay(display);
+  XSendEvent(display, self->win_id, False, ExposureMask, &event);
+  // Send the event immediately
+  XFlush(display);
+  XUnlockDisplay(display);
+  TRACE_END(TRACE_SEND_EVENT, start, self);
+}
+
+
 // ----------------------------------------------------------------------------
 static void
 BaseCanvas__ui_thread(BaseCanvas * self) {
   PyGILState_STATE gstate;
   gstate = PyGILState_Ensure();
 
-  self->context_arg = Py_BuildValue("(O)", PycairoContext_FromContext(
-    self->context, &PycairoContext_Type, (PyObject*) NULL
+  // The Python context owns a reference to the Cairo context.
+  self->context_arg = Py_BuildValue("(N)", PycairoContext_FromContext(
+    cairo_reference(self->context), &PycairoContext_Type, (PyObject*) NULL
   ));
 
   self->_expiry = gettime();
@@ -147,27 +392,35 @@ BaseCanvas__ui_thread(BaseCanvas * self) {
     usleep(self->interval > 100 ? 100 * UI_INTERVAL : UI_INTERVAL);
     Py_END_ALLOW_THREADS
 
+    // The canvas might have been destroyed while we were sleeping.
+    if (!self->_running)
+      break;
+
+    self->stats.wakeups++;
+
     if (Atelier_is_running() > 0 && self->_expiry <= gettime()) {
-      self->_needs_redraw = 1;
-
-      // Request redraw
-      XEvent event;
-      event.type = Expose;
-      event.xany.window = self->win_id;
-      event.xexpose.count = 0;
-
-      Display * display = Atelier_get_display();
-      XLockDisplay(display);
-      XSendEvent(display, self->win_id, False, ExposureMask, &event);
-      // Send the event immediately
-      XFlush(display);
-      XUnlockDisplay(display);
-
-      self->_expiry += self->interval ? self->interval : UI_INTERVAL;
+      // Only the wakeups that lead to a redraw are traced.
+      TRACE_START(start);
+
+      // Do not queue up more redraw requests while the previous one has not
+      // been served yet, e.g. because on_draw is too slow.
+      if (!self->_needs_redraw)
+        BaseCanvas__request_redraw(self);
+
+      self->_expiry += BaseCanvas__effective_interval(self);
+      if (self->_expiry < gettime())
+        // Skip the frames we are late for instead of catching up.
+        self->_expiry = gettime() + BaseCanvas__effective_interval(self);
+
+      TRACE_END(TRACE_WAKEUP, start, self);
     }
   }
 
   Py_DECREF(self->context_arg);
+  self->context_arg = NULL;
+
+  // Release the reference taken by show. This might deallocate the canvas.
+  Py_DECREF(self);
 
   PyGILState_Release(gstate);
 }
@@ -206,6 +459,17 @@ BaseCanvas__transform_coordinates(BaseCanvas * self, int * x, int * y) {
 //
 static void
 BaseCanvas_dealloc(BaseCanvas* self) {
+  if (self->context != NULL) {
+    // The canvas has never been destroyed, e.g. because the Atelier is
+    // being torn down, so it still owns its surface and its window. The
+    // display is still open, since it is only closed when the last canvas
+    // is destroyed.
+    cairo_destroy(self->context);
+    cairo_surface_destroy(self->surface);
+    XDestroyWindow(Atelier_get_display(), self->win_id);
+  }
+  BaseCanvas__clear_damage(self);
+
   Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -253,17 +517,24 @@ BaseCanvas_new(PyTypeObject *type, PyObject *args, PyObject *kwargs) {
         &skip_taskbar,
         &skip_pager
        )
-    ) return NULL;
+    ) {
+      Py_DECREF(self);
+      return NULL;
+    }
 
     Display * display = Atelier_get_display();
-    if (display == NULL)
+    if (display == NULL) {
+      Py_DECREF(self);
+      PyErr_SetString(PyExc_RuntimeError, "Unable to open the X display.");
       return NULL;
+    }
 
-    int screen = DefaultScreen(display);
+    // The RGBA visual, its colormap and the atoms are shared by all the
+    // canvases, so that creating a canvas needs no round trips to the X
+    // server.
+    XVisualInfo * visualinfo = Atelier_get_visual_info();
 
-    // Query Visual for "TrueColor" and 32 bits depth (RGBA)
-    XMatchVisualInfo(display, screen, 32, TrueColor, &visualinfo);
-    attr.colormap = XCreateColormap(display, DefaultRootWindow(display), visualinfo.visual, AllocNone);
+    attr.colormap = Atelier_get_colormap();
     attr.border_pixel = 0;
     attr.background_pixel = 0;
 
@@ -278,31 +549,35 @@ BaseCanvas_new(PyTypeObject *type, PyObject *args, PyObject *kwargs) {
       self->width,
       self->height,
       0,
-      visualinfo.depth,
+      visualinfo->depth,
       InputOutput,
-      visualinfo.visual,
+      visualinfo->visual,
       CWColormap | CWBorderPixel | CWBackPixel | CWWinGravity,
       &attr
     );
 
-    BaseCanvas__change_property(self, "_NET_WM_WINDOW_TYPE", WINDOW_TYPE_MAP[window_type], PropModeReplace);
-
-    if (keep_below   != 0) BaseCanvas__change_property(self, "_NET_WM_STATE", "_NET_WM_STATE_BELOW"        , PropModeAppend);
-    if (sticky       != 0) BaseCanvas__change_property(self, "_NET_WM_STATE", "_NET_WM_STATE_STICKY"       , PropModeAppend);
-    if (skip_taskbar != 0) BaseCanvas__change_property(self, "_NET_WM_STATE", "_NET_WM_STATE_SKIP_TASKBAR" , PropModeAppend);
-    if (skip_pager   != 0) BaseCanvas__change_property(self, "_NET_WM_STATE", "_NET_WM_STATE_SKIP_PAGER"   , PropModeAppend);
+    Atom window_type_atom = Atelier_get_atom(WINDOW_TYPE_MAP[window_type]);
+    BaseCanvas__change_property(self, ATOM_NET_WM_WINDOW_TYPE, &window_type_atom, 1);
 
-    XCreateGC(display, self->win_id, 0, 0);
+    Atom states[4];
+    int  n_states = 0;
+    if (keep_below   != 0) states[n_states++] = Atelier_get_atom(ATOM_NET_WM_STATE_BELOW);
+    if (sticky       != 0) states[n_states++] = Atelier_get_atom(ATOM_NET_WM_STATE_STICKY);
+    if (skip_taskbar != 0) states[n_states++] = Atelier_get_atom(ATOM_NET_WM_STATE_SKIP_TASKBAR);
+    if (skip_pager   != 0) states[n_states++] = Atelier_get_atom(ATOM_NET_WM_STATE_SKIP_PAGER);
+    if (n_states > 0)
+      BaseCanvas__change_property(self, ATOM_NET_WM_STATE, states, n_states);
 
-    // Handle Delete Event
-    self->wm_delete_window = XInternAtom(display, "WM_DELETE_WINDOW", False);
-    XSetWMProtocols(display, self->win_id, (Atom *) &(self->wm_delete_window), 1);
+    // Handle Delete Event. This is what XSetWMProtocols does, without
+    // interning WM_PROTOCOLS every time.
+    self->wm_delete_window = Atelier_get_atom(ATOM_WM_DELETE_WINDOW);
+    BaseCanvas__change_property(self, ATOM_WM_PROTOCOLS, (Atom *) &(self->wm_delete_window), 1);
 
     // Create the Cairo Context
     self->surface = cairo_xlib_surface_create(
       display,
       self->win_id,
-      visualinfo.visual,
+      visualinfo->visual,
       self->width,
       self->height
     );
@@ -313,6 +588,13 @@ BaseCanvas_new(PyTypeObject *type, PyObject *args, PyObject *kwargs) {
     self->_drawing      = 0;
     self->_needs_redraw = 0;
 
+    self->budget             = 0;
+    self->_stretch           = 0;
+    self->_overbudget_streak = 0;
+    self->_recovery_streak   = 0;
+
+    memset(&(self->stats), 0, sizeof(CanvasStats));
+
     // Register the BaseCanvas with the Atelier
     Atelier_add_canvas(self);
   }
@@ -362,6 +644,16 @@ BaseCanvas_move(BaseCanvas * self, PyObject * args, PyObject * kwargs) {
 //
 static PyObject *
 BaseCanvas_show(BaseCanvas* self) {
+  if (self->context == NULL) {
+    PyErr_SetString(PyExc_RuntimeError, "The canvas has been destroyed.");
+    return NULL;
+  }
+
+  if (self->_running) {
+    // Already shown
+    Py_INCREF(Py_None); return Py_None;
+  }
+
   Display * display = Atelier_get_display();
 
   // Input events
@@ -374,8 +666,16 @@ BaseCanvas_show(BaseCanvas* self) {
 
   self->_running = 1;
 
-  // Use the allocated BaseCanvas object to pass arguments to the UI thread.
-  PyThread_start_new_thread((void (*)(void *)) BaseCanvas__ui_thread, self);
+  // Use the allocated BaseCanvas object to pass arguments to the UI thread,
+  // which owns a reference to it until it exits. Otherwise the canvas could
+  // be deallocated while the thread is sleeping.
+  Py_INCREF(self);
+  if (PyThread_start_new_thread((void (*)(void *)) BaseCanvas__ui_thread, self) == PYTHREAD_INVALID_THREAD_ID) {
+    self->_running = 0;
+    Py_DECREF(self);
+    PyErr_SetString(PyExc_RuntimeError, "Unable to start the UI thread of the canvas.");
+    return NULL;
+  }
 
   Py_INCREF(Py_None); return Py_None;
 }
@@ -406,6 +706,11 @@ BaseCanvas_get_size(BaseCanvas * self) {
 //
 static PyObject *
 BaseCanvas_dispose(BaseCanvas * self) {
+  if (self->context == NULL) {
+    // Already destroyed
+    Py_INCREF(Py_None); return Py_None;
+  }
+
   Display * display = Atelier_get_display();
 
   XUnmapWindow(display, self->win_id);
@@ -426,6 +731,142 @@ BaseCanvas_dispose(BaseCanvas * self) {
 }
 
 
+//
+//    def invalidate(self):
+//      """Request a redraw of the canvas as soon as possible.
+//      This method is thread-safe.
+//      """
+//
+static PyObject *
+BaseCanvas_invalidate(BaseCanvas * self) {
+  if (self->_running)
+    BaseCanvas__request_redraw(self);
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+//
+//    def schedule(self, delay):
+//      """Schedule the next redraw of the canvas.
+//      """
+//
+static PyObject *
+BaseCanvas_schedule(BaseCanvas * self, PyObject * args, PyObject * kwargs) {
+  unsigned int delay;
+  char * keywords[] = {"delay", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "I:BaseCanvas.schedule",
+    keywords, &delay)
+  ) return NULL;
+
+  // The UI thread only reads the expiry with the GIL held.
+  self->_expiry = gettime() + delay;
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+//
+//    def damage(self, x, y, width, height):
+//      """Limit the update of the window to the given area.
+//      """
+//
+static PyObject *
+BaseCanvas_damage(BaseCanvas * self, PyObject * args, PyObject * kwargs) {
+  cairo_rectangle_int_t rect;
+  char * keywords[] = {"x", "y", "width", "height", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "iiii:BaseCanvas.damage",
+    keywords, &rect.x, &rect.y, &rect.width, &rect.height)
+  ) return NULL;
+
+  if (self->_damage == NULL)
+    self->_damage = cairo_region_create_rectangle(&rect);
+  else
+    cairo_region_union_rectangle(self->_damage, &rect);
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+//
+//    def _send_input(self, kind, detail, state=0, x=0, y=0):
+//      """Send a synthetic input event to the canvas window.
+//      """
+//
+static PyObject *
+BaseCanvas_send_input(BaseCanvas * self, PyObject * args, PyObject * kwargs) {
+  char * kind;
+  unsigned int detail;
+  unsigned int state = 0;
+  int x = 0, y = 0;
+  char * keywords[] = {"kind", "detail", "state", "x", "y", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "sI|Iii:BaseCanvas._send_input",
+    keywords, &kind, &detail, &state, &x, &y)
+  ) return NULL;
+
+  if (self->context == NULL) {
+    PyErr_SetString(PyExc_RuntimeError, "The canvas has been destroyed.");
+    return NULL;
+  }
+
+  Display * display = Atelier_get_display();
+  XEvent event;
+  long mask;
+
+  memset(&event, 0, sizeof(event));
+  if (strcmp(kind, "button") == 0) {
+    mask = ButtonPressMask;
+    event.xbutton.type        = ButtonPress;
+    event.xbutton.button      = detail;
+    event.xbutton.state       = state;
+    event.xbutton.x           = x;
+    event.xbutton.y           = y;
+    event.xbutton.same_screen = True;
+  }
+  else if (strcmp(kind, "key") == 0) {
+    mask = KeyPressMask;
+    event.xkey.type           = KeyPress;
+    event.xkey.keycode        = detail;
+    event.xkey.state          = state;
+    event.xkey.same_screen    = True;
+  }
+  else {
+    PyErr_Format(PyExc_ValueError, "Unknown input event kind '%s'.", kind);
+    return NULL;
+  }
+  event.xany.display = display;
+  event.xany.window  = self->win_id;
+
+  XLockDisplay(display);
+  XSendEvent(display, self->win_id, False, mask, &event);
+  XFlush(display);
+  XUnlockDisplay(display);
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+//
+//    @property
+//    def effective_interval(self):
+//
+static PyObject *
+BaseCanvas_get_effective_interval(BaseCanvas * self, void * closure) {
+  return PyLong_FromUnsignedLong(BaseCanvas__effective_interval(self));
+}
+
+
+//
+//    def stats(self):
+//      """Get the runtime statistics of the canvas.
+//      """
+//
+static PyObject *
+BaseCanvas_stats(BaseCanvas * self) {
+  return CanvasStats_to_dict(&(self->stats));
+}
+
+
 //
 //    def destroy(self):
 //      """Destroy the canvas.
@@ -434,9 +875,20 @@ BaseCanvas_dispose(BaseCanvas * self) {
 //
 static PyObject *
 BaseCanvas_destroy(BaseCanvas * self) {
+  if (self->context == NULL) {
+    // Already destroyed
+    Py_INCREF(Py_None); return Py_None;
+  }
+
   self->_running = 0;
   cairo_destroy(self->context);
   cairo_surface_destroy(self->surface);
+  self->context = NULL;
+  self->surface = NULL;
+
+  Display * display = Atelier_get_display();
+  XDestroyWindow(display, self->win_id);
+  XFlush(display);
 
   // De-register BaseCanvas from Atelier;
   Atelier_remove_canvas(self);
@@ -33,6 +33,35 @@
 #include <cairo-xlib.h>
 
 
+// Runtime statistics. Times are in microseconds.
+#define STATS_HISTOGRAM_BUCKETS 20
+
+typedef struct {
+  unsigned long       frames_drawn;
+  unsigned long       frames_skipped;
+  unsigned long       events;
+  unsigned long       wakeups;
+  unsigned long       redraw_requests;
+
+  // The bucket i counts the on_draw calls that took [2^i, 2^(i+1)) us,
+  // except the first one, which starts at 0, and the last one, which is
+  // unbounded.
+  unsigned long       draw_time_histogram[STATS_HISTOGRAM_BUCKETS];
+  unsigned long long  draw_time_total;
+  unsigned long long  draw_time_max;
+
+  // Time from a redraw request to the paint on the window.
+  unsigned long       latency_count;
+  unsigned long long  latency_total;
+  unsigned long long  latency_max;
+  unsigned long long  _requested_at;
+} CanvasStats;
+
+void       CanvasStats_add     (CanvasStats *, CanvasStats *);
+PyObject * CanvasStats_to_dict (CanvasStats *);
+unsigned long long getmicros(void);
+
+
 typedef struct {
   PyObject_HEAD
   // Geometry
@@ -56,15 +85,23 @@ typedef struct {
   unsigned int      interval;
   unsigned int      xine_screen;
   int               gravity;
+  unsigned int      budget;
 
   // Internal attributes
   int               _running;
   long              _expiry;
   int               _drawing;
   int               _needs_redraw;
+  int               _stretch;
+  int               _overbudget_streak;
+  int               _recovery_streak;
+  cairo_region_t  * _damage;
+
+  CanvasStats       stats;
 } BaseCanvas;
 
 void BaseCanvas__redraw(BaseCanvas * self);
+void BaseCanvas__painted(BaseCanvas * self);
 
 #ifdef BASE_CANVAS_C
 // ---- METHODS ----
@@ -77,6 +114,11 @@ static PyObject * BaseCanvas_show     (BaseCanvas *);
 static PyObject * BaseCanvas_get_size (BaseCanvas *);
 static PyObject * BaseCanvas_dispose  (BaseCanvas *);
 static PyObject * BaseCanvas_destroy  (BaseCanvas *);
+static PyObject * BaseCanvas_invalidate(BaseCanvas *);
+static PyObject * BaseCanvas_schedule (BaseCanvas *, PyObject *, PyObject *);
+static PyObject * BaseCanvas_damage   (BaseCanvas *, PyObject *, PyObject *);
+static PyObject * BaseCanvas_send_input(BaseCanvas *, PyObject *, PyObject *);
+static PyObject * BaseCanvas_stats    (BaseCanvas *);
 
 
 static PyMethodDef BaseCanvas_methods[] = {
@@ -102,6 +144,64 @@ static PyMethodDef BaseCanvas_methods[] = {
 
       "This method is not thread-safe. Use the :func:`dispose` method instead."
   },
+  {"invalidate", (PyCFunction) BaseCanvas_invalidate, METH_NOARGS,
+      "Request a redraw of the canvas as soon as possible.\n\n"
+
+      "The :func:`on_draw` callback is invoked on the next iteration of the "
+      "event loop, regardless of the canvas interval. This method is "
+      "thread-safe."
+  },
+  {"schedule" , (PyCFunction) BaseCanvas_schedule  , METH_VARARGS | METH_KEYWORDS,
+      "Schedule the next redraw of the canvas.\n\n"
+
+      "The next redraw is requested *delay* milliseconds from now, rather "
+      "than one interval after the previous one. The following redraws are "
+      "requested at the usual interval. Note that the canvas is woken up "
+      "at most every 100 ms when the interval is longer than that.\n\n"
+
+      "Args:\n"
+      "  delay (int): the time to the next redraw, in milliseconds."
+  },
+  {"damage"   , (PyCFunction) BaseCanvas_damage    , METH_VARARGS | METH_KEYWORDS,
+      "Limit the update of the window to the given area.\n\n"
+
+      "When called from :func:`on_draw`, only the damaged areas of the new "
+      "frame are copied to the window, while the rest of the previous frame "
+      "is kept. The method can be called many times to damage many areas. "
+      "Without calls to this method, the whole window is updated.\n\n"
+
+      "Args:\n"
+      "  x (int): the *x* coordinate of the damaged area.\n"
+      "  y (int): the *y* coordinate of the damaged area.\n"
+      "  width (int): the width of the damaged area.\n"
+      "  height (int): the height of the damaged area."
+  },
+  {"_send_input", (PyCFunction) BaseCanvas_send_input, METH_VARARGS | METH_KEYWORDS,
+      "Send a synthetic input event to the canvas window.\n\n"
+
+      "This is meant for tests, which can exercise the input callbacks "
+      "without a real pointer or keyboard.\n\n"
+
+      "Args:\n"
+      "  kind (str): either ``\"button\"`` or ``\"key\"``.\n"
+      "  detail (int): the button number, or the keycode.\n"
+      "  state (int): the state of the modifier keys and buttons.\n"
+      "  x (int): the *x* coordinate of the pointer, for button events.\n"
+      "  y (int): the *y* coordinate of the pointer, for button events."
+  },
+  {"stats"    , (PyCFunction) BaseCanvas_stats     , METH_NOARGS,
+      "Get the runtime statistics of the canvas.\n\n"
+
+      "The statistics are collected from the moment the canvas is created. "
+      "All times are in seconds. The ``draw_time_histogram`` is a tuple of "
+      "counts of the :func:`on_draw` calls by duration. The *i*-th bucket "
+      "counts the calls that took between :math:`2^i` and :math:`2^{i+1}` "
+      "microseconds, except for the first bucket, which starts at 0, and "
+      "the last one, which has no upper bound.\n\n"
+
+      "Returns:\n"
+      "  dict: the canvas statistics."
+  },
   {NULL}  /* Sentinel */
 };
 
@@ -109,6 +209,7 @@ static PyMethodDef BaseCanvas_methods[] = {
 // ---- ATTRIBUTES ----
 static PyMemberDef BaseCanvas_members[] = {
   {"interval" , T_INT , offsetof(BaseCanvas, interval) , 0        , "The refresh interval, in milliseconds."},
+  {"budget"   , T_UINT, offsetof(BaseCanvas, budget)   , 0        , "The frame budget, in milliseconds. The default value 0 means the interval."},
   {"x"        , T_INT , offsetof(BaseCanvas, x)        , READONLY , "The canvas *x* coordinate. *Read-only*."},
   {"y"        , T_INT , offsetof(BaseCanvas, y)        , READONLY , "The canvas *y* coordinate. *Read-only*."},
   {"width"    , T_INT , offsetof(BaseCanvas, width)    , READONLY , "The canvas width. *Read-only*."},
@@ -116,6 +217,18 @@ static PyMemberDef BaseCanvas_members[] = {
   {NULL}  /* Sentinel */
 };
 
+static PyObject * BaseCanvas_get_effective_interval(BaseCanvas *, void *);
+
+static PyGetSetDef BaseCanvas_getset[] = {
+  {"effective_interval", (getter) BaseCanvas_get_effective_interval, NULL,
+      "The interval, in milliseconds, at which the canvas is actually redrawn. "
+      "This is larger than the interval while the canvas is over its frame "
+      "budget. *Read-only*.",
+      NULL
+  },
+  {NULL}  /* Sentinel */
+};
+
 // ---- OBJECT TYPE DECLARATION ----
 PyTypeObject BaseCanvasType = {
   PyVarObject_HEAD_INIT(NULL, 0)
@@ -148,7 +261,7 @@ PyTypeObject BaseCanvasType = {
   0,                               /* tp_iternext */
   BaseCanvas_methods,              /* tp_methods */
   BaseCanvas_members,              /* tp_members */
-  0,                               /* tp_getset */
+  BaseCanvas_getset,               /* tp_getset */
   0,                               /* tp_base */
   0,                               /* tp_dict */
   0,                               /* tp_descr_get */
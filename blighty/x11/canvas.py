@@ -300,6 +300,57 @@ spacing along the two directions as arguments. Please refer to the API
 documentation below for more details.
 
 
+Frame budget
+------------
+
+Every canvas has a frame budget, that is the time its :func:`on_draw` callback
+is expected to take at most. By default, the budget is equal to the interval,
+and it can be changed by setting the ``budget`` attribute, in milliseconds.
+
+A canvas that exceeds its budget for a few frames in a row would take time
+away from all the other canvases. Therefore its effective interval is
+doubled, up to 16 times the configured interval, and a warning is logged.
+When the :func:`on_draw` callback is consistently back well within the budget,
+the effective interval is gradually restored to the configured one. The
+current effective interval is available from the ``effective_interval``
+attribute. Canvases with an interval of ``0`` and no explicit budget have no
+budget.
+
+Widgets that can draw in a cheaper way can implement the
+:func:`on_overbudget` callback, which is called every time the effective
+interval changes, with ``True`` when it is stretched and ``False`` when it is
+restored.
+
+
+Server-side images
+------------------
+
+Images are normally sent to the X server every time they are painted. Images
+that never change, like logos and backgrounds, can be pinned on the X server
+once with the ``server_image`` brush instead, e.g. ::
+
+    class Logo(Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.logo = cairo.ImageSurface.create_from_png("logo.png")
+
+        def on_draw(self, ctx):
+            ctx.set_source_surface(ctx.server_image(self.logo), 0, 0)
+            ctx.paint()
+
+The pinned images are freed when the canvas is destroyed.
+
+
+Reload mode
+-----------
+
+While developing a widget, call the :func:`watch` method of the canvas, or set
+the ``BLIGHTY_RELOAD`` environment variable, to have the code of the canvas
+reloaded as soon as its module changes, without restarting the process and
+without losing the state of the canvas. See :mod:`blighty.x11.reload` for more
+details.
+
+
 References
 ==========
 
@@ -310,9 +361,17 @@ Module API
 ==========
 """
 
+import logging
+import os
+
 from blighty import ExtendedContext, TextAlign, brush
-from blighty._brush import BrushSets, draw_grid, write_text
-from blighty._x11 import BaseCanvas
+from blighty._brush import (BrushSets, brush_doc, draw_grid,
+                            free_server_images, image, server_image,
+                            use_font, write_text)
+from blighty._x11 import BaseCanvas, _flush
+
+
+_logger = logging.getLogger(__name__)
 
 
 class Canvas(BaseCanvas):
@@ -335,6 +394,12 @@ class Canvas(BaseCanvas):
         """
         BrushSets.inherit(type(self))
         self._extended_context = None
+        self._images = {}
+        self._server_images = {}
+        self._watcher = None
+
+        if os.environ.get("BLIGHTY_RELOAD"):
+            self.watch()
 
     def _on_draw(self, ctx):
         """Draw callback (internal).
@@ -349,11 +414,104 @@ class Canvas(BaseCanvas):
         performing the same drawing operations when not required because no
         data to display has changed.
         """
+        if self._watcher is not None:
+            from blighty.x11.reload import update
+
+            update(self, self._watcher)
+
         if self._extended_context is None:
             self._extended_context = ExtendedContext(ctx, self)
 
         return self.on_draw(self._extended_context)
 
+    def watch(self, enabled = True):
+        """Turn the reload mode on or off.
+
+        In reload mode, the module that defines the class of the canvas is
+        executed again whenever it changes, and the canvas switches over to
+        the new version of its class, keeping its window and its state. See
+        :mod:`blighty.x11.reload` for more details.
+
+        Args:
+            enabled (bool): whether the reload mode should be on.
+        """
+        if not enabled:
+            self._watcher = None
+            return
+
+        from blighty.x11.reload import get_watcher
+
+        self._watcher = get_watcher(type(self))
+
+    def show(self):
+        """Map the canvas to screen and set it ready for drawing.
+
+        The fonts in the :mod:`blighty.fonts` registry are warmed up first, so
+        that the first frame does not have to wait for them.
+        """
+        from blighty.fonts import warm
+
+        warm()
+        super().show()
+
+    def destroy(self):
+        """Destroy the canvas.
+
+        The images pinned on the X server with the ``server_image`` brush are
+        freed too.
+
+        WARNING: Not thread-safe. Use :func:`dispose` instead.
+        """
+        free_server_images(self)
+        super().destroy()
+
+    def _on_budget_change(self, overbudget, interval):
+        """Frame budget callback (internal).
+
+        This is called from the BaseCanvas class every time the effective
+        interval changes. The *overbudget* flag tells whether the interval
+        has been stretched, because the budget has been exceeded, or
+        restored, because the canvas is recovering.
+        """
+        if overbudget:
+            _logger.warning(
+                "%s at (%d, %d) is over its frame budget of %d ms. Effective interval is now %d ms.",
+                type(self).__name__, self.x, self.y, self.budget or self.interval, interval
+            )
+        elif interval > (self.interval or 1):
+            _logger.debug(
+                "%s at (%d, %d) is recovering. Effective interval is now %d ms.",
+                type(self).__name__, self.x, self.y, interval
+            )
+        else:
+            _logger.info(
+                "%s at (%d, %d) is back within its frame budget.",
+                type(self).__name__, self.x, self.y
+            )
+
+        self.on_overbudget(overbudget)
+
+    def on_overbudget(self, overbudget):
+        """Frame budget callback.
+
+        This method is called every time the effective interval of the canvas
+        changes because the :func:`on_draw` callback has taken too long, or
+        because it is recovering. Subclasses can implement it to switch to a
+        cheaper way of drawing while over budget. The default implementation
+        does nothing.
+
+        The effective interval is restored one step at a time, so the canvas
+        is fully recovered only once ``effective_interval`` is back to the
+        configured interval.
+
+        Args:
+            overbudget (bool): ``True`` if the effective interval has been
+                stretched because the frame budget has been exceeded,
+                ``False`` if it has been shortened because the canvas is
+                recovering.
+        """
+        pass
+
     def on_draw(self, ctx):
         """Draw callback.
 
@@ -364,44 +522,64 @@ class Canvas(BaseCanvas):
         """
         raise NotImplementedError("on_draw method not implemented in subclass.")
 
+    @brush_doc(draw_grid)
     def draw_grid(ctx, x = 50, y = 50):
-        """Draw a grid on the canvas [**implicit brush**].
-
-        This implicit brush method is intended to help with determining the
-        location of points on the canvas during development.
-
-        Args:
-            x (int): The horizontal spacing between lines.
-            y (int): The vertical spacing between lines.
-        """
         draw_grid(ctx, x, y)
 
     @brush
+    @brush_doc(write_text)
     def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
-        """Write aligned text [**explicit brush**].
+        return write_text(cr, x, y, text, align)
 
-        This explicit brush method helps write aligned text on the canvas. The
-        *x* and *y* coordinates are relative to the specified *alignment*. By
-        default, this is ``blighty.TextAlign.TOP_LEFT``, meaning that the text
-        will be left-aligned and on top of the horizontal line that passes
-        through *y* on the vertical axis. In terms of the point *(x,y)* on the
-        Canvas, the text will develop in the NE direction.
+    @brush
+    @brush_doc(image)
+    def image(ctx, source, size = None, loader = None, slot = None):
+        return image(ctx, source, size, loader, slot)
 
-        The return value is the text extents, in case that some further draw
-        operations depend on the space required by the text to be drawn on the
-        canvas.
+    @brush
+    @brush_doc(use_font)
+    def use_font(ctx, name, size):
+        return use_font(ctx, name, size)
 
-        Note that font face and size need to be set on the Cairo context prior
-        to a call to this method.
+    @brush
+    @brush_doc(server_image)
+    def server_image(ctx, surface):
+        return server_image(ctx, surface)
 
-        Args:
-            x (int): The horizontal coordinate.
-            y (int): The vertical coordinate.
-            text (str): The text to write.
-            align (int): The text alignment. Detaulf is ``TextAlign.TOP_LEFT``.
 
-        Returns:
-            tuple: The same return value as ``cairo.text_extents``.
+def create_canvases(specs, show = True):
+    """Create many canvases at once.
 
-        """
-        return write_text(cr, x, y, text, align)
+    Creating a canvas requires no round trips to the X server, since the
+    atoms, the visual and the colormap are shared by all the canvases. The
+    requests to create the windows of all the canvases are therefore buffered
+    and sent to the X server with a single flush at the end.
+
+    Example:
+        tiles = create_canvases(
+            (Tile, (64 * (i % 20), 64 * (i // 20), 64, 64), {"interval": 5000})
+            for i in range(200)
+        )
+
+    Args:
+        specs (iterable): the canvases to create, as ``(canvas_class, args)``
+            or ``(canvas_class, args, kwargs)`` tuples.
+        show (bool): whether to map the canvases on screen. Default is
+            ``True``.
+
+    Returns:
+        list: the new canvases.
+    """
+    canvases = []
+    for spec in specs:
+        canvas_class, args = spec[:2]
+        kwargs = spec[2] if len(spec) > 2 else {}
+
+        canvas = canvas_class(*args, **kwargs)
+        if show:
+            canvas.show()
+        canvases.append(canvas)
+
+    _flush()
+
+    return canvases
@@ -0,0 +1,114 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""GLib main loop integration.
+
+By default, X11 canvases are driven by the blocking event loop started with
+:func:`blighty.x11.start_event_loop`. Applications that already run a GLib
+main loop, e.g. because they also have GTK canvases or because they listen to
+D-Bus signals, can instead attach the X11 canvases to it with :func:`attach`,
+and run everything on a single thread.
+
+Example:
+    from gi.repository import GLib
+
+    import blighty.x11.glib
+
+    canvas = MyCanvas(0, 0, 200, 200)
+    canvas.show()
+
+    blighty.x11.glib.attach()
+    GLib.MainLoop().run()
+
+The X11 canvases are driven by a :class:`X11Source`, which watches the file
+descriptor of the X connection. The redraw timers of the canvases deliver
+their redraw requests over the same connection, so the main loop wakes up only
+when there is an event to handle or a canvas to redraw.
+"""
+
+try:
+    import gi
+except ImportError:
+    raise ImportError("Unable to import PyGObject. See https://pygobject.readthedocs.io/ for more info.")
+
+from blighty._x11 import (_dispatch_pending, _get_connection_number, _pending,
+                          _set_attached)
+from gi.repository import GLib
+
+
+class X11Source(GLib.Source):
+    """GLib source for the X11 canvases.
+
+    The source removes itself from its main context when the last X11 canvas
+    has been destroyed.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        fd = _get_connection_number()
+        if fd < 0:
+            raise RuntimeError("No X connection. Create an X11 canvas first.")
+
+        self.set_name("blighty.x11")
+        self.add_unix_fd(fd, GLib.IOCondition.IN)
+
+    def prepare(self):
+        # Xlib might have queued events already, in which case the file
+        # descriptor will not become readable.
+        return _pending() > 0, -1
+
+    def check(self):
+        return _pending() > 0
+
+    def dispatch(self, callback, args):
+        return GLib.SOURCE_CONTINUE if _dispatch_pending() else GLib.SOURCE_REMOVE
+
+    def destroy(self):
+        """Detach the X11 canvases from the main context."""
+        _set_attached(False)
+        super().destroy()
+
+
+def attach(context=None):
+    """Drive the X11 canvases from a GLib main context.
+
+    The canvases must be created before calling this function, since the X
+    connection is opened by the first canvas. Do not call
+    :func:`blighty.x11.start_event_loop` as well.
+
+    Args:
+        context (GLib.MainContext): the main context to attach to. Default
+            is the global default main context.
+
+    Returns:
+        X11Source: the attached source. Call its ``destroy`` method to
+        detach the X11 canvases from the main context.
+    """
+    source = X11Source()
+    source.attach(context)
+
+    # The canvases only request redraws while an event loop is running.
+    _set_attached(True)
+
+    return source
@@ -0,0 +1,368 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Panels.
+
+Every :class:`blighty.x11.Canvas` is an X window of its own, with its own ARGB
+surface, redraw requests and flushes. Compositors do not cope well with many
+small ARGB windows, so a dashboard made of tens of widgets is better drawn in
+a single window. A :class:`Panel` is a canvas that hosts many child
+:class:`Widget` objects and composites them into its own window.
+
+Widgets have the same drawing contract as canvases: they implement
+:func:`Widget.on_draw`, which receives an extended Cairo context with the
+brushes of the widget class, for an off-screen surface of the size of the
+widget. Every widget has its own interval and is redrawn only when it is due
+or when it has been invalidated. The panel then composites the surfaces of
+the widgets that overlap the changed areas, in order, on an off-screen
+surface that it keeps across frames, so that the window is updated with a
+single upload per frame however many widgets have changed. Widgets can
+overlap, and the ones added later are on top.
+
+Example:
+    class Clock(Widget):
+        def on_draw(self, ctx):
+            ctx.write_text(0, 0, time.strftime("%H:%M"))
+
+    class Cpu(Widget):
+        ...
+
+    panel = Panel(0, 0, 400, 200)
+    panel.add(Clock(0, 0, 200, 40, interval = 1000))
+    panel.add(Cpu(0, 40, 400, 160, interval = 500))
+    panel.show()
+
+    blighty.x11.start_event_loop()
+
+The panel is redrawn only when a widget is due or has been invalidated. Each
+redraw schedules the next one for when the next widget is due, but not
+sooner than :data:`MIN_TICK` milliseconds later, so widgets with intervals of,
+e.g., 1000 and 333 ms cost about 4 redraws per second. Mouse button events
+are dispatched to the topmost widget under the pointer, with coordinates
+relative to the widget, and key events are dispatched to the last widget
+that has been clicked.
+"""
+
+import logging
+from time import monotonic
+
+import cairo
+
+from blighty import ExtendedContext, TextAlign, brush
+from blighty._brush import (BrushSets, brush_doc, draw_grid, image,
+                            use_font, write_text)
+
+from . canvas import Canvas
+
+
+_logger = logging.getLogger(__name__)
+
+# The shortest time between redraws of a panel, in milliseconds.
+MIN_TICK = 10
+
+
+class Widget:
+    """A child widget of a :class:`Panel`.
+
+    Subclasses should implement the :func:`on_draw` callback, like for
+    canvases, and can define brushes in the same way.
+
+    Args:
+        x (int): the horizontal position of the widget within the panel.
+        y (int): the vertical position of the widget within the panel.
+        width (int): the width of the widget.
+        height (int): the height of the widget.
+        interval (int): the time between redraws, in milliseconds. A value of
+            ``0`` means that the widget is only redrawn when invalidated.
+            Default is ``1000``.
+    """
+
+    def __init__(self, x, y, width, height, interval = 1000):
+        BrushSets.inherit(type(self))
+
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.interval = interval
+        self.panel = None
+
+        self._surface = None
+        self._context = None
+        self._extended_context = None
+        self._images = {}
+        self._dirty = True
+        self._next = 0
+
+    def get_size(self):
+        """Get the size of the widget.
+
+        Returns:
+            tuple: the ``(width, height)`` of the widget.
+        """
+        return self.width, self.height
+
+    def get_rect(self):
+        """Get the area of the panel covered by the widget.
+
+        Returns:
+            tuple: the ``(x, y, width, height)`` of the widget.
+        """
+        return self.x, self.y, self.width, self.height
+
+    def contains(self, x, y):
+        """Whether the given panel coordinates are within the widget."""
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def intersects(self, rect):
+        """Whether the widget overlaps the given ``(x, y, width, height)``."""
+        x, y, width, height = rect
+        return (
+            x < self.x + self.width and self.x < x + width
+            and y < self.y + self.height and self.y < y + height
+        )
+
+    def _release(self):
+        if self._surface is not None:
+            self._surface.finish()
+        self._surface = self._context = self._extended_context = None
+
+    def invalidate(self):
+        """Request a redraw of the widget as soon as possible.
+
+        This method is thread-safe.
+        """
+        self._dirty = True
+        if self.panel is not None:
+            self.panel.invalidate()
+
+    def dispose(self):
+        """Remove the widget from its panel."""
+        if self.panel is not None:
+            self.panel.remove(self)
+
+    def on_button_pressed(self, button, state, x, y):
+        """Mouse button callback.
+
+        The coordinates are relative to the widget. The default
+        implementation does nothing.
+        """
+        pass
+
+    def on_key_pressed(self, keysym, state):
+        """Key press callback. The default implementation does nothing."""
+        pass
+
+    def on_draw(self, ctx):
+        """Draw callback.
+
+        This method is called every *interval* milliseconds, or when the
+        widget has been invalidated, to draw the widget. As for canvases, it
+        can return ``True`` to retain the current content of the widget.
+        """
+        raise NotImplementedError("on_draw method not implemented in subclass.")
+
+    @brush_doc(draw_grid)
+    def draw_grid(ctx, x = 50, y = 50):
+        draw_grid(ctx, x, y)
+
+    @brush
+    @brush_doc(write_text)
+    def write_text(cr, x, y, text, align = TextAlign.TOP_LEFT):
+        return write_text(cr, x, y, text, align)
+
+    @brush
+    @brush_doc(image)
+    def image(ctx, source, size = None, loader = None, slot = None):
+        return image(ctx, source, size, loader, slot)
+
+    @brush
+    @brush_doc(use_font)
+    def use_font(ctx, name, size):
+        return use_font(ctx, name, size)
+
+
+class Panel(Canvas):
+    """A canvas that composites many widgets into a single window.
+
+    The constructor takes the same arguments as :class:`blighty.x11.Canvas`.
+    The interval of the panel is the shortest interval of its widgets, but
+    the redraws are scheduled when the next widget is due rather than at
+    every interval.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.widgets = []
+
+        self._surface = None
+        self._context = None
+        self._focus = None
+        self._damage = []
+
+    def add(self, widget):
+        """Add a widget to the panel, on top of the existing ones.
+
+        Returns:
+            Widget: the widget, for convenience.
+        """
+        widget.panel = self
+        widget._dirty = True
+        self.widgets.append(widget)
+
+        self._update_interval()
+        self.invalidate()
+
+        return widget
+
+    def remove(self, widget):
+        """Remove a widget from the panel."""
+        if widget not in self.widgets:
+            return
+
+        self.widgets.remove(widget)
+        widget.panel = None
+        widget._release()
+        if self._focus is widget:
+            self._focus = None
+
+        self._damage.append(widget.get_rect())
+
+        self._update_interval()
+        self.invalidate()
+
+    def widget_at(self, x, y):
+        """Get the topmost widget at the given coordinates, if any."""
+        for widget in reversed(self.widgets):
+            if widget.contains(x, y):
+                return widget
+
+        return None
+
+    def _update_interval(self):
+        intervals = [w.interval for w in self.widgets if w.interval]
+        if intervals:
+            self.interval = max(MIN_TICK, min(intervals))
+
+    def _draw_widget(self, widget, now):
+        if widget._context is None:
+            widget._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, widget.width, widget.height)
+            widget._context = cairo.Context(widget._surface)
+            widget._extended_context = ExtendedContext(widget._context, widget)
+
+        cr = widget._context
+
+        # As for canvases, the widget draws on a group, which is discarded if
+        # the widget wants to retain its current content.
+        cr.push_group()
+        try:
+            retain = widget.on_draw(widget._extended_context) is True
+        except Exception:
+            cr.pop_group()
+            _logger.exception("Error drawing %s. Removing it from the panel.", type(widget).__name__)
+            self.remove(widget)
+            return
+
+        group = cr.pop_group()
+
+        widget._dirty = False
+        if widget.interval:
+            widget._next = now + widget.interval / 1000
+
+        if retain:
+            return
+
+        cr.save()
+        cr.set_source(group)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.paint()
+        cr.restore()
+        widget._surface.flush()
+
+        self._damage.append(widget.get_rect())
+
+    def _compose(self, rect):
+        # Widgets have a surface of their own, so the widgets that overlap the
+        # damaged area are painted again, in order, without being redrawn.
+        x, y, width, height = rect
+        cr = self._context
+
+        cr.save()
+        cr.rectangle(x, y, width, height)
+        cr.clip()
+
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+
+        for widget in self.widgets:
+            if widget._surface is not None and widget.intersects(rect):
+                cr.set_source_surface(widget._surface, widget.x, widget.y)
+                cr.paint()
+
+        cr.restore()
+
+    def _schedule_next(self, now):
+        due = [w._next for w in self.widgets if w.interval]
+        if due:
+            self.schedule(max(MIN_TICK, int((min(due) - now) * 1000)))
+
+    def on_draw(self, ctx):
+        """Draw the widgets that are due and update the window."""
+        if self._surface is None:
+            self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+            self._context = cairo.Context(self._surface)
+
+        now = monotonic()
+        for widget in list(self.widgets):
+            if widget._dirty or (widget.interval and now >= widget._next):
+                self._draw_widget(widget, now)
+
+        self._schedule_next(now)
+
+        if not self._damage:
+            return True
+
+        # Only the damaged areas are copied to the window, the rest of the
+        # previous frame is kept.
+        while self._damage:
+            rect = self._damage.pop()
+            self._compose(rect)
+            self.damage(*rect)
+            ctx.rectangle(*rect)
+        ctx.clip()
+
+        self._surface.flush()
+        ctx.set_source_surface(self._surface, 0, 0)
+        ctx.paint()
+
+    def on_button_pressed(self, button, state, x, y):
+        """Dispatch the event to the widget under the pointer."""
+        widget = self._focus = self.widget_at(x, y)
+        if widget is not None:
+            widget.on_button_pressed(button, state, x - widget.x, y - widget.y)
+
+    def on_key_pressed(self, keysym, state):
+        """Dispatch the event to the last widget that has been clicked."""
+        if self._focus is not None:
+            self._focus.on_key_pressed(keysym, state)
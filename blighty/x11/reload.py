@@ -0,0 +1,197 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Hot reload of the canvas code.
+
+When the reload mode of a canvas is on, the module that defines its class is
+watched for changes. When the module is modified, it is executed again and
+the canvas is switched over to the new version of its class at the beginning
+of the next frame. The brushes of the class are collected again, so that
+changes to them, as well as to :func:`on_draw`, are picked up straight away.
+
+Only the code is replaced. The window, its Cairo surface and the state of the
+canvas, i.e. its instance attributes, are kept, so that e.g. the history of a
+:class:`blighty.legacy.Graph` is not lost. Since the constructor is not called
+again, attributes that are added to ``__init__`` are not available to the
+live canvas until the next restart.
+
+The reload mode is turned on with :func:`blighty.x11.Canvas.watch`, or for
+every canvas by setting the ``BLIGHTY_RELOAD`` environment variable, e.g.::
+
+    BLIGHTY_RELOAD=1 python my_widget.py
+
+If the new version of the module fails to execute, the error is logged and
+the canvas keeps running the code it was running before.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+from time import monotonic
+
+from blighty import _extended_context
+from blighty._brush import BrushSets
+
+
+_logger = logging.getLogger(__name__)
+
+# The minimum time between two checks of the module file, in seconds.
+POLL_PERIOD = .5
+
+_watchers = {}
+
+
+def _defined_classes(module):
+    return {
+        value.__qualname__: value
+        for value in vars(module).values()
+        if isinstance(value, type) and value.__module__ == module.__name__
+    }
+
+
+class ModuleWatcher:
+    """Watcher of the file of a module.
+
+    There is a single watcher per module, shared by all the canvases whose
+    class is defined in it. Use :func:`get_watcher` to get it.
+
+    Attributes:
+        classes (dict): the latest version of the classes defined in the
+            module, by qualified name.
+    """
+
+    def __init__(self, module):
+        self.path = module.__file__
+        self.name = module.__name__
+        self.classes = _defined_classes(module)
+
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self._next_poll = 0
+
+    def poll(self):
+        """Reload the module if its file has changed.
+
+        The file is checked at most once every :data:`POLL_PERIOD` seconds.
+
+        Returns:
+            bool: whether the module has been reloaded.
+        """
+        now = monotonic()
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + POLL_PERIOD
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            # The file is being replaced by the editor.
+            return False
+
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        return self.reload()
+
+    def reload(self):
+        """Execute the module again and collect its classes.
+
+        Returns:
+            bool: whether the module has been reloaded successfully.
+        """
+        # Scripts must not run their main block again.
+        name = self.name if self.name != "__main__" else "__blighty_reload__"
+
+        # The brushes are registered by the class bodies and collected when
+        # the new classes are first used. The brush sets of the old classes
+        # are kept by class, so those of the live canvases are not affected.
+        BrushSets.discard(name)
+
+        spec = importlib.util.spec_from_file_location(name, self.path)
+        module = importlib.util.module_from_spec(spec)
+
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            _logger.exception("Unable to reload %s", self.path)
+            BrushSets.discard(name)
+            return False
+
+        sys.modules[name] = module
+
+        # Drop the context types of the old classes and of their subclasses,
+        # which may be defined in other modules.
+        old = tuple(self.classes.values())
+        context_types = _extended_context._context_types
+        for klass in [k for k in context_types if issubclass(k, old)]:
+            del context_types[klass]
+
+        self.classes = _defined_classes(module)
+
+        _logger.info("Reloaded %s", self.path)
+
+        return True
+
+
+def get_watcher(klass):
+    """Get the watcher of the module that defines the given class.
+
+    Returns:
+        ModuleWatcher: the watcher, or ``None`` if the module has no file.
+    """
+    module = sys.modules.get(klass.__module__)
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+
+    try:
+        return _watchers[path]
+    except KeyError:
+        watcher = _watchers[path] = ModuleWatcher(module)
+        return watcher
+
+
+def update(canvas, watcher):
+    """Switch a canvas over to the latest version of its class.
+
+    Returns:
+        bool: whether the class of the canvas has changed.
+    """
+    watcher.poll()
+
+    old = type(canvas)
+    new = watcher.classes.get(old.__qualname__)
+    if new is None or new is old:
+        return False
+
+    canvas.__class__ = new
+    BrushSets.inherit(new)
+
+    # The extended context of the old class is rebuilt on the next frame.
+    ctx = canvas._extended_context
+    if ctx is not None:
+        for m in ctx._implicit_brushes:
+            canvas.__dict__.pop(m, None)
+        canvas._extended_context = None
+
+    return True
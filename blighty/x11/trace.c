@@ -0,0 +1,193 @@
+// This file is part of "blighty" which is released under GPL.
+//
+// See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+// details.
+//
+// blighty is a desktop widget creation and management library for Python 3.
+//
+// Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+// All rights reserved.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+#include "trace.h"
+
+#include <sys/syscall.h>
+#include <unistd.h>
+
+
+static const char * TRACE_NAMES[] = {
+  "wakeup",
+  "XSendEvent",
+  "dispatch_event",
+  "_on_draw",
+  "cairo_pop_group",
+  "XFlush"
+};
+
+
+typedef struct {
+  unsigned long       seq;  // Index + 1 of the event in the slot, 0 if busy
+  unsigned int        name;
+  pid_t               tid;
+  unsigned long long  start;
+  unsigned long long  end;
+  void              * canvas;
+} TraceEvent;
+
+// The ring buffer. Writers reserve a slot with an atomic increment of the
+// head, so they never wait for each other. Once the ring is full, the oldest
+// events are overwritten.
+static TraceEvent   * ring      = NULL;
+static unsigned long  ring_mask = 0;
+static unsigned long  ring_head = 0;
+
+int trace_enabled = 0;
+
+
+// ----------------------------------------------------------------------------
+void
+Trace_record(unsigned int name, unsigned long long start, unsigned long long end, void * canvas) {
+  unsigned long index = __atomic_fetch_add(&ring_head, 1, __ATOMIC_RELAXED);
+  TraceEvent * event = &(ring[index & ring_mask]);
+
+  __atomic_store_n(&(event->seq), 0, __ATOMIC_RELEASE);
+
+  event->name   = name;
+  event->tid    = (pid_t) syscall(SYS_gettid);
+  event->start  = start;
+  event->end    = end;
+  event->canvas = canvas;
+
+  __atomic_store_n(&(event->seq), index + 1, __ATOMIC_RELEASE);
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Trace_start(PyObject * self, PyObject * args) {
+  unsigned long capacity = 1 << 16;
+  if (!PyArg_ParseTuple(args, "|k:_trace_start", &capacity))
+    return NULL;
+
+  // Round the capacity up to a power of 2.
+  unsigned long size = 1;
+  while (size < capacity)
+    size <<= 1;
+
+  if (ring == NULL || size != ring_mask + 1) {
+    TraceEvent * resized = (TraceEvent *) PyMem_RawCalloc(size, sizeof(TraceEvent));
+    if (resized == NULL)
+      return PyErr_NoMemory();
+
+    if (ring != NULL) {
+      // Keep the latest events that fit. Events are only recorded with the
+      // GIL held, so the ring cannot change under our feet.
+      unsigned long head  = ring_head;
+      unsigned long first = head > size ? head - size : 0;
+      if (head > ring_mask + 1 && first < head - ring_mask - 1)
+        first = head - ring_mask - 1;
+
+      for (unsigned long index = first; index < head; index++)
+        resized[index & (size - 1)] = ring[index & ring_mask];
+
+      PyMem_RawFree(ring);
+    }
+
+    ring      = resized;
+    ring_mask = size - 1;
+  }
+
+  trace_enabled = 1;
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Trace_stop(PyObject * self, PyObject * args) {
+  trace_enabled = 0;
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Trace_record_span(PyObject * self, PyObject * args) {
+  unsigned int name;
+  unsigned long long start, end;
+  PyObject * canvas;
+
+  if (!PyArg_ParseTuple(args, "IKKO:_trace_record", &name, &start, &end, &canvas))
+    return NULL;
+
+  if (trace_enabled)
+    Trace_record(name, start, end, canvas);
+
+  Py_INCREF(Py_None); return Py_None;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Trace_get_events(PyObject * self, PyObject * args) {
+  PyObject * events = PyList_New(0);
+  if (events == NULL || ring == NULL)
+    return events;
+
+  unsigned long head  = __atomic_load_n(&ring_head, __ATOMIC_ACQUIRE);
+  unsigned long first = head > ring_mask ? head - ring_mask - 1 : 0;
+
+  for (unsigned long index = first; index < head; index++) {
+    TraceEvent * slot = &(ring[index & ring_mask]);
+    TraceEvent   event;
+
+    if (__atomic_load_n(&(slot->seq), __ATOMIC_ACQUIRE) != index + 1)
+      continue;  // Being written or already overwritten
+
+    event = *slot;
+
+    if (__atomic_load_n(&(slot->seq), __ATOMIC_ACQUIRE) != index + 1)
+      continue;
+
+    PyObject * item = Py_BuildValue("(IiKKn)",
+      event.name, event.tid, event.start, event.end, (Py_ssize_t) event.canvas
+    );
+    if (item == NULL || PyList_Append(events, item) < 0) {
+      Py_XDECREF(item);
+      Py_DECREF(events);
+      return NULL;
+    }
+    Py_DECREF(item);
+  }
+
+  return events;
+}
+
+
+// ----------------------------------------------------------------------------
+PyObject *
+Trace_get_names(PyObject * self, PyObject * args) {
+  PyObject * names = PyTuple_New(TRACE_N_NAMES);
+  if (names == NULL)
+    return NULL;
+
+  for (int i = 0; i < TRACE_N_NAMES; i++)
+    PyTuple_SET_ITEM(names, i, PyUnicode_FromString(TRACE_NAMES[i]));
+
+  return names;
+}
@@ -0,0 +1,77 @@
+// This file is part of "blighty" which is released under GPL.
+//
+// See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+// details.
+//
+// blighty is a desktop widget creation and management library for Python 3.
+//
+// Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+// All rights reserved.
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+#ifndef TRACE_H
+#define TRACE_H
+
+#include <Python.h>
+#include <stdint.h>
+
+// Span names recorded by the C extension. Python code records further names
+// with ids starting at TRACE_N_NAMES.
+enum {
+  TRACE_WAKEUP,
+  TRACE_SEND_EVENT,
+  TRACE_DISPATCH_EVENT,
+  TRACE_ON_DRAW,
+  TRACE_POP_GROUP,
+  TRACE_FLUSH,
+  TRACE_N_NAMES
+};
+
+extern int trace_enabled;
+
+unsigned long long
+getmicros(void);
+
+void
+Trace_record(unsigned int name, unsigned long long start, unsigned long long end, void * canvas);
+
+// Record the span from `start` to now, if tracing is enabled.
+#define TRACE_START(start) unsigned long long start = trace_enabled ? getmicros() : 0
+#define TRACE_END(name, start, canvas) do { \
+  if (trace_enabled) Trace_record(name, start, getmicros(), canvas); \
+} while (0)
+
+
+/******************************************************************************
+ ** PYTHON INTERFACE
+ ******************************************************************************/
+
+PyObject *
+Trace_start(PyObject *, PyObject *);
+
+PyObject *
+Trace_stop(PyObject *, PyObject *);
+
+PyObject *
+Trace_record_span(PyObject *, PyObject *);
+
+PyObject *
+Trace_get_events(PyObject *, PyObject *);
+
+PyObject *
+Trace_get_names(PyObject *, PyObject *);
+
+#endif
@@ -0,0 +1,154 @@
+# This file is part of "blighty" which is released under GPL.
+#
+# See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+# details.
+#
+# blighty is a desktop widget creation and management library for Python 3.
+#
+# Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+# All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Frame tracing.
+
+This module records timestamped spans of the work done to draw every frame of
+every X11 canvas, and exports them in the Chrome trace event format, which can
+be opened with Perfetto (https://ui.perfetto.dev) or ``chrome://tracing``.
+
+The following spans are recorded by the C extension, for every canvas and
+thread:
+
+- ``wakeup``: a wakeup of the scheduler of a canvas that requests a redraw;
+- ``XSendEvent``: the delivery of the redraw request to the X server;
+- ``dispatch_event``: the handling of an X event by the event loop;
+- ``_on_draw``: the call to the draw callback;
+- ``cairo_pop_group``: the composition of the new frame;
+- ``XFlush``: the flush of the drawing requests to the X server.
+
+Every call to a brush is also recorded, with the name of the brush.
+
+Events are stored in a lock-free ring buffer of fixed size, so that recording
+them costs a few atomic operations and the oldest events are overwritten when
+the buffer is full. Tracing is disabled by default. To trace an application,
+set the ``BLIGHTY_TRACE`` environment variable to the path of the trace file
+to write at exit, e.g.::
+
+    BLIGHTY_TRACE=/tmp/trace.json python my_widgets.py
+
+or call :func:`start` and :func:`dump` explicitly.
+"""
+
+import atexit
+import json
+import os
+from functools import wraps
+from time import monotonic
+
+from blighty import _extended_context
+from blighty._x11 import (_trace_events, _trace_names, _trace_record,
+                          _trace_start, _trace_stop)
+
+
+_names = list(_trace_names())
+_name_ids = {name: i for i, name in enumerate(_names)}
+
+
+def _name_id(name):
+    try:
+        return _name_ids[name]
+    except KeyError:
+        _names.append(name)
+        _name_ids[name] = len(_names) - 1
+        return _name_ids[name]
+
+
+def _trace_brush(name, method):
+    name_id = _name_id(name)
+
+    @wraps(method)
+    def traced(ctx, *args, **kwargs):
+        start = int(monotonic() * 1e6)
+        try:
+            return method(ctx, *args, **kwargs)
+        finally:
+            _trace_record(name_id, start, int(monotonic() * 1e6), ctx.canvas)
+
+    return traced
+
+
+def start(path=None, capacity=1 << 16):
+    """Start tracing.
+
+    The brushes of the canvases that are already drawing are traced too.
+
+    Args:
+        path (str): the path of the trace file to write at exit. If not
+            given, call :func:`dump` to write the trace.
+        capacity (int): the number of events the ring buffer can hold. If
+            tracing has been started before, the ring buffer is resized,
+            keeping the latest events that fit.
+    """
+    _trace_start(capacity)
+    if _extended_context.trace_brush is None:
+        _extended_context.trace_brush = _trace_brush
+        _extended_context.reset_context_types()
+
+    if path is not None:
+        atexit.register(dump, path)
+
+
+def stop():
+    """Stop tracing.
+
+    The events recorded so far are retained.
+    """
+    _trace_stop()
+    if _extended_context.trace_brush is not None:
+        _extended_context.trace_brush = None
+        _extended_context.reset_context_types()
+
+
+def events():
+    """Get the recorded events in the Chrome trace event format.
+
+    Returns:
+        list: the trace events, as dictionaries.
+    """
+    pid = os.getpid()
+
+    trace = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "blighty"}}]
+    for name, tid, begin, end, canvas in _trace_events():
+        trace.append({
+            "name": _names[name],
+            "cat": "blighty",
+            "ph": "X",
+            "ts": begin,
+            "dur": end - begin,
+            "pid": pid,
+            "tid": tid,
+            "args": {"canvas": hex(canvas)},
+        })
+
+    return trace
+
+
+def dump(path):
+    """Write the recorded events to a Chrome trace file.
+
+    Args:
+        path (str): the path of the trace file.
+    """
+    with open(path, "w") as fout:
+        json.dump({"traceEvents": events(), "displayTimeUnit": "ms"}, fout)
@@ -1,13 +1,16 @@
 from math import pi as PI
 
-import psutil
+import blighty.fonts
 from attrdict import AttrDict
 from blighty import CanvasGravity, TextAlign
 from blighty.legacy import Graph
+from blighty.sampler import CpuSampler, ProcessTracker
 from blighty.x11 import Canvas, start_event_loop
 
 from fonts import Fonts
 
+blighty.fonts.register("laksaman", *Fonts.LAKSAMAN_NORMAL, sizes = (12, 18, 36))
+
 
 class Cpu(Canvas):
     SIZE = (256, 256)
@@ -28,12 +31,16 @@ class Cpu(Canvas):
         ]
 
         self.graph = Graph(0, 110, self.width, 40)
+        self.cpu = CpuSampler(smoothing = .3)
+        self.processes = ProcessTracker(5)
+        self.processes.start(interval = 2)
 
     @staticmethod
     def build(x = 0, y = 0, gravity = CanvasGravity.CENTER):
         return Cpu(x, y, *Cpu.SIZE, gravity = gravity, interval = 2000)
 
     def on_button_pressed(self, button, *args):
+        self.processes.stop()
         self.dispose()
 
     def draw_polygon(c, n, x, y, size):
@@ -60,7 +67,7 @@ class Cpu(Canvas):
 
         c.set_source_rgb(.8, .8, .8)
 
-        cpus = psutil.cpu_percent(0.1, percpu = True)
+        cpus = c.canvas.cpu.sample()
         n = len(cpus)
         a = 2 * PI / n
 
@@ -75,10 +82,10 @@ class Cpu(Canvas):
             c.line_to(size + length * cpus[i] / 100, 0)
         c.stroke()
 
-        value = int(sum(cpus) / n)
+        value = int(c.canvas.cpu.total)
         c.canvas.graph.push_value(value)
 
-        c.set_font_size(18)
+        c.use_font("laksaman", 18)
         c.write_text(0, 0, '{}%'.format(value), TextAlign.CENTER_MIDDLE)
 
         c.restore()
@@ -86,22 +93,14 @@ class Cpu(Canvas):
         return value
 
     def draw_processes(c):
-        ps = [
-            p.info
-            for p in psutil.process_iter(attrs=['pid', 'name', 'cpu_percent'])
-        ]
-
-        ps = sorted(ps, key=lambda p: p["cpu_percent"], reverse=True)[:5]
-
         y = 170
         c.save()
-        c.select_font_face(*Fonts.LAKSAMAN_NORMAL)
-        c.set_font_size(12)
-        for p in ps:
-            c.write_text(48, y, str(p["pid"]), align = TextAlign.TOP_RIGHT)
-            c.write_text(52, y, p["name"][:24])
+        c.use_font("laksaman", 12)
+        for p in c.canvas.processes.top():
+            c.write_text(48, y, str(p.pid), align = TextAlign.TOP_RIGHT)
+            c.write_text(52, y, p.name[:24])
             c.write_text(
-                c.canvas.width - 2, y, "{}%".format(p["cpu_percent"]),
+                c.canvas.width - 2, y, "{}%".format(p.cpu_percent),
                 align=TextAlign.TOP_RIGHT
             )
             y += 18
@@ -110,7 +109,7 @@ class Cpu(Canvas):
 
     def draw_cpu_name(c):
         c.save()
-        c.set_font_size(12)
+        c.use_font("laksaman", 12)
         c.write_text(
             0, 110,
             c.canvas.coreinfo[0]["model name"].strip()
@@ -122,8 +121,7 @@ class Cpu(Canvas):
     def on_draw(self, c):
         # c.draw_grid()
 
-        c.select_font_face(*Fonts.LAKSAMAN_NORMAL)
-        c.set_font_size(36)
+        c.use_font("laksaman", 36)
         c.set_source_rgb(1, 1, 1)
 
         w, h = Cpu.SIZE
@@ -25,15 +25,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from blighty import CanvasGravity
+from blighty.assets import ImageCache
 from blighty.x11 import Canvas, start_event_loop
 
 import cairo
-import shutil
 import requests
 
 from gi.repository import GLib
 
-from PIL import Image
 from pydbus import SessionBus
 
 
@@ -62,6 +61,7 @@ class Spotify(Canvas):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self.images = ImageCache()
         self.init_dbus()
 
     def init_dbus(self):
@@ -70,8 +70,6 @@ class Spotify(Canvas):
         except GLib.Error:
             self.spotify = None
 
-        self.last_art_url = ""
-
     def on_button_pressed(self, button, state, x, y):
         if button == 1:    # Left button
             self.spotify.toggle_play()
@@ -100,23 +98,11 @@ class Spotify(Canvas):
         hline((0.8, 0.8, 0.8, 1), 1)
 
     def draw_art(ctx, url, pause):
-        temp_file = "/tmp/spotify_art"
-        temp_img = temp_file + ".png"
-
-        if ctx.canvas.last_art_url != url:
-            response = requests.get(url, stream=True)
-            with open(temp_file, 'wb') as out_file:
-                shutil.copyfileobj(response.raw, out_file)
-            del response
-            ctx.canvas.last_art_url = url
-
-        # Ensure it is a PNG image
+        # The art is downloaded and decoded only when the URL changes.
         size = min(ctx.canvas.width, ctx.canvas.height)
-        image = Image.open(temp_file)
-        image.thumbnail((size, size), Image.ANTIALIAS)
-        image.save(temp_img)
-
-        surface = cairo.ImageSurface.create_from_png(temp_img)
+        surface = ctx.canvas.images.get(
+            url, size, loader = lambda: requests.get(url).content
+        )
         ctx.set_source_surface(surface, 0, 0)
         ctx.paint()
 
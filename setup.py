@@ -34,6 +34,7 @@ x11 = Extension('blighty._x11',
         'blighty/x11/_x11module.c',
         'blighty/x11/atelier.c',
         'blighty/x11/base_canvas.c',
+        'blighty/x11/trace.c',
     ]
 )
 
@@ -55,13 +56,13 @@ setup(
         'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
 
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
     ],
     keywords         = 'desklet widget infotainment',
     packages         = find_packages(exclude=['contrib', 'docs', 'tests']),
     ext_modules      = [x11],
+    python_requires  = '>=3.7',  # PEP 562 module __getattr__
     install_requires = ['pycairo'],
     extras_require   = {
         'test': ['pytest-xvfb', 'numpy', 'matplotlib', 'psutil'],
@@ -27,6 +27,8 @@ from numpy import arange
 from matplotlib.backends.backend_gtk3cairo import RendererGTK3Cairo
 from matplotlib.figure import Figure
 
+from blighty.mpl import FigurePlot, update_fill_between
+
 
 class MockCanvas:
     __slots__ = []
@@ -70,3 +72,29 @@ class SimplePlot:
 
         f.canvas = MockCanvas()  # Monkey patch to reduce memory footprint.
         f.draw(renderer)
+
+
+class BlitPlot:
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.values = [-1] * 100
+
+        self.plot = FigurePlot(width, height)
+        self.plot.figure.subplots_adjust(wspace=0, top=1.0, bottom=0.0, left=0, right=1.0)
+
+        self.t = arange(0, 100, 1)
+        ax = self.plot.add_subplot(111)
+        ax.axis('off')
+        ax.set_ylim([0, 100])
+
+        self.fill = self.plot.animate(ax.fill_between(self.t, self.values, 0))
+
+    def push_value(self, v):
+        self.values.pop(0)
+        self.values.append(v)
+
+    def draw(self, cr):
+        update_fill_between(self.fill, self.t, self.values)
+        self.plot.draw(cr)
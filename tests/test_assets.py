@@ -0,0 +1,126 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from io import BytesIO
+from threading import Event
+
+import cairo
+
+from blighty.assets import ImageCache, ImagePipeline
+
+
+def png(width, height):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+    cr.set_source_rgb(1, 0, 0)
+    cr.paint()
+
+    buf = BytesIO()
+    surface.write_to_png(buf)
+    return buf.getvalue()
+
+
+def test_image_cache():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return png(200, 100)
+
+    cache = ImageCache()
+
+    original = cache.get("art", loader=loader)
+    assert (original.get_width(), original.get_height()) == (200, 100)
+
+    thumb = cache.get("art", 64, loader=loader)
+    assert (thumb.get_width(), thumb.get_height()) == (64, 32)
+
+    assert cache.get("art", 64, loader=loader) is thumb
+    assert cache.get("art", (64, 64), loader=loader) is thumb
+    assert len(loads) == 1
+    assert len(cache) == 2
+
+    cache.discard("art")
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_image_cache_budget(tmp_path):
+    path = tmp_path / "art.png"
+    path.write_bytes(png(100, 100))
+
+    # Room for the original and one thumbnail only.
+    cache = ImageCache(budget=100 * 100 * 4 + 50 * 50 * 4)
+
+    cache.get(str(path), 50)
+    assert len(cache) == 2
+
+    cache.get(str(path), 40)
+    assert (str(path), (50, 50)) not in cache
+    assert (str(path), (40, 40)) in cache
+    assert cache.nbytes <= cache.budget
+
+
+def test_image_pipeline():
+    ready = Event()
+    release = Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        release.wait(5)
+        return png(200, 100)
+
+    pipeline = ImagePipeline()
+
+    # The request returns immediately, while the loader is still blocked.
+    assert pipeline.request("art", 64, loader, ready.set) is None
+    assert pipeline.request("art", 64, loader, ready.set) is None
+
+    release.set()
+    assert ready.wait(5)
+
+    thumb = pipeline.request("art", 64, loader, ready.set)
+    assert (thumb.get_width(), thumb.get_height()) == (64, 32)
+    assert len(loads) == 1
+
+    placeholder = pipeline.placeholder(64)
+    assert (placeholder.get_width(), placeholder.get_height()) == (64, 64)
+
+    pipeline.shutdown()
+
+
+def test_image_pipeline_failure():
+    def loader():
+        raise OSError("No such image")
+
+    pipeline = ImagePipeline()
+
+    assert pipeline.request("art", loader=loader) is None
+    pipeline.shutdown()
+
+    # Failed requests are not retried until the source is discarded.
+    assert ("art", None) in pipeline._failed
+    pipeline.discard("art")
+    assert not pipeline._failed
@@ -0,0 +1,108 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import cairo
+from pytest import raises
+
+from blighty import ExtendedContext, brush
+
+
+class Canvas:
+    def __init__(self):
+        self.calls = []
+
+    def draw_dot(ctx, x, y):
+        ctx.canvas.calls.append("dot")
+        ctx.rectangle(x, y, 1, 1)
+
+    @brush
+    def cross(ctx, x, y):
+        ctx.canvas.calls.append("cross")
+        ctx.draw_dot(x, y)
+
+
+class SubCanvas(Canvas):
+    pass
+
+
+CLOCK = """
+from blighty import brush
+
+class Clock:
+    @brush
+    def {brush}(ctx):
+        pass
+"""
+
+
+def define_clock(module, brush):
+    namespace = {"__name__": module}
+    exec(CLOCK.format(brush=brush), namespace)
+    return namespace["Clock"]
+
+
+def context():
+    return cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 8, 8))
+
+
+def test_extended_context_brushes():
+    canvas = SubCanvas()
+    ctx = ExtendedContext(context(), canvas)
+
+    ctx.cross(1, 1)
+    assert canvas.calls == ["cross", "dot"]
+
+    with raises(RuntimeError):
+        canvas.draw_dot(0, 0)
+
+    # The brush table is built once per canvas class.
+    other = ExtendedContext(context(), SubCanvas())
+    assert type(other) is type(ctx)
+    assert isinstance(ctx, ExtendedContext)
+
+
+def test_extended_context_set_context():
+    canvas = Canvas()
+    ctx = ExtendedContext(context(), canvas)
+    ctx.draw_dot(0, 0)
+
+    # The methods used with the previous context are bound to the new one.
+    cr = context()
+    ctx.set_context(cr)
+    ctx.draw_dot(2, 3)
+
+    assert ctx.get_target() is cr.get_target()
+    assert cr.path_extents() == (2, 3, 3, 4)
+
+
+def test_extended_context_same_name():
+    # Classes with the same name in different modules keep their own brushes.
+    clock_a = define_clock("clock_a", "tick")
+    clock_b = define_clock("clock_b", "tock")
+
+    ctx_a = ExtendedContext(context(), clock_a())
+    ctx_b = ExtendedContext(context(), clock_b())
+
+    assert hasattr(ctx_a, "tick") and not hasattr(ctx_a, "tock")
+    assert hasattr(ctx_b, "tock") and not hasattr(ctx_b, "tick")
@@ -0,0 +1,64 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import cairo
+from pytest import raises
+
+from blighty.fonts import FontRegistry
+
+
+def test_font_registry():
+    fonts = FontRegistry()
+    fonts.register("sans", "Sans", sizes=(12, 24))
+
+    assert "sans" in fonts
+    assert not fonts._fonts
+
+    fonts.warm()
+    assert set(fonts._fonts) == {("sans", 12), ("sans", 24)}
+
+    font = fonts.get("sans", 12)
+    assert fonts.get("sans", 12) is font
+    assert font.get_font_matrix().xx == 12
+
+    # Re-registering a name drops its scaled fonts.
+    fonts.register("sans", "Sans", weight=cairo.FONT_WEIGHT_BOLD)
+    assert fonts.get("sans", 12) is not font
+
+    with raises(KeyError):
+        fonts.get("serif", 12)
+
+
+def test_font_registry_tuple():
+    fonts = FontRegistry()
+    name = ("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_BOLD)
+
+    font = fonts.get(name, 10)
+    assert name in fonts
+    assert fonts.get(name, 10) is font
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 10, 10)
+    cr = cairo.Context(surface)
+    cr.set_scaled_font(font)
+    assert cr.get_font_face().get_weight() == cairo.FONT_WEIGHT_BOLD
@@ -0,0 +1,173 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import sys
+
+from pytest import raises
+
+from blighty import CanvasGravity
+from blighty.host import build_widget, load_source, shared
+
+
+WIDGET = """
+class Widget:
+    def __init__(self, x, y, gravity = None):
+        self.x, self.y, self.gravity = x, y, gravity
+
+    @staticmethod
+    def build(x = 0, y = 0, gravity = None):
+        return Widget(x, y, gravity)
+"""
+
+MULTI = """
+from {} import Widget
+
+def build():
+    return [Widget(0, 0), Widget(1, 1)]
+"""
+
+
+def test_load_directory(tmp_path):
+    (tmp_path / "widget.py").write_text(WIDGET)
+    (tmp_path / "multi.py").write_text(MULTI.format("widget"))
+    (tmp_path / "_helper.py").write_text("")
+    (tmp_path / "README").write_text("")
+
+    specs = load_source(str(tmp_path))
+    assert list(specs) == ["multi", "widget"]
+
+    widget, = build_widget(specs["widget"])
+    assert (widget.x, widget.y) == (0, 0)
+
+    first, second = build_widget(specs["multi"])
+    assert (second.x, second.y) == (1, 1)
+
+
+def test_load_config(tmp_path):
+    (tmp_path / "widget.py").write_text(WIDGET)
+    config = tmp_path / "widgets.json"
+    config.write_text(json.dumps({"widgets": [
+        "widget.py",
+        {
+            "name": "other",
+            "module": "widget.py",
+            "class": "Widget",
+            "args": [10, 20],
+            "kwargs": {"gravity": "south_east"},
+        },
+    ]}))
+
+    specs = load_source(str(config))
+    assert list(specs) == ["widget", "other"]
+    assert specs["widget"]["module"] == str(tmp_path / "widget.py")
+
+    widget, = build_widget(specs["other"])
+    assert (widget.x, widget.y) == (10, 20)
+    assert widget.gravity == CanvasGravity.SOUTH_EAST
+
+    config.write_text(json.dumps(["widget.py", "widget.py"]))
+    with raises(ValueError):
+        load_source(str(config))
+
+
+def test_shared():
+    class Sampler:
+        def __init__(self, smoothing=0):
+            self.smoothing = smoothing
+
+    assert shared(Sampler, smoothing=.5) is shared(Sampler, smoothing=.5)
+    assert shared(Sampler, smoothing=.5) is not shared(Sampler)
+
+
+X11_WIDGET = """
+import blighty.x11 as x11
+
+class Blink(x11.Canvas):
+    frames = 0
+
+    @staticmethod
+    def build():
+        return Blink(0, 0, 32, 32, interval = 10)
+
+    def on_draw(self, ctx):
+        Blink.frames += 1
+        ctx.set_source_rgb(Blink.frames % 2, 0, 0)
+        ctx.paint()
+"""
+
+
+def blink_frames():
+    # The module is executed again every time the widget is added.
+    return sys.modules["blighty_widget_blink"].Blink.frames
+
+
+def test_host_run(tmp_path):
+    from threading import Timer
+
+    from blighty.host import Host
+
+    (tmp_path / "blink.py").write_text(X11_WIDGET)
+
+    host = Host([str(tmp_path)])
+    frames = []
+
+    # Add and remove widgets at runtime, from another thread.
+    Timer(.2, host.add, ("other", {"module": str(tmp_path / "blink.py")})).start()
+    Timer(.4, host.remove, ("blink",)).start()
+    Timer(.55, lambda: frames.append(blink_frames())).start()
+    Timer(.6, host.stop).start()
+
+    host.run()
+
+    assert not host.widgets
+    assert frames[0] > 10
+    assert host._wakeup_r is None
+
+
+def test_host_reopen_display(tmp_path):
+    from threading import Timer
+
+    from blighty.host import Host
+
+    (tmp_path / "blink.py").write_text(X11_WIDGET)
+
+    host = Host([str(tmp_path)])
+    spec = {"module": str(tmp_path / "blink.py")}
+    frames = []
+
+    def replace():
+        # Removing the only widget closes the X connection and adding it back
+        # opens a new one, most likely with the same file descriptor.
+        host.remove("blink")
+        host.add("blink", spec)
+
+    Timer(.2, replace).start()
+    Timer(.55, lambda: frames.append(blink_frames())).start()
+    Timer(.6, host.stop).start()
+
+    host.run()
+
+    assert not host.widgets
+    assert frames[0] > 10
@@ -0,0 +1,57 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import subprocess
+import sys
+
+
+def imported_modules(module):
+    script = "import sys, {}; print(' '.join(sys.modules))".format(module)
+    return set(subprocess.check_output([sys.executable, "-c", script]).decode().split())
+
+
+def test_lazy_imports():
+    for module in ["blighty", "blighty.x11", "blighty.gtk", "blighty.offscreen"]:
+        modules = imported_modules(module)
+
+        assert "cairo" not in modules
+        assert "gi" not in modules
+        assert "blighty._x11" not in modules
+
+
+def test_no_import_side_effects():
+    script = "import os, blighty, blighty.gtk; print(os.environ.get('GDK_BACKEND'))"
+    env = {k: v for k, v in os.environ.items() if k != "GDK_BACKEND"}
+
+    assert subprocess.check_output([sys.executable, "-c", script], env=env).strip() == b"None"
+
+
+def test_lazy_attributes():
+    import blighty
+
+    assert blighty.brush is blighty._brush.brush
+    assert blighty.TextAlign is blighty._brush.TextAlign
+    assert blighty.ExtendedContext is blighty._extended_context.ExtendedContext
+    assert "ExtendedContext" in dir(blighty)
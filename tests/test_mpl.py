@@ -0,0 +1,78 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import cairo
+import numpy as np
+from matplotlib.backends.backend_cairo import RendererCairo
+
+from plot import BlitPlot
+
+
+def render(draw, width, height):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    draw(cairo.Context(surface))
+    surface.flush()
+
+    return np.ndarray(
+        (height, surface.get_stride()), np.uint8, surface.get_data()
+    ).copy()
+
+
+def test_mpl_background_cached():
+    plot = BlitPlot(320, 160)
+
+    plot.push_value(42)
+    render(plot.draw, 320, 160)
+    background = plot.plot._background
+    assert background is not None
+
+    plot.push_value(24)
+    render(plot.draw, 320, 160)
+    assert plot.plot._background is background
+
+    plot.plot.invalidate()
+    render(plot.draw, 320, 160)
+    assert plot.plot._background is not background
+
+
+def test_mpl_matches_full_draw():
+    plot = BlitPlot(320, 160)
+    ax = plot.fill.axes
+    ax.axis("on")  # Give the background some content.
+    for v in range(0, 100, 7):
+        plot.push_value(v)
+
+    blitted = render(plot.draw, 320, 160)
+
+    def full_draw(cr):
+        plot.fill.set_animated(False)
+        renderer = RendererCairo(plot.plot.figure.dpi)
+        renderer.set_context(cr)
+        renderer.width, renderer.height = 320, 160
+        plot.plot.figure.draw(renderer)
+
+    expected = render(full_draw, 320, 160)
+
+    assert blitted.any()
+    assert np.abs(blitted.astype(int) - expected).max() <= 1
@@ -0,0 +1,122 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from io import BytesIO
+
+from pytest import raises
+
+from blighty import TextAlign
+from blighty.offscreen import Canvas, start_event_loop, stop_event_loop
+
+
+class RedCanvas(Canvas):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = 0
+
+    def draw_square(ctx, size):
+        ctx.rectangle(0, 0, size, size)
+        ctx.fill()
+
+    def on_draw(self, ctx):
+        self.frames += 1
+        if self.frames == 3:
+            return True
+
+        ctx.set_source_rgb(1, 0, 0)
+        ctx.draw_square(self.frames)
+        ctx.write_text(0, 0, "blighty", align = TextAlign.BOTTOM_RIGHT)
+
+
+def pixel(canvas, x, y):
+    data = canvas.to_bytes()
+    i = (y * canvas.width + x) << 2
+    return data[i:i + 4]
+
+
+def test_offscreen_canvas():
+    canvas = RedCanvas(0, 0, 8, 4)
+    assert canvas.get_size() == (8, 4)
+
+    canvas.render_frame()
+    assert len(canvas.to_bytes()) == 8 * 4 * 4
+    assert pixel(canvas, 0, 0) != bytes(4)
+    assert pixel(canvas, 1, 1) == bytes(4)
+
+    canvas.render_frame()
+    assert pixel(canvas, 1, 1) != bytes(4)
+
+    # The third frame is skipped so the previous content is retained.
+    canvas.render_frame()
+    assert pixel(canvas, 1, 1) != bytes(4)
+
+    buf = BytesIO()
+    canvas.write_to_png(buf)
+    assert buf.getvalue()[:4] == b"\x89PNG"
+
+
+def test_offscreen_event_loop():
+    class StopCanvas(RedCanvas):
+        def on_draw(self, ctx):
+            super().on_draw(ctx)
+            if self.frames == 5:
+                stop_event_loop()
+
+    canvas = StopCanvas(0, 0, 8, 8, interval = 1)
+    canvas.show()
+    start_event_loop()
+    canvas.destroy()
+
+    assert canvas.frames == 5
+
+
+def test_offscreen_draw_error():
+    class FaultyCanvas(Canvas):
+        def on_draw(self, ctx):
+            ctx.set_source_rgb(1, 0, 0)
+            ctx.paint()
+            if self.faulty:
+                raise ValueError("faulty frame")
+
+    canvas = FaultyCanvas(0, 0, 4, 4)
+    canvas.faulty = True
+    with raises(ValueError):
+        canvas.render_frame()
+
+    # The group is popped, so nothing is drawn and the context can still be
+    # used for the next frame.
+    assert pixel(canvas, 0, 0) == bytes(4)
+
+    canvas.faulty = False
+    canvas.render_frame()
+    assert pixel(canvas, 0, 0) != bytes(4)
+
+
+def test_offscreen_server_image():
+    canvas = RedCanvas(0, 0, 4, 4)
+    canvas.render_frame()
+
+    # Images can only be pinned on the X server by X11 canvases.
+    with raises(AttributeError):
+        canvas._extended_context.server_image
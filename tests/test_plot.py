@@ -0,0 +1,98 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import cairo
+import numpy as np
+
+from blighty.plot import Chart, SeriesType, nice_ticks
+
+
+def test_nice_ticks():
+    assert nice_ticks(0, 97) == [0, 20, 40, 60, 80, 100]
+    assert nice_ticks(-3.2, 7.9) == [-5, 0, 5, 10]
+    assert nice_ticks(.01, .037) == [.01, .02, .03, .04]
+
+
+def test_chart():
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 200, 100)
+    cr = cairo.Context(surface)
+
+    chart = Chart(0, 0, 200, 100)
+    chart.add_series("area", SeriesType.AREA)
+    chart.add_series("bar", SeriesType.BAR, color=(1, 0, 0, 1))
+    line = chart.add_series("line", color=(0, 1, 0, 1))
+
+    for i in range(50):
+        chart.push_value("area", i)
+    chart.set_data("bar", np.arange(10.) * 3)
+    chart.set_data("line", np.sin(np.linspace(0, 6, 1000)), np.linspace(0, 60, 1000))
+
+    chart.draw(cr)
+    surface.flush()
+
+    assert any(surface.get_data())
+    assert chart._layout_key == ((0, 199), (-10, 50))
+
+    # Unchanged data and limits: the cached path is reused.
+    path = line._path
+    chart.draw(cr)
+    assert line._path is path
+
+    chart.push_value("area", 10)
+    chart.draw(cr)
+    assert line._path is path
+
+
+def render(chart):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, chart.width, chart.height)
+    chart.draw(cairo.Context(surface))
+    surface.flush()
+    return np.frombuffer(surface.get_data(), dtype=np.uint8).astype(int)
+
+
+def test_chart_scroll():
+    chart = Chart(0, 0, 100, 50, ylim=(0, 100), axes=False)
+    area = chart.add_series("area", SeriesType.AREA)
+    for i in range(150):
+        chart.push_value("area", i % 70)
+    render(chart)
+    assert area._shift == 0
+
+    # The pushed values are appended to the cached path, which is scrolled.
+    for i in range(30):
+        chart.push_value("area", 3 * i)
+    scrolled = render(chart)
+    assert area._shift == 30
+
+    fresh = Chart(0, 0, 100, 50, ylim=(0, 100), axes=False)
+    fresh.add_series("area", SeriesType.AREA)
+    for value in area.y:
+        fresh.push_value("area", value)
+    assert np.abs(scrolled - render(fresh)).max() <= 8
+
+    # The path is built again once it has scrolled by the whole width.
+    for i in range(70):
+        chart.push_value("area", i)
+    render(chart)
+    assert area._shift == 0
@@ -0,0 +1,111 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import socket
+from time import monotonic, sleep
+
+from pytest import raises
+
+from blighty.push import PushServer, main, send
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.invalidated = 0
+
+    def invalidate(self):
+        self.invalidated += 1
+
+
+class PushCanvas(FakeCanvas):
+    def on_push(self, values):
+        self.values = values
+
+
+def serve_until(server, predicate, timeout=2):
+    deadline = monotonic() + timeout
+    while not predicate() and monotonic() < deadline:
+        server.poll(.05)
+
+
+def test_push(tmp_path):
+    path = str(tmp_path / "push.sock")
+    server = PushServer(path)
+
+    plain, hooked = FakeCanvas(), PushCanvas()
+    server.register("plain", plain)
+    server.register("hooked", hooked)
+
+    send("plain", {"status": "ok"}, path)
+    send("hooked", {"load": .5}, path)
+    main(["--socket", path, "plain", "count=42", "name=build"])
+
+    serve_until(server, lambda: plain.invalidated == 2 and hooked.invalidated)
+
+    assert plain.pushed == {"status": "ok", "count": 42, "name": "build"}
+    assert hooked.values == {"load": .5}
+    assert not hasattr(hooked, "pushed")
+
+    # Many messages on one connection, split across writes, and bad ones.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(b'{"canvas": "hooked", "values": {"a": 1}}\nnot json\n{"canvas": "unknown", ')
+        sock.sendall(b'"values": {}}\n{"canvas": "hooked", "values": {"a": 2}}')
+
+    serve_until(server, lambda: hooked.invalidated == 3)
+    assert hooked.values == {"a": 2}
+
+    server.unregister("hooked", hooked)
+    assert "hooked" not in server.canvases
+
+    # Only one server per socket.
+    with raises(RuntimeError):
+        PushServer(path)
+
+    server.close()
+
+    # A stale socket is replaced.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    PushServer(path).close()
+
+
+def test_push_thread(tmp_path):
+    path = str(tmp_path / "push.sock")
+    server = PushServer(path)
+    canvas = FakeCanvas()
+    server.register("canvas", canvas)
+    server.start()
+
+    try:
+        send("canvas", {"value": 1}, path)
+
+        deadline = monotonic() + 2
+        while not canvas.invalidated and monotonic() < deadline:
+            sleep(.01)
+    finally:
+        server.close()
+
+    assert canvas.pushed == {"value": 1}
@@ -0,0 +1,144 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from pytest import approx
+
+from blighty.sampler import CpuSampler
+
+
+STAT = """cpu  {0} 0 0 {1} 0 0 0 0 0 0
+cpu0 {0} 0 0 {2} 0 0 0 0 0 0
+cpu1 0 0 0 {2} 0 0 0 0 0 0
+intr 0
+"""
+
+
+def write_stat(path, busy, idle):
+    path.write_text(STAT.format(busy, idle << 1, idle))
+
+
+def test_cpu_sampler(tmp_path):
+    stat = tmp_path / "stat"
+    write_stat(stat, 100, 100)
+
+    cpu = CpuSampler(stat_file=str(stat))
+
+    assert cpu.sample() == [50., 0.]
+    assert cpu.total == approx(100. / 3)
+
+    write_stat(stat, 200, 200)
+    assert cpu.sample() == [50., 0.]
+
+    write_stat(stat, 300, 200)
+    assert cpu.sample() == [100., 0.]
+    assert cpu.total == 100.
+    assert len(cpu) == 2
+
+
+def test_cpu_sampler_smoothing(tmp_path):
+    stat = tmp_path / "stat"
+    write_stat(stat, 0, 100)
+
+    cpu = CpuSampler(smoothing=.5, stat_file=str(stat))
+    assert cpu.sample() == [0., 0.]
+
+    write_stat(stat, 100, 100)
+    assert cpu.sample() == [50., 0.]
+
+    write_stat(stat, 200, 100)
+    assert cpu.sample() == [75., 0.]
+
+
+def test_cpu_sampler_proc():
+    cpu = CpuSampler()
+
+    for _ in range(3):
+        cores = cpu.sample()
+        assert cores
+        assert all(0 <= c <= 100 for c in cores)
+        assert 0 <= cpu.total <= 100
+
+
+def write_pid_stat(proc, pid, name, cpu_time, start=1000):
+    stat = proc / str(pid)
+    stat.mkdir(exist_ok=True)
+    (stat / "stat").write_text(
+        "{} ({}) S 1 1 1 0 -1 0 0 0 0 0 {} 0 0 0 20 0 1 0 {} 0 0\n".format(
+            pid, name, cpu_time, start
+        )
+    )
+
+
+def test_process_tracker(tmp_path, monkeypatch):
+    import blighty.sampler as sampler
+
+    clock = [0.]
+    monkeypatch.setattr(sampler, "monotonic", lambda: clock[0])
+
+    (tmp_path / "self").mkdir()
+    write_pid_stat(tmp_path, 1, "init", 0)
+    write_pid_stat(tmp_path, 42, "my (odd) name", 0)
+    write_pid_stat(tmp_path, 100, "idle", 0)
+
+    tracker = sampler.ProcessTracker(2, proc=str(tmp_path))
+    tracker._hz = 100
+
+    assert tracker.refresh() == []
+    assert len(tracker) == 3
+
+    clock[0] = 1.
+    write_pid_stat(tmp_path, 1, "init", 10)
+    write_pid_stat(tmp_path, 42, "my (odd) name", 50)
+
+    top = [
+        sampler.Process(42, "my (odd) name", 50.),
+        sampler.Process(1, "init", 10.),
+    ]
+    assert tracker.refresh() == top
+    assert tracker.top() == tuple(top)
+
+    # Process churn: PID 42 exits and PID 1 is recycled.
+    clock[0] = 2.
+    (tmp_path / "42" / "stat").unlink()
+    (tmp_path / "42").rmdir()
+    write_pid_stat(tmp_path, 1, "recycled", 90, start=2000)
+    write_pid_stat(tmp_path, 100, "idle", 20)
+    write_pid_stat(tmp_path, 7, "new", 0)
+
+    assert tracker.refresh() == [sampler.Process(100, "idle", 20.)]
+    assert len(tracker) == 3
+
+
+def test_process_tracker_background():
+    from time import sleep
+
+    from blighty.sampler import ProcessTracker
+
+    tracker = ProcessTracker(3)
+    tracker.start(interval=.05)
+    sleep(.2)
+    tracker.stop()
+
+    assert len(tracker) > 0
+    assert len(tracker.top()) <= 3
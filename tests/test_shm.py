@@ -0,0 +1,97 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from uuid import uuid4
+
+import numpy as np
+from pytest import fixture, raises
+
+from blighty.shm import Ring
+
+
+@fixture
+def name():
+    name = "test-" + uuid4().hex
+    yield name
+
+    try:
+        Ring.open(name).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def test_ring(name):
+    producer = Ring.create(name, capacity=8, channels=2, dtype="float32")
+    consumer = Ring.open(name)
+
+    assert (consumer.capacity, consumer.channels, consumer.dtype) == (8, 2, np.float32)
+    assert consumer.latest().shape == (0, 2)
+
+    producer.append((1, -1))
+    producer.extend([(i, -i) for i in range(2, 7)])
+    assert len(consumer) == 6
+    assert consumer.latest(3).tolist() == [[4, -4], [5, -5], [6, -6]]
+
+    # Wrap around: the latest window is still contiguous.
+    producer.extend(np.arange(7, 12).repeat(2).reshape(-1, 2) * (1, -1))
+    window = consumer.latest()
+    assert window[:, 0].tolist() == list(range(4, 12))
+    assert np.shares_memory(window, consumer._data)
+
+    with raises(ValueError):
+        window[0, 0] = 0
+
+    # More samples than the capacity
+    producer.extend(np.ones((20, 2)))
+    assert consumer.head == 31
+    assert consumer.latest().tolist() == [[1, 1]] * 8
+
+    del window
+
+
+def test_ring_since(name):
+    ring = Ring.create(name, capacity=4)
+
+    samples, index = ring.since(0)
+    assert len(samples) == 0
+
+    ring.extend([1, 2, 3])
+    samples, index = ring.since(index)
+    assert samples.ravel().tolist() == [1, 2, 3]
+
+    ring.extend(range(4, 10))
+    samples, index = ring.since(index)
+    assert samples.ravel().tolist() == [6, 7, 8, 9]
+    assert index == 9
+
+    del samples
+    ring.close()
+
+
+def test_ring_invalid(name, tmp_path):
+    with raises(ValueError):
+        Ring.create("../escape", capacity=4)
+
+    with raises(FileNotFoundError):
+        Ring.open(name)
@@ -24,6 +24,8 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from random import random as r
 
+from pytest import raises
+
 import blighty.x11 as x11
 from blighty import CanvasGravity
 
@@ -166,6 +168,129 @@ def test_draw_once():
     x11.start_event_loop()
 
 
+def test_canvas_stats():
+
+    class StatsCanvas(x11.Canvas):
+        def on_draw(self, ctx):
+            if self.stats()["frames_drawn"] >= 3:
+                self.dispose()
+
+    canvas = StatsCanvas(40, 40, 64, 64, interval = 10)
+    canvas.show()
+    x11.start_event_loop()
+
+    # The timer may fire again before the dispose request is processed.
+    stats = canvas.stats()
+    assert stats["frames_drawn"] >= 4
+    assert sum(stats["draw_time_histogram"]) == stats["frames_drawn"]
+    assert stats["latency_count"] > 0
+    assert stats["events"] >= stats["latency_count"]
+    assert stats["draw_time_max"] <= stats["draw_time_total"]
+
+    assert x11.stats()["frames_drawn"] >= stats["frames_drawn"]
+
+
+def test_canvas_budget():
+    from time import sleep
+
+    class SlowCanvas(x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.c = 0
+            self.changes = []
+
+        def on_overbudget(self, overbudget):
+            self.changes.append((overbudget, self.effective_interval))
+            if self.effective_interval == self.interval:
+                self.dispose()
+
+        def on_draw(self, ctx):
+            self.c += 1
+            if self.c <= 6:
+                sleep(.03)
+            elif self.c > 100:
+                self.dispose()
+
+    canvas = SlowCanvas(40, 40, 64, 64, interval = 10)
+    assert canvas.effective_interval == 10
+
+    canvas.show()
+    x11.start_event_loop()
+
+    assert canvas.changes == [(True, 20), (True, 40), (False, 20), (False, 10)]
+
+
+def test_canvas_damage():
+    class DamageCanvas(x11.Canvas):
+        c = 0
+
+        def on_draw(self, ctx):
+            self.c += 1
+            if self.c > 4:
+                self.dispose()
+                return
+
+            # Only the top-left quarter is updated after the first frame.
+            if self.c > 1:
+                self.damage(0, 0, self.width >> 1, self.height >> 1)
+                self.damage(x = 8, y = 8, width = 8, height = 8)
+            ctx.set_source_rgb(self.c / 4, 0, 0)
+            ctx.paint()
+
+    canvas = DamageCanvas(40, 40, 64, 64, interval = 10)
+    with raises(TypeError):
+        canvas.damage(0, 0, 1)
+
+    canvas.show()
+    x11.start_event_loop()
+
+    assert canvas.stats()["frames_drawn"] >= 4
+
+
+def test_create_canvases():
+    class Tile(x11.Canvas):
+        def on_draw(self, ctx):
+            ctx.set_source_rgb(r(), r(), r())
+            ctx.paint()
+            self.dispose()
+
+    tiles = x11.create_canvases(
+        (Tile, (16 * (i % 10), 16 * (i // 10), 16, 16), {"interval": 10})
+        for i in range(100)
+    )
+    assert len(tiles) == 100
+    assert x11.stats()["canvases"] == 100
+
+    x11.start_event_loop()
+
+    assert x11.stats()["canvases"] == 0
+
+
+def test_server_image():
+    import cairo
+
+    logo = cairo.ImageSurface(cairo.FORMAT_ARGB32, 32, 32)
+
+    class Logo(x11.Canvas):
+        pinned = []
+
+        def on_draw(self, ctx):
+            self.pinned.append(ctx.server_image(logo))
+            ctx.set_source_surface(self.pinned[-1], 0, 0)
+            ctx.paint()
+
+            if len(self.pinned) > 4:
+                self.dispose()
+
+    canvas = Logo(0, 0, 32, 32, interval = 10)
+    canvas.show()
+    x11.start_event_loop()
+
+    assert len(set(map(id, Logo.pinned))) == 1
+    assert Logo.pinned[0] is not logo
+    assert canvas._server_images == {}
+
+
 if __name__ == "__main__":
     test_canvas()
     test_draw_methods()
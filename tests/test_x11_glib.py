@@ -0,0 +1,78 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from gi.repository import GLib
+
+import blighty.x11 as x11
+from blighty.x11 import glib
+
+
+class CountingCanvas(x11.Canvas):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = 0
+
+    def on_draw(self, ctx):
+        self.frames += 1
+        if self.frames >= 5:
+            self.dispose()
+
+
+def test_glib_main_loop():
+    loop = GLib.MainLoop()
+
+    def check():
+        if x11.stats()["canvases"]:
+            return GLib.SOURCE_CONTINUE
+        loop.quit()
+        return GLib.SOURCE_REMOVE
+
+    canvas = CountingCanvas(40, 40, 64, 64, interval = 10)
+    canvas.show()
+
+    glib.attach()
+    GLib.timeout_add(20, check)
+    timeout = GLib.timeout_add_seconds(5, loop.quit)
+    loop.run()
+    GLib.source_remove(timeout)
+
+    # The canvas is redrawn by the GLib main loop alone.
+    assert canvas.frames >= 5
+
+
+def test_glib_detach():
+    canvas = CountingCanvas(40, 40, 64, 64, interval = 10)
+    canvas.show()
+
+    source = glib.attach()
+    source.destroy()
+
+    # Once detached, the canvas is only drawn by the blocking event loop.
+    context = GLib.MainContext.default()
+    while context.iteration(False):
+        pass
+    assert canvas.frames == 0
+
+    x11.start_event_loop()
+    assert canvas.frames >= 5
@@ -26,15 +26,15 @@ import psutil
 from blighty import CanvasGravity
 from blighty.x11 import Canvas, start_event_loop
 
-from plot import SimplePlot
+from plot import BlitPlot, SimplePlot
 
 
-def test_canvas():
+def run_canvas(plot_class):
     class TestMPL(Canvas):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
 
-            self.plot = SimplePlot(*self.get_size())
+            self.plot = plot_class(*self.get_size())
             self.count = 5
 
         def on_draw(self, cr):
@@ -59,5 +59,13 @@ def test_canvas():
     start_event_loop()
 
 
+def test_canvas():
+    run_canvas(SimplePlot)
+
+
+def test_canvas_blit():
+    run_canvas(BlitPlot)
+
+
 if __name__ == "__main__":
     test_canvas()
@@ -0,0 +1,142 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import blighty.x11 as x11
+
+
+class Counter(x11.Widget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.draws = 0
+        self.clicks = []
+
+    def on_button_pressed(self, button, state, x, y):
+        self.clicks.append((x, y))
+
+    def on_draw(self, ctx):
+        self.draws += 1
+        ctx.set_source_rgb(1, 1, 1)
+        ctx.rectangle(0, 0, *self.get_size())
+        ctx.fill()
+        ctx.write_text(0, 0, str(self.draws))
+
+        if self.panel.draws > 20:
+            self.panel.dispose()
+
+        if self.draws > 1 and self.interval == 0:
+            # Retain the current content.
+            return True
+
+
+class CountingPanel(x11.Panel):
+    draws = 0
+
+    def on_draw(self, ctx):
+        self.draws += 1
+        return super().on_draw(ctx)
+
+
+def test_panel():
+    panel = CountingPanel(0, 0, 200, 100)
+
+    fast = panel.add(Counter(0, 0, 100, 100, interval = 20))
+    slow = panel.add(Counter(100, 0, 100, 100, interval = 60))
+    assert panel.interval == 20
+
+    idle = panel.add(Counter(50, 50, 20, 20, interval = 0))
+    assert panel.interval == 20
+    assert panel.widget_at(60, 60) is idle
+    assert panel.widget_at(10, 10) is fast
+    assert panel.widget_at(150, 10) is slow
+
+    panel.on_button_pressed(1, 0, 160, 30)
+    assert slow.clicks == [(60, 30)]
+    assert not fast.clicks
+
+    idle.dispose()
+    assert idle.panel is None
+    assert idle not in panel.widgets
+
+    panel.show()
+    assert x11.start_event_loop() is None
+
+    assert fast.draws > slow.draws > 0
+
+
+class Fill(x11.Widget):
+    def __init__(self, color, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.color = color
+        self.draws = 0
+
+    def on_draw(self, ctx):
+        self.draws += 1
+        ctx.set_source_rgb(*self.color)
+        ctx.paint()
+
+        if self.draws >= 5 and self.interval:
+            self.panel.dispose()
+
+
+def test_panel_overlap():
+    panel = CountingPanel(0, 0, 100, 100)
+
+    lower = panel.add(Fill((1, 0, 0), 0, 0, 100, 100, interval = 20))
+    upper = panel.add(Fill((0, 0, 1), 25, 25, 50, 50, interval = 0))
+
+    panel.show()
+    x11.start_event_loop()
+
+    # The upper widget is drawn once, and stays on top of the lower one.
+    assert lower.draws >= 5
+    assert upper.draws == 1
+
+    data = panel._surface.get_data()
+    stride = panel._surface.get_stride()
+
+    b, g, r, a = data[50 * stride + 200:50 * stride + 204]
+    assert (r, g, b, a) == (0, 0, 255, 255)
+
+    b, g, r, a = data[10 * stride + 40:10 * stride + 44]
+    assert (r, g, b, a) == (255, 0, 0, 255)
+
+
+def test_panel_schedule():
+    panel = CountingPanel(0, 0, 100, 100)
+
+    slow = panel.add(Fill((1, 0, 0), 0, 0, 50, 100, interval = 1000))
+    fast = panel.add(Fill((0, 0, 1), 50, 0, 50, 100, interval = 333))
+    assert panel.interval == 333
+
+    panel.show()
+    x11.start_event_loop()
+
+    # The fast widget disposes of the panel after 5 draws, i.e. about 1.3 s.
+    assert fast.draws == 5
+    assert 1 <= slow.draws <= 3
+
+    # The panel is only redrawn when a widget is due.
+    assert panel.draws <= 10
@@ -0,0 +1,125 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import importlib.util
+import os
+
+from blighty import _extended_context
+from blighty._brush import BrushSets
+from blighty.x11 import reload
+
+
+WIDGET = """
+from blighty import brush
+
+class ReloadWidget:
+    def __init__(self):
+        self._extended_context = None
+        self.history = [1, 2, 3]
+
+    @brush
+    def {brush}(ctx):
+        pass
+
+    def on_draw(self, ctx):
+        return {value}
+"""
+
+
+def write_widget(path, brush, value, mtime):
+    path.write_text(WIDGET.format(brush=brush, value=value))
+    os.utime(str(path), ns=(mtime, mtime))
+
+
+def load_widget(path, name):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def test_reload(tmp_path):
+    path = tmp_path / "reload_widget.py"
+    write_widget(path, "old_brush", 1, 10 ** 9)
+
+    module = load_widget(path, "reload_widget")
+
+    widget = module.ReloadWidget()
+    BrushSets.inherit(type(widget))
+    watcher = reload.ModuleWatcher(module)
+    assert not reload.update(widget, watcher)
+
+    # A broken module leaves everything as it was.
+    path.write_text("class ReloadWidget(:")
+    os.utime(str(path), ns=(2 * 10 ** 9, 2 * 10 ** 9))
+    watcher._next_poll = 0
+    assert not reload.update(widget, watcher)
+    assert "old_brush" in BrushSets.get_brush_set(type(widget))
+
+    write_widget(path, "new_brush", 2, 3 * 10 ** 9)
+    watcher._next_poll = 0
+    assert reload.update(widget, watcher)
+
+    assert type(widget) is not module.ReloadWidget
+    assert widget.on_draw(None) == 2
+    assert widget.history == [1, 2, 3]
+    assert list(BrushSets.get_brush_set(type(widget))) == ["new_brush"]
+
+    # Not reloaded again until the file changes.
+    watcher._next_poll = 0
+    assert not reload.update(widget, watcher)
+
+
+def test_reload_same_name(tmp_path):
+    # Both modules define a class called ReloadWidget.
+    path = tmp_path / "reload_widget_a.py"
+    write_widget(path, "brush_a", 1, 10 ** 9)
+    other_path = tmp_path / "reload_widget_b.py"
+    write_widget(other_path, "brush_b", 1, 10 ** 9)
+
+    module = load_widget(path, "reload_widget_a")
+    other = load_widget(other_path, "reload_widget_b").ReloadWidget
+
+    class SubWidget(module.ReloadWidget):
+        pass
+
+    for klass in (module.ReloadWidget, other, SubWidget):
+        _extended_context.get_context_type(klass, object)
+
+    widget = module.ReloadWidget()
+    watcher = reload.ModuleWatcher(module)
+
+    write_widget(path, "new_brush_a", 2, 2 * 10 ** 9)
+    watcher._next_poll = 0
+    assert reload.update(widget, watcher)
+
+    assert list(BrushSets.get_brush_set(type(widget))) == ["new_brush_a"]
+    assert list(BrushSets.get_brush_set(other)) == ["brush_b"]
+
+    # The context types of the old class and of its subclasses are dropped.
+    context_types = _extended_context._context_types
+    assert other in context_types
+    assert module.ReloadWidget not in context_types
+    assert SubWidget not in context_types
@@ -0,0 +1,137 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gc
+import sys
+
+import blighty.x11 as x11
+
+
+WARMUP = 500
+FRAMES = 5000
+
+# Allow for some allocator noise, but not for a leak of a few hundred bytes
+# per frame.
+RSS_TOLERANCE = 1 << 20
+
+
+def rss():
+    with open("/proc/self/status") as fin:
+        for line in fin:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) << 10
+
+
+def refcount():
+    # The total reference count is only available on debug builds of the
+    # interpreter. Count the objects tracked by the GC otherwise.
+    gettotalrefcount = getattr(sys, "gettotalrefcount", None)
+    if gettotalrefcount is not None:
+        return gettotalrefcount()
+
+    gc.collect()
+    return len(gc.get_objects())
+
+
+class SoakCanvas(x11.Canvas):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.frames = 0
+        self.samples = []
+        self.buttons = 0
+        self.keys = 0
+
+    def on_button_pressed(self, button, state, x, y):
+        self.buttons += 1
+
+    def on_key_pressed(self, keysym, state):
+        self.keys += 1
+
+    def on_draw(self, ctx):
+        ctx.set_source_rgba(1, 1, 1, .5)
+        ctx.rectangle(0, 0, 10, 10)
+        ctx.fill()
+
+        self.frames += 1
+        if self.frames in (WARMUP, FRAMES):
+            self.samples.append((rss(), refcount()))
+
+        if self.frames >= FRAMES:
+            self.dispose()
+        else:
+            self.invalidate()
+
+
+def test_soak_frames():
+    canvas = SoakCanvas(0, 0, 64, 64, interval = 1)
+    canvas.show()
+    x11.start_event_loop()
+
+    assert canvas.frames == FRAMES
+
+    (rss_start, refs_start), (rss_end, refs_end) = canvas.samples
+    assert rss_end - rss_start < RSS_TOLERANCE
+    assert refs_end - refs_start < 100
+
+
+def test_soak_input():
+    class InputCanvas(SoakCanvas):
+        def on_draw(self, ctx):
+            # Exercise the input path of the event loop on every frame.
+            self._send_input("button", 1, 0, 10, 10)
+            self._send_input("key", 38, 1)
+            super().on_draw(ctx)
+
+    canvas = InputCanvas(0, 0, 64, 64, interval = 1)
+    canvas.show()
+    x11.start_event_loop()
+
+    # The events of the last frame may not be dispatched before the canvas
+    # is destroyed.
+    assert canvas.buttons >= FRAMES - 1
+    assert canvas.keys >= FRAMES - 1
+
+    (rss_start, refs_start), (rss_end, refs_end) = canvas.samples
+    assert rss_end - rss_start < RSS_TOLERANCE
+    assert refs_end - refs_start < 100
+
+
+def test_soak_canvases():
+    def cycle():
+        canvas = SoakCanvas(0, 0, 64, 64, interval = 1)
+        canvas.frames = FRAMES - 10
+        canvas.show()
+        x11.start_event_loop()
+
+    for _ in range(20):
+        cycle()
+
+    rss_start, refs_start = rss(), refcount()
+
+    for _ in range(200):
+        cycle()
+
+    assert rss() - rss_start < RSS_TOLERANCE
+    assert refcount() - refs_start < 100
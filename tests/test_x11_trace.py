@@ -0,0 +1,117 @@
+"""
+This file is part of "blighty" which is released under GPL.
+
+See file LICENCE or go to http://www.gnu.org/licenses/ for full license
+details.
+
+blighty is a desktop widget creation and management library for Python 3.
+
+Copyright (c) 2018 Gabriele N. Tornetta <phoenix1987@gmail.com>.
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+
+import blighty.x11 as x11
+from blighty import brush, offscreen
+from blighty.x11 import trace
+
+
+def test_trace(tmp_path):
+
+    class TracedCanvas(x11.Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.c = 0
+
+        @brush
+        def square(ctx):
+            ctx.rectangle(0, 0, 10, 10)
+            ctx.fill()
+
+        def on_draw(self, ctx):
+            ctx.square()
+
+            self.c += 1
+            if self.c > 2:
+                self.dispose()
+
+    trace.start()
+
+    canvas = TracedCanvas(40, 40, 64, 64, interval = 10)
+    canvas.show()
+    x11.start_event_loop()
+
+    trace.stop()
+
+    path = tmp_path / "trace.json"
+    trace.dump(str(path))
+
+    with open(str(path)) as fin:
+        events = json.load(fin)["traceEvents"]
+
+    names = {e["name"] for e in events}
+    for name in ("wakeup", "XSendEvent", "dispatch_event", "_on_draw",
+                 "cairo_pop_group", "XFlush", "square"):
+        assert name in names
+
+    spans = [e for e in events if e["ph"] == "X"]
+    assert all(e["dur"] >= 0 for e in spans)
+    assert {e["args"]["canvas"] for e in spans} == {hex(id(canvas))}
+
+
+def test_trace_live_canvas():
+    from blighty._x11 import _trace_events
+
+    class LiveCanvas(offscreen.Canvas):
+        @brush
+        def live_square(ctx):
+            ctx.rectangle(0, 0, 2, 2)
+            ctx.fill()
+
+        def on_draw(self, ctx):
+            ctx.live_square()
+
+    # The brushes of a canvas that is already drawing are traced too.
+    canvas = LiveCanvas(0, 0, 4, 4)
+    canvas.render_frame()
+
+    trace.start()
+    names = trace._names
+    canvas.render_frame()
+    assert [e for e in _trace_events() if names[e[0]] == "live_square"]
+
+    trace.stop()
+    assert not hasattr(type(canvas._extended_context).live_square, "__wrapped__")
+
+
+def test_trace_resize():
+    from blighty._x11 import _trace_events, _trace_record
+
+    canvas = object()
+
+    trace.start(capacity = 8)
+    for i in range(8):
+        _trace_record(0, i, i, canvas)
+
+    # Only the latest events are kept when the ring shrinks.
+    trace.start(capacity = 4)
+    assert [e[2] for e in _trace_events()] == [4, 5, 6, 7]
+
+    trace.start(capacity = 16)
+    _trace_record(0, 8, 8, canvas)
+    assert [e[2] for e in _trace_events()] == [4, 5, 6, 7, 8]
+
+    trace.stop()